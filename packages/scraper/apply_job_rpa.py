@@ -4,6 +4,9 @@ Apply a job application using RPA-Python with JSON input/output over stdin/stdou
 
 Supports smart AI-generated selectors, progress streaming via stderr,
 and expanded TagUI capabilities: select, upload, dom, present, keyboard.
+The browser runs on TagUI, or on the CDP engine when ``settings.browserEngine``
+opts in (see browser_driver.py); ``settings.persistentProfile`` reuses the managed ``apply``
+browser profile (browser_profiles.py) across runs.
 """
 from __future__ import annotations
 
@@ -13,12 +16,18 @@ import sys
 import tempfile
 import shutil
 
+from browser_driver import BrowserDriver
+from host_scheduler import get_scheduler
+from page_classifier import InterstitialDetected, classify_page
+
 try:
-    import rpa as r
+    import rpa
 except ImportError as exc:
     print(json.dumps({"success": False, "error": "RPA not installed. pip install rpa", "screenshots": [], "steps": [{"action": "import", "status": "error", "message": str(exc)}]}))
     raise SystemExit(1)
 
+r = BrowserDriver(rpa)
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -147,8 +156,8 @@ def get_form_fields_via_dom() -> list[dict[str, str]]:
             "label:(e.labels&&e.labels[0])?e.labels[0].textContent.trim():''"
             "})))"
         )
-        r.dom(js_code)
-        result = r.dom_result
+        # Older rpa releases only expose the result through dom_result
+        result = r.dom(js_code) or r.dom_result
         if result and isinstance(result, str):
             return json.loads(result)
     except Exception:
@@ -163,9 +172,11 @@ def add_step(steps: list[dict[str, object]], action: str, status: str, message:
     steps.append(entry)
 
 
-def init_browser(headless: bool, timeout: int, browser: str) -> None:
+def init_browser(headless: bool, timeout: int, browser: str, engine: object = None, persistent: bool = False) -> None:
     """Initialize RPA browser with a resilient browser argument strategy."""
-    base_kwargs = {"turbo_mode": True, "headless_mode": headless}
+    base_kwargs = {"turbo_mode": True, "headless_mode": headless, "engine": engine}
+    if persistent:
+        base_kwargs["profile"] = "apply"
     preferred_kwargs = dict(base_kwargs)
     if browser:
         preferred_kwargs["browser"] = browser
@@ -266,14 +277,22 @@ def main() -> int:
             bool(headless),
             int(timeout) if isinstance(timeout, (int, float)) and int(timeout) > 0 else 30,
             str(default_browser),
+            rpa_settings.get("browserEngine"),
+            rpa_settings.get("persistentProfile") is True,
         )
-        add_step(steps, "init", "ok", f"headless={headless}, timeout={timeout}s")
+        add_step(steps, "init", "ok", f"engine={r.engine}, headless={headless}, timeout={timeout}s")
 
         # Step 2: Navigate to job page
         step_num += 1
         emit_progress("Navigating to job page", step_num, TOTAL_STEPS)
-        r.url(job_url.strip())
+        # Same per-host rate limits, robots.txt and Retry-After backoff as the board scrapers
+        get_scheduler().navigate(r, job_url.strip())
         add_step(steps, "navigate", "ok", f"Loaded {job_url}")
+        # A challenge, captcha or login wall can never be submitted; stop before probing the form
+        interstitial = classify_page(r, job_url.strip())
+        if interstitial is not None:
+            snap(f"Captured {interstitial.kind} page")
+            raise InterstitialDetected(interstitial)
         r.wait(2)
 
         # Verify we actually loaded the page
@@ -466,6 +485,8 @@ def main() -> int:
             "screenshots": screenshots,
             "steps": steps,
         }
+        if isinstance(exc, InterstitialDetected):
+            return_result["interstitial"] = exc.interstitial.as_dict()
         print(json.dumps(return_result))
         return 1
     finally:
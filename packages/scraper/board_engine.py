@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Shared extraction engine for the job boards declared in ``board_registry.py``.
+
+:func:`scrape_board` runs one board spec: feed fallback, navigation, wall
+detection, readiness, ``ifChanged`` fingerprinting, a DOM snapshot or scroll
+harvest, and the common post-processing into ``JobRecord``s. Boards with a
+``scraper`` module run their own ``scrape_jobs`` on the same browser through
+:func:`browser_session`.
+
+:func:`run_board` wraps one scrape into its envelope: it serves it from the
+result cache (``result_cache.py``, reported in ``cache``), runs it behind the
+board's circuit breaker (``board_health.py``), tags every job's
+``technologies`` (``job_tags.py``) and records healthy runs in the listing
+store (``job_store.py``, reported in ``delta``).
+
+Each ``job_scraper_*.py`` script is a thin entry point for one board. Run
+directly, this script scrapes several boards in one process and prints one
+envelope per line as each board finishes. The browser stays open between
+boards that share a browser profile. The payload's ``boards`` lists board
+ids, or ``{"board": id, ...}`` objects whose other keys (``sourceUrl``,
+``cursor``...) override the shared payload for that board; every registered
+board runs when it is absent.
+"""
+from __future__ import annotations
+
+import importlib
+import json
+import math
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from board_health import (
+    HEALTHY_STATUSES,
+    STATUS_ERROR,
+    STATUS_MARKUP_CHANGED,
+    STATUS_OK,
+    STATUS_UNCHANGED,
+    CircuitBreaker,
+    board_result,
+    classify_empty_page,
+    classify_exception,
+    probe,
+)
+from board_registry import BOARDS, BoardSpec
+from browser_driver import BrowserDriver
+from host_scheduler import get_scheduler
+from job_feeds import scrape_feed
+from job_location import apply_location_fields
+from job_record import JobRecord, valid_title
+from job_store import JobStore, run_is_complete
+from job_tags import apply_technology_tags
+from page_archive import archive_browser
+from page_classifier import InterstitialDetected, raise_if_interstitial
+from page_fingerprint import listing_unchanged, region_fingerprint, start_tracking
+from pagination import MAX_LIMIT, PageRequest, page_request_from, take_window
+from posted_dates import listing_is_older, listing_posted_date, since_from
+from result_cache import ResultCache, cache_key, cache_options, spawn_refresh
+from run_watchdog import phase
+from scraper_browser import BrowserProfile, close_browser, init_browser, page_text, profile_from_payload
+from scraper_io import read_payload, source_url_from, using_payload, write_result
+from scroll_harvest import harvest, known_urls_from
+
+try:
+    import rpa
+except ImportError:
+    rpa = None  # The CDP engine runs without TagUI
+
+READY_POLL_SECONDS = 0.25
+READY_COUNT_JS = "return document.querySelectorAll(%s).length"
+SNAPSHOT_JS = """
+(function() {
+    var extract = %(extract)s;
+    var results = [];
+    document.querySelectorAll(%(selector)s).forEach(function(node) {
+        var item = null;
+        try { item = extract(node); } catch (e) { item = null; }
+        if (item) results.push(item);
+    });
+    return JSON.stringify(results);
+})()
+"""
+
+
+class SharedBrowser:
+    """
+    The process's RPA browser. A session starts it with the board's profile and
+    closes it afterwards, unless ``keep_open`` is set, in which case the next
+    session with the same profile reuses it as is.
+    """
+
+    def __init__(self, browser) -> None:
+        self.browser = browser
+        self.keep_open = False
+        self.profile: BrowserProfile | None = None
+        self.in_use = False
+
+    @contextmanager
+    def session(self, profile: BrowserProfile) -> Iterator[object]:
+        self.in_use = True
+        try:
+            if self.profile != profile:
+                self.close()
+                self.profile = profile
+                init_browser(self.browser, profile)
+            yield self.browser
+        except Exception:
+            # The page may be half loaded or walled; the next board starts afresh
+            self.close()
+            raise
+        finally:
+            self.in_use = False
+            if not self.keep_open:
+                self.close()
+
+    def page_text(self) -> str:
+        """Visible text of the current board's page ('' outside a session)."""
+        return page_text(self.browser) if self.in_use else ""
+
+    def close(self) -> None:
+        if self.profile is not None:
+            self.profile = None
+            close_browser(self.browser)
+
+
+_shared: SharedBrowser | None = None
+
+
+def shared_browser() -> SharedBrowser:
+    global _shared
+    if _shared is None:
+        _shared = SharedBrowser(archive_browser(BrowserDriver(rpa)))
+    return _shared
+
+
+def browser_session(profile: BrowserProfile):
+    return shared_browser().session(profile)
+
+
+def wait_until_ready(browser, selector: str, max_seconds: float) -> None:
+    """
+    Wait until ``selector`` matches and its match count holds between two polls,
+    for at most ``max_seconds``; without a selector, wait the full time.
+    """
+    if not selector:
+        browser.wait(max_seconds)
+        return
+    script = READY_COUNT_JS % json.dumps(selector)
+    previous = 0
+    for _ in range(max(1, math.ceil(max_seconds / READY_POLL_SECONDS))):
+        try:
+            count = int(browser.dom(script) or 0)
+        except (TypeError, ValueError):
+            count = 0
+        if count and count == previous:
+            return
+        previous = count
+        browser.wait(READY_POLL_SECONDS)
+
+
+def snapshot_items(browser, spec: BoardSpec) -> list[dict]:
+    """Items of the first extractor that reads any from the loaded page."""
+    for extractor in spec.extractors:
+        raw = browser.dom(SNAPSHOT_JS % {"extract": extractor.script, "selector": json.dumps(extractor.selector)})
+        parsed = []
+        if raw and isinstance(raw, str):
+            try:
+                parsed = json.loads(raw)
+            except json.JSONDecodeError:
+                parsed = []
+        items = [item for item in parsed if isinstance(item, dict)] if isinstance(parsed, list) else []
+        if items:
+            return items
+    return []
+
+
+def harvest_items(browser, spec: BoardSpec, request: PageRequest, payload: dict) -> tuple[list[dict], str]:
+    """Scroll-harvest with each extractor in turn until one reads items; returns the items and stop reason."""
+    # Each run scrolls from the top, so a cursor offset is re-harvested and skipped
+    limit = request.window_end + 1 if request.window_end is not None else MAX_LIMIT
+    known_urls = known_urls_from(payload)
+    since = since_from(payload)
+    items: list[dict] = []
+    stop_reason = ""
+    for extractor in spec.extractors:
+        harvested = harvest(
+            browser, extractor.selector, extractor.script, limit, known_urls,
+            max_steps=request.max_pages,
+            is_stale=lambda item: listing_is_older(item, since),
+        )
+        items, stop_reason = harvested.items, harvested.stop_reason
+        if items or stop_reason in ("all_known", "reached_since"):
+            break
+    return items, stop_reason
+
+
+def job_records(spec: BoardSpec, items: list[dict], source_url: str) -> list[JobRecord]:
+    """Normalized records, one per job: cards that link a job more than once yield it once."""
+    jobs = []
+    seen: set[str] = set()
+    for item in items:
+        if not valid_title(item.get("title")):
+            continue
+        job = JobRecord(
+            item["title"], item.get("company"),
+            (item.get("location") or spec.default_location) if spec.location_from == "location" else "",
+            item.get("description"), item.get("url"), base_url=source_url, source=spec.source,
+            posted_date=listing_posted_date(item),
+        )
+        key = job.url if job.url != source_url else f"{job.title}|{job.company}".lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        if spec.location_from == "location":
+            job.content_hash = spec.content_hash(job.title, job.company, job.location)
+        jobs.append(job)
+    return jobs
+
+
+def scrape_board(spec: BoardSpec, source_url: str) -> tuple[list[JobRecord], str, str | None]:
+    """Scrape one board into ``(jobs, status, next_cursor)`` for ``run_board``."""
+    if spec.scraper:
+        return importlib.import_module(spec.scraper).scrape_jobs(spec, source_url)
+    payload = read_payload()
+    request = page_request_from(payload, spec.board_id, spec.default_limit, spec.default_max_pages)
+    feed = scrape_feed(spec.board_id, source_url, spec.source, spec.content_hash, request)
+    if feed is not None:
+        return feed
+    with browser_session(profile_from_payload(spec.browser_profile, payload.get("browser"))) as browser:
+        get_scheduler().navigate(browser, source_url)
+        raise_if_interstitial(browser, source_url, spec.region_selector)
+        wait_until_ready(browser, spec.region_selector, spec.wait_seconds)
+        if listing_unchanged(region_fingerprint(browser, spec.region_selector or "body")):
+            return [], STATUS_UNCHANGED, None
+        if spec.harvest:
+            items, stop_reason = harvest_items(browser, spec, request, payload)
+        else:
+            items, stop_reason = snapshot_items(browser, spec), ""
+        if not items:
+            if stop_reason in ("all_known", "reached_since"):
+                return [], STATUS_OK, None
+            return [], classify_empty_page(page_text(browser)), None
+
+    jobs = job_records(spec, items, source_url)
+    if not jobs:
+        return [], STATUS_MARKUP_CHANGED, None
+    if not spec.harvest:
+        # Listings older than the watermark were returned by an earlier run
+        since = since_from(payload)
+        jobs = job_records(spec, [item for item in items if not listing_is_older(item, since)], source_url)
+    jobs, next_cursor = take_window(jobs, request)
+    if spec.location_from == "description":
+        apply_location_fields(jobs, texts=[job.description for job in jobs], remote_default=spec.remote_default)
+        for job in jobs:
+            job.content_hash = spec.content_hash(job.title, job.company, job.location)
+    else:
+        apply_location_fields(jobs, remote_default=spec.remote_default)
+    return jobs, STATUS_OK, next_cursor
+
+
+def record_listings(
+    board: str,
+    jobs: list[dict],
+    status: str,
+    next_cursor: str | None,
+    store: JobStore | None = None,
+    default_url: str = "",
+) -> dict | None:
+    """Record a healthy run in the listing store; the delta is None when nothing was recorded."""
+    if status not in HEALTHY_STATUSES:
+        return None
+    try:
+        store = store or JobStore()
+        if status == STATUS_UNCHANGED:
+            return store.touch_source(board)
+        return store.record_run(board, jobs, run_is_complete(read_payload(), next_cursor, bool(jobs), default_url))
+    except Exception as exc:
+        print(f"Listing store unavailable: {exc}", file=sys.stderr)
+        return None
+
+
+def run_board(
+    board: str,
+    source_url: str,
+    scrape: Callable[[str], tuple[list[JobRecord], str, str | None]],
+    breaker: CircuitBreaker | None = None,
+    store: JobStore | None = None,
+    cache: ResultCache | None = None,
+    script: str = "",
+    default_url: str = "",
+) -> dict:
+    """
+    Serve a board run from the result cache, or run it and cache healthy results.
+    Stale entries are returned at once while a background refresh (of ``script``,
+    by default the running one) rewrites them. ``default_url`` is the board's own
+    listing URL: runs against any other ``sourceUrl`` never expire stored listings.
+    """
+    payload = read_payload()
+    options = cache_options(payload)
+    if options is None:
+        result = run_board_uncached(board, source_url, scrape, breaker, store, default_url)
+        result["cache"] = {"status": "disabled", "ageSeconds": None, "refreshing": False}
+        return result
+
+    key = cache_key(board, source_url, payload)
+    try:
+        cache = cache or ResultCache()
+        entry = None if options["refresh"] else cache.get(key)
+    except (sqlite3.Error, OSError) as exc:
+        print(f"Result cache unavailable: {exc}", file=sys.stderr)
+        cache, entry = None, None
+
+    if entry is not None:
+        envelope, stored_at, _ = entry
+        age = max(time.time() - stored_at, 0)
+        if age <= options["ttl"]:
+            envelope["cache"] = {"status": "hit", "ageSeconds": round(age), "refreshing": False}
+            return envelope
+        if age <= options["ttl"] + options["maxStale"]:
+            refreshing = cache.claim_refresh(key) and spawn_refresh(payload, script)
+            envelope["cache"] = {"status": "stale", "ageSeconds": round(age), "refreshing": refreshing}
+            return envelope
+
+    result = run_board_uncached(board, source_url, scrape, breaker, store, default_url)
+    cacheable = result["status"] in HEALTHY_STATUSES and result["status"] != STATUS_UNCHANGED
+    if cache is not None and cacheable and not result.get("skipped"):
+        try:
+            # The delta describes this run only; replaying it from the cache would double-count
+            cache.put(key, board, source_url, {**result, "delta": None})
+        except (sqlite3.Error, OSError) as exc:
+            print(f"Result cache write failed: {exc}", file=sys.stderr)
+    result["cache"] = {"status": "refresh" if options["refresh"] else "miss", "ageSeconds": 0, "refreshing": False}
+    return result
+
+
+def run_board_uncached(
+    board: str,
+    source_url: str,
+    scrape: Callable[[str], tuple[list[JobRecord], str, str | None]],
+    breaker: CircuitBreaker | None = None,
+    store: JobStore | None = None,
+    default_url: str = "",
+) -> dict:
+    """
+    Run ``scrape(source_url) -> (jobs, status, next_cursor)`` behind the board's
+    circuit breaker. Exceptions become structured statuses; nothing is raised to
+    the caller.
+    """
+    breaker = breaker or CircuitBreaker()
+    state = breaker.check(board)
+    if state == "open":
+        entry = breaker.entry(board)
+        return board_result(
+            board, entry["lastStatus"], error=entry["lastError"] or None, skipped=True,
+            circuit={"state": "open", "failures": entry["failures"], "retryAt": entry["openUntil"]},
+        )
+    if state == "half_open":
+        probe_status = probe(source_url)
+        if probe_status != STATUS_OK:
+            entry = breaker.record(board, probe_status, f"Probe failed for {source_url}")
+            return board_result(
+                board, probe_status, error=entry["lastError"], skipped=True,
+                circuit={"state": "open", "failures": entry["failures"], "retryAt": entry["openUntil"]},
+            )
+
+    tracker = start_tracking(board, source_url, read_payload())
+    error = ""
+    next_cursor = None
+    extra: dict[str, object] = {}
+    try:
+        with phase("scrape", board=board, detail=source_url):
+            if tracker.not_modified():
+                jobs, status = [], STATUS_UNCHANGED
+            else:
+                jobs, status, next_cursor = scrape(source_url)
+    except Exception as exc:
+        jobs, status, error = [], classify_exception(exc), str(exc)
+        if isinstance(exc, InterstitialDetected):
+            extra["interstitial"] = exc.interstitial.as_dict()
+        print(f"Scraper error: {exc}", file=sys.stderr)
+    if status in HEALTHY_STATUSES:
+        tracker.commit()
+    apply_technology_tags(jobs)
+    listings = [job.as_dict() for job in jobs]
+    entry = breaker.record(board, status, error)
+    delta = record_listings(board, listings, status, next_cursor, store, default_url)
+    circuit_state = "open" if entry["openUntil"] else "closed"
+    return board_result(
+        board, status, listings, error or None,
+        nextCursor=next_cursor,
+        delta=delta,
+        circuit={"state": circuit_state, "failures": entry["failures"], "retryAt": entry["openUntil"] or None},
+        **extra,
+    )
+
+
+def run_spec(spec: BoardSpec) -> dict:
+    """One board's envelope, for the payload currently served by ``read_payload``."""
+    source_url = source_url_from(read_payload(), spec.default_url)
+    return run_board(
+        spec.board_id, source_url, lambda url: scrape_board(spec, url), script=spec.script, default_url=spec.default_url,
+    )
+
+
+def run_boards(payload: dict) -> Iterator[dict]:
+    """Run the payload's boards in order on one shared browser, yielding each envelope."""
+    shared = {key: value for key, value in payload.items() if key != "boards"}
+    entries = payload.get("boards")
+    if not isinstance(entries, list) or not entries:
+        entries = list(BOARDS)
+    browser = shared_browser()
+    browser.keep_open = True
+    try:
+        for entry in entries:
+            overrides = dict(entry) if isinstance(entry, dict) else {"board": entry}
+            board_id = str(overrides.pop("board", "") or "")
+            spec = BOARDS.get(board_id)
+            if spec is None:
+                yield board_result(board_id, STATUS_ERROR, error=f"Unknown board: {board_id}")
+                continue
+            with using_payload({**shared, **overrides}):
+                yield run_spec(spec)
+    finally:
+        browser.keep_open = False
+        browser.close()
+
+
+def main(board_id: str) -> None:
+    """Entry point of a single-board ``job_scraper_*.py`` script."""
+    write_result(run_spec(BOARDS[board_id]))
+
+
+if __name__ == "__main__":
+    for result in run_boards(read_payload()):
+        write_result(result)
+        sys.stdout.flush()
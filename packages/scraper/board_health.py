@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Structured run status and a persisted per-board circuit breaker.
+
+Every board run reports one status so callers can tell "no new jobs" from
+"broken":
+
+- ``ok``: jobs were extracted
+- ``empty``: the listing loaded and genuinely has no jobs
+- ``blocked``: robots.txt, an HTTP 403/429 or a bot wall stopped us; when
+  ``page_classifier.py`` recognized a challenge, captcha, login or consent
+  wall, the envelope's ``interstitial`` object says which
+- ``markup_changed``: the page loaded but the extractor found nothing usable
+- ``timeout``: navigation or extraction timed out
+- ``error``: any other failure
+- ``unchanged``: ``ifChanged`` was requested and the listing has not changed
+  since the last healthy run (no jobs are returned)
+
+Boards that keep failing are skipped with an exponential cool-down; once the
+cool-down expires, a cheap HTTP probe of the listing URL must succeed before
+the browser is launched again.
+"""
+from __future__ import annotations
+
+import socket
+import sqlite3
+import time
+
+from host_scheduler import RobotsDisallowed, get_scheduler
+from page_classifier import InterstitialDetected
+from scraper_paths import data_path
+
+STATUS_OK = "ok"
+STATUS_EMPTY = "empty"
+STATUS_BLOCKED = "blocked"
+STATUS_MARKUP_CHANGED = "markup_changed"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+STATUS_UNCHANGED = "unchanged"
+HEALTHY_STATUSES = {STATUS_OK, STATUS_EMPTY, STATUS_UNCHANGED}
+
+FAILURE_THRESHOLD = 2
+BASE_COOLDOWN_SECONDS = 5 * 60
+MAX_COOLDOWN_SECONDS = 6 * 60 * 60
+BREAKER_FILE = "circuit-breakers.db"
+
+EMPTY_LISTING_PHRASES = (
+    "no jobs", "no results", "no vacancies", "no positions", "no open positions",
+    "no current openings", "0 jobs", "0 results", "nothing found", "no listings",
+)
+
+
+class BoardBlocked(Exception):
+    """Raised when a board serves something other than its listing (bot wall, 403...)."""
+
+
+def classify_exception(exc: BaseException) -> str:
+    if isinstance(exc, (BoardBlocked, InterstitialDetected, RobotsDisallowed)):
+        return STATUS_BLOCKED
+    if isinstance(exc, (TimeoutError, socket.timeout)) or "timeout" in str(exc).lower():
+        return STATUS_TIMEOUT
+    return STATUS_ERROR
+
+
+def classify_empty_page(page_text: str) -> str:
+    """Decide whether a zero-item extraction means an empty listing or broken selectors."""
+    lower = (page_text or "").lower()
+    if any(phrase in lower for phrase in EMPTY_LISTING_PHRASES):
+        return STATUS_EMPTY
+    return STATUS_MARKUP_CHANGED
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker per board, persisted across runs in the data directory.
+    Boards run in parallel processes, so each board is one SQLite row updated in its
+    own write transaction rather than a shared file rewritten whole.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.conn = sqlite3.connect(path or str(data_path(BREAKER_FILE)), timeout=10, isolation_level=None)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS breakers ("
+            " board TEXT PRIMARY KEY, failures INTEGER NOT NULL, open_until REAL NOT NULL,"
+            " last_status TEXT NOT NULL, last_error TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def entry(self, board: str) -> dict:
+        row = self.conn.execute(
+            "SELECT failures, open_until, last_status, last_error, updated_at FROM breakers WHERE board = ?", (board,)
+        ).fetchone()
+        if row is None:
+            return {"failures": 0, "openUntil": 0, "lastStatus": STATUS_OK, "lastError": ""}
+        failures, open_until, last_status, last_error, updated_at = row
+        return {
+            "failures": failures, "openUntil": open_until, "lastStatus": last_status,
+            "lastError": last_error, "updatedAt": updated_at,
+        }
+
+    def check(self, board: str, now: float | None = None) -> str:
+        """Return ``closed`` (run), ``open`` (skip) or ``half_open`` (probe first)."""
+        entry = self.entry(board)
+        if entry["failures"] < FAILURE_THRESHOLD:
+            return "closed"
+        return "open" if (now or time.time()) < entry["openUntil"] else "half_open"
+
+    def record(self, board: str, status: str, error: str = "", now: float | None = None) -> dict:
+        now = now or time.time()
+        # BEGIN IMMEDIATE takes the write lock before the read, so concurrent
+        # failures of the same board each count
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            entry = self.entry(board)
+            if status in HEALTHY_STATUSES:
+                entry = {"failures": 0, "openUntil": 0, "lastStatus": status, "lastError": ""}
+            else:
+                failures = entry["failures"] + 1
+                cooldown = 0
+                if failures >= FAILURE_THRESHOLD:
+                    cooldown = min(BASE_COOLDOWN_SECONDS * 2 ** (failures - FAILURE_THRESHOLD), MAX_COOLDOWN_SECONDS)
+                entry = {
+                    "failures": failures,
+                    "openUntil": now + cooldown if cooldown else 0,
+                    "lastStatus": status,
+                    "lastError": error[:500],
+                }
+            entry["updatedAt"] = now
+            self.conn.execute(
+                "INSERT OR REPLACE INTO breakers (board, failures, open_until, last_status, last_error, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (board, entry["failures"], entry["openUntil"], entry["lastStatus"], entry["lastError"], now),
+            )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return entry
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def probe(source_url: str) -> str:
+    """Cheap reachability check run before re-opening a tripped board."""
+    response = get_scheduler().fetch(source_url, timeout=10)
+    if response.error == "Disallowed by robots.txt" or response.status in (401, 403, 429):
+        return STATUS_BLOCKED
+    if response.status == 0:
+        return STATUS_TIMEOUT if "timed out" in response.error.lower() else STATUS_ERROR
+    if response.status >= 400 or not response.body.strip():
+        return STATUS_ERROR
+    return STATUS_OK
+
+
+def board_result(
+    board: str,
+    status: str,
+    jobs: list[dict] | None = None,
+    error: str | None = None,
+    **extra: object,
+) -> dict:
+    """Build the JSON envelope every board scraper prints."""
+    result: dict[str, object] = {
+        "board": board, "status": status, "jobs": jobs or [], "error": error or None, "nextCursor": None,
+    }
+    result.update(extra)
+    return result
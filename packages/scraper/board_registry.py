@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Declarative registry of the job boards run by ``board_engine.py``.
+
+A board is data: its listing URL, the ``source`` and hash prefix of its jobs,
+the listing selectors with an in-page extractor for each, how long to wait for
+the listing to render, its default limit, where locations come from and its
+browser profile. Boards whose listing the generic extractor cannot express
+name a ``scraper`` module with their own ``scrape_jobs(spec, source_url)``.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+
+from scraper_browser import DEFAULT_BLOCKED_TYPES, DEFAULT_PROFILE, BrowserProfile
+from scroll_harvest import DEFAULT_MAX_STEPS
+
+
+@dataclass(frozen=True)
+class Extractor:
+    """Listing nodes matched by ``selector``, each read by a JavaScript ``function(node)`` returning an item or null."""
+
+    selector: str
+    script: str
+
+
+@dataclass(frozen=True)
+class BoardSpec:
+    board_id: str
+    script: str
+    default_url: str
+    source: str
+    hash_prefix: str
+    default_limit: int
+    extractors: tuple[Extractor, ...] = ()
+    # Scroll or "load more" harvesting (scroll_harvest.py) instead of one DOM snapshot
+    harvest: bool = False
+    # Listing pages (or scroll steps when harvesting) visited by default
+    default_max_pages: int = 1
+    # Upper bound on the wait for the listing to render and settle
+    wait_seconds: float = 4
+    # Region checked for walls, readiness and ``ifChanged``; the extractor selectors by default
+    ready_selector: str = ""
+    # ``location``: the item's location field; ``description``: classified from the item description
+    location_from: str = "location"
+    # Location of items that name none ("" leaves it to location classification)
+    default_location: str = "Remote"
+    remote_default: bool = False
+    browser_profile: BrowserProfile = DEFAULT_PROFILE
+    scraper: str = ""
+
+    @property
+    def region_selector(self) -> str:
+        return self.ready_selector or ", ".join(extractor.selector for extractor in self.extractors)
+
+    def content_hash(self, title: str, company: str, location: str) -> str:
+        raw = f"{title}|{company}|{location}".lower().strip()
+        return f"{self.hash_prefix}{hashlib.sha256(raw.encode()).hexdigest()[:12]}"
+
+
+# GrackleHQ uses a[href*="/rd/"] links with "Company - Location" text nearby
+GRACKLE_LINK_JS = """
+function(link) {
+    var title = (link.textContent || '').trim();
+    if (!title || title.length < 3) return null;
+
+    // Look for company/location in adjacent text or parent container
+    var parent = link.closest('li, div, tr, article') || link.parentElement;
+    var fullText = parent ? parent.textContent.replace(/\\s+/g, ' ').trim() : '';
+
+    var company = 'Unknown';
+    var location = 'Remote';
+
+    // Parse "Company - Location" pattern from surrounding text
+    var afterTitle = fullText.replace(title, '').trim();
+    var parts = afterTitle.split(' - ');
+    if (parts.length >= 2) {
+        company = parts[0].trim().replace(/^[\\s-]+/, '').trim();
+        location = parts[1].trim().split(/\\s{2,}/)[0].trim();
+    } else if (parts.length === 1 && parts[0].trim().length > 2) {
+        company = parts[0].trim().replace(/^[\\s-]+/, '').trim();
+    }
+
+    // Clean up
+    if (company.length > 100) company = company.substring(0, 100);
+    if (location.length > 100) location = location.substring(0, 100);
+    var timeEl = parent ? parent.querySelector('time') : null;
+
+    return {
+        title: title.substring(0, 200),
+        company: company || 'Unknown',
+        location: location || 'Remote',
+        url: link.href || '',
+        postedText: timeEl ? (timeEl.getAttribute('datetime') || timeEl.textContent.trim()) : '',
+        postedContext: afterTitle.substring(0, 300)
+    };
+}
+"""
+
+# PocketGamer uses <article> elements inside .featured and .index containers
+# Job titles in h1, company in .cat, description in .strap
+POCKETGAMER_ARTICLE_JS = """
+function(article) {
+    var link = article.querySelector('a[href]');
+    var titleEl = article.querySelector('h1, h2, h3, [class*="title"]');
+    var companyEl = article.querySelector('.cat, [class*="company"], [class*="publisher"]');
+    var descEl = article.querySelector('.strap, [class*="description"], [class*="summary"], p');
+
+    var title = titleEl ? titleEl.textContent.trim() : '';
+    if (!title || title.length < 3) return null;
+
+    var company = companyEl ? companyEl.textContent.trim() : 'Unknown';
+    var description = descEl ? descEl.textContent.trim() : '';
+    var timeEl = article.querySelector('time, [class*="date"]');
+
+    return {
+        title: title.substring(0, 200),
+        company: company.substring(0, 100),
+        description: description.substring(0, 500),
+        url: link ? link.href : '',
+        postedText: timeEl ? (timeEl.getAttribute('datetime') || timeEl.textContent.trim()) : ''
+    };
+}
+"""
+
+# GameDev.net lists each job as a card linking to /jobs/<id>-<slug>/ (or /jobs/view/<id>);
+# links to the board itself, its filters and pagination share the /jobs/ prefix
+GAMEDEV_LINK_JS = """
+function(link) {
+    var path = (link.pathname || '').replace(/\\/+$/, '');
+    var rest = path.replace(/^.*?\\/jobs?\\//, '');
+    if (!rest || rest === path || !/\\d/.test(rest)) return null;
+    if (/^(?:page|category|categories|search|post|employers?|companies|tags?|feed|rss)(?:\\/|$)/i.test(rest)) return null;
+
+    var linkText = (link.textContent || '').replace(/\\s+/g, ' ').trim();
+    // The card is the list row, else the nearest ancestor holding more than the link (not a title wrapper)
+    var card = link.closest('li, article, tr');
+    if (!card) {
+        card = link.parentElement;
+        while (card && card.parentElement && card.textContent.replace(/\\s+/g, ' ').trim() === linkText) {
+            card = card.parentElement;
+        }
+    }
+    var heading = card ? card.querySelector('h1, h2, h3, h4, [class*="title"]') : null;
+    var title = linkText.length >= 3 && !/^(?:apply|view|read more|details|more)\\b/i.test(linkText)
+        ? linkText : (heading ? heading.textContent.replace(/\\s+/g, ' ').trim() : '');
+    if (!title || title.length < 3) return null;
+
+    function text(selector) {
+        var el = card ? card.querySelector(selector) : null;
+        return el && !el.contains(link) ? el.textContent.replace(/\\s+/g, ' ').trim() : '';
+    }
+    var timeEl = card ? card.querySelector('time, [class*="date"], [class*="posted"]') : null;
+
+    return {
+        title: title.substring(0, 200),
+        company: text('[class*="company"], [class*="employer"], [class*="studio"], [class*="author"]').substring(0, 100) || 'Unknown',
+        location: text('[class*="location"], [class*="place"], address').substring(0, 100),
+        description: text('[class*="desc"], [class*="summary"], [class*="snippet"], p').substring(0, 500),
+        url: link.href || '',
+        postedText: timeEl ? (timeEl.getAttribute('datetime') || timeEl.textContent.trim()) : ''
+    };
+}
+"""
+
+# RemoteGameJobs uses .job-box containers with jQuery hover effects
+REMOTEGAMEJOBS_CARD_JS = """
+function(box) {
+    var titleEl = box.querySelector('h1, h2, h3, h4, [class*="title"], a');
+    var companyEl = box.querySelector('[class*="company"], [class*="studio"], [class*="org"]');
+    var locationEl = box.querySelector('[class*="location"], [class*="loc"]');
+    var linkEl = box.querySelector('a[href]') || box.closest('a');
+    var timeEl = box.querySelector('time, [class*="date"], [class*="posted"]');
+
+    var title = titleEl ? titleEl.textContent.trim() : '';
+    if (!title) return null;
+
+    return {
+        title: title.substring(0, 200),
+        company: companyEl ? companyEl.textContent.trim() : 'Unknown',
+        location: locationEl ? locationEl.textContent.trim() : 'Remote',
+        url: linkEl ? linkEl.href : '',
+        postedText: timeEl ? (timeEl.getAttribute('datetime') || timeEl.textContent.trim()) : ''
+    };
+}
+"""
+# Bare job links, for when the card markup is not present
+REMOTEGAMEJOBS_LINK_JS = """
+function(link) {
+    var text = (link.textContent || '').trim();
+    if (!text || text.length <= 5) return null;
+    return {
+        title: text.substring(0, 200),
+        company: 'Unknown',
+        location: 'Remote',
+        url: link.href || ''
+    };
+}
+"""
+
+# Work With Indies career links render as "Company is hiring a Title to join..."
+WORKWITHINDIES_LINK_JS = """
+function(link) {
+    var text = (link.textContent || '').replace(/\\s+/g, ' ').trim();
+    if (!text || text.length < 10) return null;
+
+    var title = '';
+    var company = '';
+    var location = 'Remote';
+
+    // Parse "Company is hiring a Title" pattern
+    var hiringMatch = text.match(/^(.+?)\\s+is hiring\\s+(?:a |an )?(.+?)(?:\\s+to\\s+|$)/i);
+    if (hiringMatch) {
+        company = hiringMatch[1].trim();
+        title = hiringMatch[2].trim();
+    } else {
+        // Fallback: use full text as title
+        title = text.substring(0, 150);
+    }
+
+    // Look for location hints
+    var locMatch = text.match(/(?:work from|based in|located in)\\s+(?:the\\s+)?(.+?)(?:\\.|$)/i);
+    if (locMatch) {
+        location = locMatch[1].trim();
+    }
+
+    var timeEl = link.querySelector('time') || (link.parentElement && link.parentElement.querySelector('time'));
+
+    return {
+        title: title.substring(0, 200),
+        company: company || 'Unknown',
+        location: location,
+        url: link.href || '',
+        postedText: timeEl ? (timeEl.getAttribute('datetime') || timeEl.textContent.trim()) : '',
+        postedContext: text.substring(0, 300)
+    };
+}
+"""
+
+REGISTERED_BOARDS = (
+    BoardSpec(
+        board_id="gamedev-net",
+        script="job_scraper_gamedev.py",
+        default_url="https://www.gamedev.net/jobs/",
+        source="gamedev-net",
+        hash_prefix="gdn-",
+        default_limit=30,
+        extractors=(Extractor('a[href*="/jobs/"]', GAMEDEV_LINK_JS),),
+        wait_seconds=3,
+        default_location="",
+    ),
+    BoardSpec(
+        board_id="grackle",
+        script="job_scraper_grackle.py",
+        default_url="https://gracklehq.com/jobs",
+        source="grackle",
+        hash_prefix="grackle-",
+        default_limit=50,
+        extractors=(Extractor('a[href*="/rd/"]', GRACKLE_LINK_JS),),
+    ),
+    BoardSpec(
+        board_id="workwithindies",
+        script="job_scraper_workwithindies.py",
+        default_url="https://workwithindies.com",
+        source="workwithindies",
+        hash_prefix="wwi-",
+        default_limit=60,
+        extractors=(Extractor('a[href*="/careers/"]', WORKWITHINDIES_LINK_JS),),
+        harvest=True,
+        default_max_pages=DEFAULT_MAX_STEPS,
+        wait_seconds=5,  # Jetboost/JS-rendered, needs extra load time
+        # Listings are rendered by Jetboost; keep scripts (and whatever loads them) unblocked
+        browser_profile=BrowserProfile(block_types=DEFAULT_BLOCKED_TYPES, block_patterns=()),
+    ),
+    BoardSpec(
+        board_id="remotegamejobs",
+        script="job_scraper_remotegamejobs.py",
+        default_url="https://remotegamejobs.com",
+        source="remotegamejobs",
+        hash_prefix="rgj-",
+        default_limit=50,
+        extractors=(
+            Extractor('.job-box, [class*="job-card"], [class*="job-list"], article', REMOTEGAMEJOBS_CARD_JS),
+            Extractor('a[href*="job"], a[href*="position"], a[href*="career"]', REMOTEGAMEJOBS_LINK_JS),
+        ),
+        harvest=True,
+        default_max_pages=DEFAULT_MAX_STEPS,
+        # All jobs on this site are remote unless the listing says otherwise
+        remote_default=True,
+    ),
+    BoardSpec(
+        board_id="gamesjobsdirect",
+        script="job_scraper_gamesjobsdirect.py",
+        default_url="https://www.gamesjobsdirect.com/results",
+        source="gamesjobsdirect",
+        hash_prefix="gjd-",
+        default_limit=80,
+        default_max_pages=2,
+        ready_selector='li a[href*="/job/"]',
+        scraper="job_scraper_gamesjobsdirect",
+    ),
+    BoardSpec(
+        board_id="pocketgamer",
+        script="job_scraper_pocketgamer.py",
+        default_url="https://www.pocketgamer.biz/jobs/",
+        source="pocketgamer",
+        hash_prefix="pg-",
+        default_limit=40,
+        extractors=(Extractor("article", POCKETGAMER_ARTICLE_JS),),
+        # Location is only mentioned in the strap text
+        location_from="description",
+    ),
+)
+BOARDS = {spec.board_id: spec for spec in REGISTERED_BOARDS}
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Browser driver abstraction with a native DevTools (CDP) backend and TagUI as fallback.
+
+Scripts talk to a :class:`BrowserDriver`, which exposes the RPA-Python calls
+they already use (``init``, ``url``, ``wait``, ``dom``, ``read``, ``present``,
+``click``, ``type``, ``select``, ``upload``, ``snap``, ``keyboard``,
+``timeout``, ``close`` and ``dom_result``). ``init`` picks the backend:
+
+- ``cdp`` launches a local headless Chrome and drives it over its DevTools
+  websocket, so every call is one protocol round trip instead of a TagUI
+  command relayed through files.
+- ``tagui`` (default) uses the ``rpa`` module as before.
+- ``auto`` tries CDP and falls back to TagUI when no Chrome binary is found
+  or it fails to start.
+
+CDP is opt-in: a run only leaves TagUI when it asks for ``cdp`` or ``auto``,
+and TagUI stays the fallback when Chrome cannot be started.
+
+The engine comes from the run (``browser.engine`` for board scrapers,
+``settings.browserEngine`` for applications), else ``BAO_BROWSER_ENGINE``.
+Chrome is located through ``BAO_CHROME_PATH`` or the usual install locations.
+With ``profile`` (``scraper`` or ``apply``), the CDP engine runs on a managed
+persistent profile from :mod:`browser_profiles` instead of a fresh temporary
+one, so the HTTP cache and consent cookies survive between runs.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from browser_profiles import DEFAULT_CACHE_MB, ProfileLease, lease_profile
+from cdp_client import CdpError, CdpSession, list_targets, page_websocket_url
+from run_watchdog import phase
+
+ENGINES = ("auto", "cdp", "tagui")
+DEFAULT_TIMEOUT = 10
+DEFAULT_WAIT_SECONDS = 5.0
+NAVIGATION_TIMEOUT = 60
+LAUNCH_TIMEOUT = 15
+POLL_SECONDS = 0.1
+
+CHROME_BINARIES = {
+    "chrome": ("google-chrome", "google-chrome-stable", "chrome"),
+    "chromium": ("chromium", "chromium-browser"),
+    "edge": ("microsoft-edge", "microsoft-edge-stable", "msedge"),
+}
+CHROME_PATHS = (
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    "/Applications/Chromium.app/Contents/MacOS/Chromium",
+    "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+)
+
+# TagUI keyboard tokens -> (key, code, windowsVirtualKeyCode)
+KEYS = {
+    "enter": ("Enter", "Enter", 13), "tab": ("Tab", "Tab", 9), "esc": ("Escape", "Escape", 27),
+    "escape": ("Escape", "Escape", 27), "backspace": ("Backspace", "Backspace", 8),
+    "delete": ("Delete", "Delete", 46), "space": (" ", "Space", 32),
+    "up": ("ArrowUp", "ArrowUp", 38), "down": ("ArrowDown", "ArrowDown", 40),
+    "left": ("ArrowLeft", "ArrowLeft", 37), "right": ("ArrowRight", "ArrowRight", 39),
+    "pageup": ("PageUp", "PageUp", 33), "pagedown": ("PageDown", "PageDown", 34),
+    "home": ("Home", "Home", 36), "end": ("End", "End", 35),
+}
+# Watchdog phase of each browser call (see run_watchdog.py); other attributes are not marked
+CALL_PHASES = {
+    "url": "navigate", "dom": "dom", "read": "interact", "present": "interact", "click": "interact",
+    "type": "interact", "select": "interact", "upload": "interact", "snap": "interact", "keyboard": "interact",
+}
+KEY_TOKEN_RE = re.compile(r"\[([a-z]+)\]", re.IGNORECASE)
+
+# Resolves TagUI-style identifiers: XPath when it starts with / or (, else a CSS selector
+FIND_JS = """
+function __baoFind(sel) {
+    if (/^[\\/(]/.test(sel)) {
+        return document.evaluate(sel, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    try { return document.querySelector(sel); } catch (e) { return null; }
+}
+"""
+
+
+def engine_from(value: object) -> str:
+    """Normalize a requested engine, defaulting to ``BAO_BROWSER_ENGINE`` or ``tagui``."""
+    for candidate in (value, os.environ.get("BAO_BROWSER_ENGINE")):
+        if isinstance(candidate, str) and candidate.strip().lower() in ENGINES:
+            return candidate.strip().lower()
+    return "tagui"
+
+
+def find_chrome(preferred: str = "chrome") -> str | None:
+    configured = os.environ.get("BAO_CHROME_PATH", "").strip()
+    if configured:
+        return configured if os.path.exists(configured) else None
+    order = [preferred] + [name for name in CHROME_BINARIES if name != preferred]
+    for name in order:
+        for binary in CHROME_BINARIES.get(name, ()):
+            path = shutil.which(binary)
+            if path:
+                return path
+    return next((path for path in CHROME_PATHS if os.path.exists(path)), None)
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def as_tagui_result(value: object) -> str:
+    """TagUI hands every ``dom`` result back as a string; keep callers' parsing unchanged."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return str(value)
+    return json.dumps(value)
+
+
+class CdpBrowser:
+    """A private headless Chrome driven over the DevTools protocol."""
+
+    def __init__(self, chrome_path: str, headless: bool = True, lease: ProfileLease | None = None) -> None:
+        self.chrome_path = chrome_path
+        self.headless = headless
+        self.lease = lease
+        self.debug_port = 0
+        self.timeout_seconds: float = DEFAULT_TIMEOUT
+        self.dom_result = ""
+        self.session: CdpSession | None = None
+        self._process: subprocess.Popen | None = None
+        self._profile_dir = ""
+        self._loaded = threading.Event()
+
+    def start(self) -> None:
+        self.debug_port = _free_port()
+        if self.lease is not None:
+            profile_dir = str(self.lease.path)
+        else:
+            profile_dir = self._profile_dir = tempfile.mkdtemp(prefix="bao-chrome-")
+        args = [
+            self.chrome_path,
+            f"--remote-debugging-port={self.debug_port}",
+            f"--user-data-dir={profile_dir}",
+            "--no-first-run", "--no-default-browser-check", "--disable-extensions",
+            "--disable-background-networking", "--disable-sync", "--mute-audio",
+            "--window-size=1366,900",
+        ]
+        if self.lease is not None:
+            args.append(f"--disk-cache-size={self.lease.cache_bytes}")
+        if self.headless:
+            args += ["--headless=new", "--disable-gpu"]
+        self._process = subprocess.Popen(
+            args + ["about:blank"], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + LAUNCH_TIMEOUT
+        while True:
+            exit_code = self._process.poll()
+            if exit_code is not None:
+                self.close()
+                raise CdpError(f"Chrome exited during startup ({exit_code})")
+            try:
+                if any(target.get("type") == "page" for target in list_targets(self.debug_port, timeout=2)):
+                    break
+            except OSError:
+                pass
+            if time.monotonic() > deadline:
+                self.close()
+                raise CdpError("Chrome did not open its DevTools port")
+            time.sleep(POLL_SECONDS)
+        self.session = CdpSession(page_websocket_url(self.debug_port), timeout=NAVIGATION_TIMEOUT)
+        self.session.on("Page.loadEventFired", lambda _params: self._loaded.set())
+        self.session.send("Page.enable")
+        self.session.send("Runtime.enable")
+
+    def _send(self, method: str, params: dict | None = None, timeout: float | None = None) -> dict:
+        if self.session is None:
+            raise CdpError("Browser not started")
+        return self.session.send(method, params, timeout=timeout)
+
+    def _evaluate(self, expression: str, by_value: bool = True) -> dict:
+        return self._send("Runtime.evaluate", {
+            "expression": expression, "returnByValue": by_value, "awaitPromise": True, "userGesture": True,
+        })
+
+    def _call(self, body: str, *args: object) -> object:
+        """Run ``body`` as a function of ``args`` (JSON-encoded) with ``__baoFind`` in scope."""
+        encoded = ", ".join(json.dumps(arg) for arg in args)
+        result = self._evaluate(f"(function() {{ {FIND_JS}\nreturn (function() {{ {body} }}).apply(null, [{encoded}]); }})()")
+        if result.get("exceptionDetails"):
+            raise CdpError(_exception_text(result["exceptionDetails"]))
+        return result.get("result", {}).get("value")
+
+    def _wait_for(self, selector: str) -> bool:
+        """Wait up to the step timeout for an element, as TagUI does before acting on it."""
+        deadline = time.monotonic() + self.timeout_seconds
+        while True:
+            if self.present(selector):
+                return True
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(POLL_SECONDS * 2)
+
+    # RPA-Python compatible calls ------------------------------------------------
+
+    def init(self, *args, **kwargs) -> bool:
+        return True
+
+    def timeout(self, seconds: float | None = None) -> float:
+        if isinstance(seconds, (int, float)) and seconds > 0:
+            self.timeout_seconds = float(seconds)
+        return self.timeout_seconds
+
+    def url(self, webpage_url: str | None = None):
+        if webpage_url is None:
+            return as_tagui_result(self._call("return location.href;"))
+        self._loaded.clear()
+        result = self._send("Page.navigate", {"url": webpage_url})
+        if result.get("errorText"):
+            print(f"Navigation to {webpage_url} failed: {result['errorText']}", file=sys.stderr)
+            return False
+        if not self._loaded.wait(NAVIGATION_TIMEOUT):
+            print(f"Navigation to {webpage_url} did not finish loading", file=sys.stderr)
+        return True
+
+    def wait(self, delay_in_seconds: float = DEFAULT_WAIT_SECONDS) -> bool:
+        time.sleep(max(0.0, float(delay_in_seconds)))
+        return True
+
+    def dom(self, statement: str) -> str:
+        """Run JavaScript in the page: an expression, or statements using ``return``."""
+        result = self._evaluate(statement)
+        details = result.get("exceptionDetails")
+        if details and "SyntaxError" in _exception_text(details):
+            # Top-level ``return`` (TagUI's dom convention) only parses inside a function
+            result = self._evaluate(f"(function() {{\n{statement}\n}})()")
+            details = result.get("exceptionDetails")
+        if details:
+            print(f"dom step failed: {_exception_text(details)}", file=sys.stderr)
+            self.dom_result = ""
+        else:
+            self.dom_result = as_tagui_result(result.get("result", {}).get("value"))
+        return self.dom_result
+
+    def present(self, element_identifier: str) -> bool:
+        try:
+            return bool(self._call("return !!__baoFind(arguments[0]);", element_identifier))
+        except CdpError:
+            return False
+
+    def read(self, element_identifier: str) -> str:
+        if element_identifier == "page":
+            return as_tagui_result(self._call("return document.body ? document.body.innerText : '';"))
+        if not self._wait_for(element_identifier):
+            return ""
+        return as_tagui_result(self._call(
+            "var el = __baoFind(arguments[0]); if (!el) return '';"
+            "return ('value' in el && el.tagName !== 'BUTTON') ? el.value : (el.innerText || el.textContent || '');",
+            element_identifier,
+        ))
+
+    def click(self, element_identifier: str) -> bool:
+        if not self._wait_for(element_identifier):
+            return False
+        return bool(self._call(
+            "var el = __baoFind(arguments[0]); if (!el) return false;"
+            "el.scrollIntoView({block: 'center'}); el.click(); return true;",
+            element_identifier,
+        ))
+
+    def type(self, element_identifier: str, text_to_type: str) -> bool:
+        if not self._wait_for(element_identifier):
+            return False
+        focused = self._call(
+            "var el = __baoFind(arguments[0]); if (!el) return false;"
+            "el.scrollIntoView({block: 'center'}); el.focus();"
+            "if (typeof el.select === 'function') el.select(); return true;",
+            element_identifier,
+        )
+        if not focused:
+            return False
+        self.keyboard(text_to_type)
+        return True
+
+    def select(self, element_identifier: str, option_value: str) -> bool:
+        if not self._wait_for(element_identifier):
+            return False
+        return bool(self._call(
+            "var el = __baoFind(arguments[0]); if (!el || !el.options) return false;"
+            "for (var i = 0; i < el.options.length; i++) {"
+            "  var option = el.options[i];"
+            "  if (option.value === arguments[1] || option.text.trim() === arguments[1]) {"
+            "    el.value = option.value;"
+            "    el.dispatchEvent(new Event('input', {bubbles: true}));"
+            "    el.dispatchEvent(new Event('change', {bubbles: true}));"
+            "    return true;"
+            "  }"
+            "}"
+            "return false;",
+            element_identifier, option_value,
+        ))
+
+    def upload(self, element_identifier: str, filename_to_upload: str) -> bool:
+        if not self._wait_for(element_identifier):
+            return False
+        found = self._evaluate(f"(function() {{ {FIND_JS}\nreturn __baoFind({json.dumps(element_identifier)}); }})()", by_value=False)
+        object_id = found.get("result", {}).get("objectId")
+        if not object_id:
+            return False
+        self._send("DOM.setFileInputFiles", {"files": [os.path.abspath(filename_to_upload)], "objectId": object_id})
+        self._call(
+            "var el = __baoFind(arguments[0]); if (el) el.dispatchEvent(new Event('change', {bubbles: true}));",
+            element_identifier,
+        )
+        return True
+
+    def snap(self, element_identifier: str = "page", filename_to_save: str = "") -> bool:
+        params: dict = {"format": "png"}
+        if element_identifier != "page":
+            rect = self._call(
+                "var el = __baoFind(arguments[0]); if (!el) return null; var r = el.getBoundingClientRect();"
+                "return {x: r.left + scrollX, y: r.top + scrollY, width: r.width, height: r.height};",
+                element_identifier,
+            )
+            if not isinstance(rect, dict) or not rect.get("width"):
+                return False
+            params["clip"] = {**rect, "scale": 1}
+        else:
+            params["captureBeyondViewport"] = False
+        data = self._send("Page.captureScreenshot", params).get("data")
+        if not data or not filename_to_save:
+            return False
+        with open(filename_to_save, "wb") as handle:
+            handle.write(base64.b64decode(data))
+        return True
+
+    def keyboard(self, keys_and_modifiers: str) -> bool:
+        """Type text into the focused element; ``[enter]``-style tokens press keys."""
+        position = 0
+        for match in KEY_TOKEN_RE.finditer(keys_and_modifiers):
+            if match.group(1).lower() not in KEYS:
+                continue
+            if match.start() > position:
+                self._send("Input.insertText", {"text": keys_and_modifiers[position:match.start()]})
+            key, code, key_code = KEYS[match.group(1).lower()]
+            for event in ("keyDown", "keyUp"):
+                params = {"type": event, "key": key, "code": code, "windowsVirtualKeyCode": key_code}
+                if event == "keyDown" and key in ("Enter", " "):
+                    params["text"] = "\r" if key == "Enter" else " "
+                self._send("Input.dispatchKeyEvent", params)
+            position = match.end()
+        if position < len(keys_and_modifiers):
+            self._send("Input.insertText", {"text": keys_and_modifiers[position:]})
+        return True
+
+    def close(self) -> bool:
+        if self.session is not None:
+            try:
+                self.session.send("Browser.close", timeout=5)
+            except (CdpError, OSError):
+                pass
+            self.session.close()
+            self.session = None
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait(timeout=5)
+            self._process = None
+        if self._profile_dir:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = ""
+        if self.lease is not None:
+            self.lease.release()
+            self.lease = None
+        return True
+
+
+def _exception_text(details: dict) -> str:
+    exception = details.get("exception") or {}
+    return str(exception.get("description") or details.get("text") or "JavaScript error")
+
+
+class BrowserDriver:
+    """RPA-module-compatible facade that picks the CDP or TagUI backend at ``init``."""
+
+    def __init__(self, tagui=None) -> None:
+        self._tagui = tagui
+        self._backend = None
+        self._step_timeout: float = DEFAULT_TIMEOUT
+        self.engine = ""
+
+    @property
+    def debug_port(self) -> int | None:
+        """DevTools port of the running browser (None means TagUI's default)."""
+        return self._backend.debug_port if isinstance(self._backend, CdpBrowser) else None
+
+    def __getattr__(self, name: str):
+        backend = self._backend if self._backend is not None else self._tagui
+        if backend is None:
+            raise RuntimeError("RPA not installed. Run: pip install rpa")
+        attr = getattr(backend, name)
+        call_phase = CALL_PHASES.get(name)
+        if call_phase is None or not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            # URLs and element identifiers only: dom scripts are noise and keyboard input may be personal data
+            detail = args[0] if args and isinstance(args[0], str) and name not in ("dom", "keyboard") else ""
+            fields: dict = {"detail": detail[:200]}
+            if call_phase == "interact":
+                # Element steps wait up to the step timeout before acting, as TagUI does
+                fields["minSeconds"] = self._step_timeout * 2
+            with phase(call_phase, **fields):
+                return attr(*args, **kwargs)
+
+        return call
+
+    def timeout(self, seconds: float | None = None):
+        if isinstance(seconds, (int, float)) and seconds > 0:
+            self._step_timeout = float(seconds)
+        backend = self._backend if self._backend is not None else self._tagui
+        if backend is None:
+            raise RuntimeError("RPA not installed. Run: pip install rpa")
+        return backend.timeout(seconds) if seconds is not None else backend.timeout()
+
+    def init(
+        self,
+        turbo_mode: bool = True,
+        headless_mode: bool = True,
+        engine: object = None,
+        profile: str | None = None,
+        cache_mb: int = DEFAULT_CACHE_MB,
+        **kwargs,
+    ) -> bool:
+        """Start the browser; ``browser`` (chrome/chromium/edge) picks the Chrome flavour for CDP.
+
+        ``profile`` leases a persistent profile slot for that purpose (CDP only;
+        TagUI keeps its own profile). A busy or unusable slot means a temporary profile.
+        """
+        with phase("init", detail=engine_from(engine)):
+            return self._init(turbo_mode, headless_mode, engine_from(engine), profile, cache_mb, **kwargs)
+
+    def _init(self, turbo_mode: bool, headless_mode: bool, engine: str, profile: str | None, cache_mb: int, **kwargs) -> bool:
+        if engine in ("auto", "cdp"):
+            chrome_path = find_chrome(str(kwargs.get("browser") or "chrome"))
+            if chrome_path:
+                lease = None
+                if profile:
+                    try:
+                        lease = lease_profile(profile, cache_mb)
+                    except (OSError, ValueError) as exc:
+                        print(f"Persistent browser profile unavailable: {exc}", file=sys.stderr)
+                    else:
+                        if lease is None:
+                            print(f"All {profile} browser profiles are in use; using a temporary one", file=sys.stderr)
+                backend = CdpBrowser(chrome_path, headless_mode, lease)
+                try:
+                    backend.start()
+                    self._backend, self.engine = backend, "cdp"
+                    return True
+                except (CdpError, OSError) as exc:
+                    backend.close()
+                    print(f"CDP browser unavailable: {exc}", file=sys.stderr)
+            if engine == "cdp" and self._tagui is None:
+                raise RuntimeError("No Chrome found for the CDP engine (set BAO_CHROME_PATH)")
+            if engine == "cdp":
+                print("Falling back to TagUI", file=sys.stderr)
+        if self._tagui is None:
+            raise RuntimeError("RPA not installed. Run: pip install rpa")
+        self._backend, self.engine = self._tagui, "tagui"
+        try:
+            return self._tagui.init(turbo_mode=turbo_mode, headless_mode=headless_mode, **kwargs)
+        except TypeError:
+            # Older rpa releases do not take every keyword
+            pass
+        try:
+            return self._tagui.init(turbo_mode=turbo_mode, headless_mode=headless_mode)
+        except TypeError:
+            return self._tagui.init(turbo_mode=turbo_mode)
+
+    def close(self) -> bool:
+        backend = self._backend if self._backend is not None else self._tagui
+        self._backend = None
+        with phase("close"):
+            return backend.close() if backend is not None else True
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Managed persistent Chrome profiles for the CDP browser engine.
+
+Each purpose (``scraper``, ``apply``) owns a few profile slots under
+``browser-profiles/<purpose>/`` in the scraper data directory. A run leases a
+free slot with an exclusive OS file lock, which is released when the run
+ends or the process dies. Concurrent runs therefore never share a profile.
+When every slot is busy, the run falls back to a throw-away profile.
+Reusing a slot keeps Chrome's HTTP disk cache (capped by
+``--disk-cache-size``), cookies and consent choices, so repeat visits load
+bundles, styles and fonts locally.
+
+Rotation on lease: a slot whose on-disk size exceeds the cache cap plus
+headroom has its caches cleared, and a slot older than ``MAX_PROFILE_AGE_DAYS``
+is recreated from scratch. Each lease also runs :func:`cleanup_profiles` for
+its purpose, which removes unlocked slots unused for ``STALE_PROFILE_DAYS``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from scraper_paths import data_path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PROFILE_PURPOSES = ("scraper", "apply")
+MAX_SLOTS = 3
+DEFAULT_CACHE_MB = 256
+# Room for cookies, local storage and Chrome's own databases on top of the HTTP cache
+PROFILE_HEADROOM_MB = 200
+MAX_PROFILE_AGE_DAYS = 14
+STALE_PROFILE_DAYS = 30
+META_FILE = ".bao-profile.json"
+LOCK_FILE = ".bao-profile.lock"
+CACHE_DIRS = ("Cache", "Code Cache", "GPUCache", "GrShaderCache", "ShaderCache", "Service Worker/CacheStorage")
+# Left behind by a Chrome that did not exit cleanly; safe to remove while we hold the slot lock
+SINGLETON_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie")
+
+
+def _try_lock(handle) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(handle) -> None:
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        else:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+
+
+def directory_size(path: Path) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def _read_meta(path: Path) -> dict:
+    try:
+        with open(path / META_FILE, encoding="utf-8") as handle:
+            meta = json.load(handle)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+
+def _write_meta(path: Path, meta: dict) -> None:
+    try:
+        with open(path / META_FILE, "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+    except OSError:
+        pass
+
+
+class ProfileLease:
+    """An exclusively locked profile slot; ``release`` when the browser has exited."""
+
+    def __init__(self, path: Path, lock_handle, cache_mb: int) -> None:
+        self.path = path
+        self.cache_mb = cache_mb
+        self._lock_handle = lock_handle
+
+    @property
+    def cache_bytes(self) -> int:
+        return self.cache_mb * 1024 * 1024
+
+    def release(self) -> None:
+        if self._lock_handle is None:
+            return
+        meta = _read_meta(self.path)
+        meta["lastUsedAt"] = time.time()
+        meta["runs"] = int(meta.get("runs", 0)) + 1
+        _write_meta(self.path, meta)
+        _unlock(self._lock_handle)
+        self._lock_handle.close()
+        self._lock_handle = None
+
+
+def _rotate(path: Path, cache_mb: int, now: float) -> None:
+    """Apply the rotation policy to a slot we hold the lock for."""
+    meta = _read_meta(path)
+    created = float(meta.get("createdAt", 0) or 0)
+    if created and now - created > MAX_PROFILE_AGE_DAYS * 86400:
+        for child in path.iterdir():
+            if child.name == LOCK_FILE:
+                continue
+            if child.is_dir() and not child.is_symlink():
+                shutil.rmtree(child, ignore_errors=True)
+            else:
+                child.unlink(missing_ok=True)
+        meta = {}
+    elif directory_size(path) > (cache_mb + PROFILE_HEADROOM_MB) * 1024 * 1024:
+        for profile_dir in [path, *[child for child in path.iterdir() if child.is_dir()]]:
+            for cache_dir in CACHE_DIRS:
+                shutil.rmtree(profile_dir / cache_dir, ignore_errors=True)
+    for name in SINGLETON_FILES:
+        try:
+            (path / name).unlink()
+        except OSError:
+            pass
+    if not meta.get("createdAt"):
+        meta["createdAt"] = now
+    _write_meta(path, meta)
+
+
+def lease_profile(purpose: str, cache_mb: int = DEFAULT_CACHE_MB, now: float | None = None) -> ProfileLease | None:
+    """Lock a free slot for ``purpose``; None when all slots are in use (use a temporary profile)."""
+    if purpose not in PROFILE_PURPOSES:
+        raise ValueError(f"Unknown browser profile purpose: {purpose}")
+    now = now or time.time()
+    for slot in range(MAX_SLOTS):
+        path = data_path("browser-profiles", purpose, f"slot-{slot}", LOCK_FILE).parent
+        path.mkdir(parents=True, exist_ok=True)
+        handle = open(path / LOCK_FILE, "a+b")
+        if not _try_lock(handle):
+            handle.close()
+            continue
+        try:
+            _rotate(path, cache_mb, now)
+            # Our own slot is locked, so only the other, idle slots can be removed
+            cleanup_profiles(purpose, now)
+        except OSError as exc:
+            print(f"Browser profile rotation failed for {path}: {exc}", file=sys.stderr)
+        return ProfileLease(path, handle, cache_mb)
+    return None
+
+
+def cleanup_profiles(purpose: str | None = None, now: float | None = None) -> list[str]:
+    """Remove unlocked slots unused for ``STALE_PROFILE_DAYS``; returns the removed paths."""
+    now = now or time.time()
+    removed: list[str] = []
+    for name in [purpose] if purpose else PROFILE_PURPOSES:
+        root = data_path("browser-profiles", name, LOCK_FILE).parent
+        if not root.is_dir():
+            continue
+        for path in sorted(root.iterdir()):
+            if not path.is_dir():
+                continue
+            meta = _read_meta(path)
+            last_used = float(meta.get("lastUsedAt") or meta.get("createdAt") or 0)
+            if last_used and now - last_used <= STALE_PROFILE_DAYS * 86400:
+                continue
+            with open(path / LOCK_FILE, "a+b") as handle:
+                if not _try_lock(handle):
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(str(path))
+    return removed
+
+
+if __name__ == "__main__":
+    print(json.dumps({"removed": cleanup_profiles()}))
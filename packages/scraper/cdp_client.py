@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Minimal Chrome DevTools Protocol client over a stdlib websocket.
+Used to attach to a local Chrome's remote-debugging port (TagUI launches Chrome
+with ``--remote-debugging-port=9222``) without extra dependencies.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import os
+import queue
+import socket
+import struct
+import threading
+from typing import Callable
+from urllib.parse import urlparse
+from urllib.request import urlopen
+
+DEFAULT_DEBUG_PORT = 9222
+DEFAULT_TIMEOUT = 30
+
+
+class CdpError(Exception):
+    """Raised for protocol errors and dropped connections."""
+
+
+def list_targets(port: int = DEFAULT_DEBUG_PORT, host: str = "127.0.0.1", timeout: float = 5) -> list[dict]:
+    with urlopen(f"http://{host}:{port}/json", timeout=timeout) as handle:
+        targets = json.loads(handle.read().decode("utf-8"))
+    return targets if isinstance(targets, list) else []
+
+
+def page_websocket_url(port: int = DEFAULT_DEBUG_PORT, host: str = "127.0.0.1") -> str:
+    """Return the debugger URL of the first page target."""
+    for target in list_targets(port, host):
+        if target.get("type") == "page" and target.get("webSocketDebuggerUrl"):
+            return target["webSocketDebuggerUrl"]
+    raise CdpError(f"No page target on {host}:{port}")
+
+
+class _WebSocket:
+    """Just enough RFC 6455 for a local DevTools endpoint (text frames, ping/pong, close)."""
+
+    def __init__(self, url: str, timeout: float) -> None:
+        parsed = urlparse(url)
+        self.sock = socket.create_connection((parsed.hostname, parsed.port or 80), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+        request = (
+            f"GET {path} HTTP/1.1\r\nHost: {parsed.netloc}\r\nUpgrade: websocket\r\n"
+            f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+        )
+        self.sock.sendall(request.encode())
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise CdpError("Websocket handshake failed")
+            response += chunk
+        head, self._buffer = response.split(b"\r\n\r\n", 1)
+        if b" 101 " not in head.split(b"\r\n", 1)[0]:
+            raise CdpError(f"Websocket upgrade refused: {head[:80]!r}")
+        self._send_lock = threading.Lock()
+
+    def _read_exact(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            chunk = self.sock.recv(max(65536, size - len(self._buffer)))
+            if not chunk:
+                raise CdpError("Websocket closed")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def send(self, payload: bytes, opcode: int = 0x1) -> None:
+        header = bytearray([0x80 | opcode])
+        size = len(payload)
+        if size < 126:
+            header.append(0x80 | size)
+        elif size < 1 << 16:
+            header.append(0x80 | 126)
+            header += struct.pack("!H", size)
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack("!Q", size)
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        with self._send_lock:
+            self.sock.sendall(bytes(header) + mask + masked)
+
+    def recv(self) -> str:
+        message = b""
+        while True:
+            first, second = self._read_exact(2)
+            opcode = first & 0x0F
+            size = second & 0x7F
+            if size == 126:
+                size = struct.unpack("!H", self._read_exact(2))[0]
+            elif size == 127:
+                size = struct.unpack("!Q", self._read_exact(8))[0]
+            mask = self._read_exact(4) if second & 0x80 else b""
+            data = self._read_exact(size)
+            if mask:
+                data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+            if opcode == 0x8:
+                raise CdpError("Websocket closed by peer")
+            if opcode == 0x9:
+                self.send(data, opcode=0xA)
+                continue
+            if opcode == 0xA:
+                continue
+            message += data
+            if first & 0x80:
+                return message.decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        try:
+            self.send(b"", opcode=0x8)
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class CdpSession:
+    """
+    One DevTools websocket with a background reader.
+    ``send`` blocks for the matching response; events go to registered handlers.
+    """
+
+    def __init__(self, websocket_url: str, timeout: float = DEFAULT_TIMEOUT) -> None:
+        self.timeout = timeout
+        self._ws = _WebSocket(websocket_url, timeout)
+        self._ws.sock.settimeout(None)
+        self._next_id = 0
+        self._id_lock = threading.Lock()
+        self._pending: dict[int, queue.Queue] = {}
+        self._handlers: dict[str, list[Callable[[dict], None]]] = {}
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_loop, name="cdp-reader", daemon=True)
+        self._reader.start()
+
+    def on(self, event: str, handler: Callable[[dict], None]) -> None:
+        self._handlers.setdefault(event, []).append(handler)
+
+    def _read_loop(self) -> None:
+        while not self._closed:
+            try:
+                message = json.loads(self._ws.recv())
+            except (CdpError, OSError, ValueError):
+                break
+            if "id" in message:
+                waiter = self._pending.pop(message["id"], None)
+                if waiter is not None:
+                    waiter.put(message)
+                continue
+            for handler in self._handlers.get(message.get("method", ""), []):
+                try:
+                    handler(message.get("params") or {})
+                except Exception:
+                    pass
+        self._closed = True
+        for waiter in list(self._pending.values()):
+            waiter.put({"error": {"message": "Connection closed"}})
+
+    def send_async(self, method: str, params: dict | None = None) -> None:
+        """Fire a command without waiting (safe to call from event handlers)."""
+        with self._id_lock:
+            self._next_id += 1
+            message_id = self._next_id
+        self._ws.send(json.dumps({"id": message_id, "method": method, "params": params or {}}).encode())
+
+    def send(self, method: str, params: dict | None = None, timeout: float | None = None) -> dict:
+        if self._closed:
+            raise CdpError("Session closed")
+        with self._id_lock:
+            self._next_id += 1
+            message_id = self._next_id
+        waiter: queue.Queue = queue.Queue(maxsize=1)
+        self._pending[message_id] = waiter
+        self._ws.send(json.dumps({"id": message_id, "method": method, "params": params or {}}).encode())
+        try:
+            response = waiter.get(timeout=timeout or self.timeout)
+        except queue.Empty:
+            self._pending.pop(message_id, None)
+            raise CdpError(f"{method} timed out") from None
+        if "error" in response:
+            raise CdpError(f"{method}: {response['error'].get('message', response['error'])}")
+        return response.get("result") or {}
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        self._closed = True
+        self._ws.close()
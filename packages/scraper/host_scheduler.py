@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Per-host politeness scheduler shared by every fetcher in the scraper package.
+HTTP requests and RPA navigations both pass through it, so running boards or
+enrichment in parallel never exceeds a safe request rate on any single host:
+
+- a global concurrency cap across all hosts,
+- a token bucket and a concurrency bound per host,
+- robots.txt parsed once per host and cached on disk (with Crawl-delay),
+- Retry-After honored on 429/503 responses before the next request to that host.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Iterator
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+from http_client import USER_AGENT, ConnectionPool, HttpResponse, fetch, open_stream
+from page_archive import current_archive
+from scraper_paths import data_path
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_PER_HOST_CONCURRENCY = 2
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+DEFAULT_BURST = 2
+DEFAULT_MAX_RETRIES = 2
+MAX_RETRY_AFTER_SECONDS = 120
+ROBOTS_TTL_SECONDS = 24 * 60 * 60
+ROBOTS_FILE = "robots-cache.json"
+
+
+class RobotsDisallowed(Exception):
+    """Raised when robots.txt forbids a navigation."""
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value: str, now: float | None = None) -> float:
+    """Return the delay in seconds requested by a Retry-After header (0 if absent/invalid)."""
+    value = (value or "").strip()
+    if not value:
+        return 0.0
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER_SECONDS)
+    try:
+        target = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+    return max(0.0, min(target - (now or time.time()), MAX_RETRY_AFTER_SECONDS))
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = max(rate, 0.01)
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._not_before = 0.0
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float, capacity: float | None = None) -> None:
+        with self._lock:
+            self.rate = max(rate, 0.01)
+            if capacity is not None:
+                self.capacity = max(capacity, 1.0)
+                self._tokens = min(self._tokens, self.capacity)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller until ``seconds`` from now (Retry-After)."""
+        with self._lock:
+            self._not_before = max(self._not_before, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._not_before:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+                else:
+                    self._updated = self._not_before
+                    wait = self._not_before - now
+            time.sleep(wait)
+
+
+class RobotsCache:
+    """robots.txt per host, fetched once and cached on disk for a day."""
+
+    def __init__(self, path: str | None = None, ttl: float = ROBOTS_TTL_SECONDS) -> None:
+        self.path = path or str(data_path(ROBOTS_FILE))
+        self.ttl = ttl
+        self._parsers: dict[str, RobotFileParser | None] = {}
+        self._lock = threading.Lock()
+        self._host_locks: dict[str, threading.Lock] = {}
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                self._disk: dict[str, dict] = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            self._disk = {}
+
+    def _save(self) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(self._disk, handle)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def parser_for(self, url: str) -> RobotFileParser | None:
+        """Return the parsed robots.txt for the URL's host (None means allow all)."""
+        parsed = urlparse(url)
+        host = parsed.netloc.lower()
+        with self._lock:
+            if host in self._parsers:
+                return self._parsers[host]
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+
+        with host_lock:
+            with self._lock:
+                if host in self._parsers:
+                    return self._parsers[host]
+                entry = self._disk.get(host)
+            if not entry or time.time() - float(entry.get("fetchedAt", 0)) > self.ttl:
+                response = fetch(f"{parsed.scheme or 'https'}://{host}/robots.txt", timeout=10)
+                # Per RFC 9309: 4xx means no restrictions, 5xx/unreachable means try later (allow for now, do not cache).
+                if response.status == 0 or response.status >= 500:
+                    entry = {"fetchedAt": 0, "body": ""}
+                else:
+                    entry = {"fetchedAt": time.time(), "body": response.text() if response.ok else ""}
+                    with self._lock:
+                        self._disk[host] = entry
+                        self._save()
+            body = str(entry.get("body") or "")
+            parser: RobotFileParser | None = None
+            if body.strip():
+                parser = RobotFileParser()
+                parser.parse(body.splitlines())
+            with self._lock:
+                self._parsers[host] = parser
+            return parser
+
+    def can_fetch(self, url: str) -> bool:
+        parser = self.parser_for(url)
+        return parser is None or parser.can_fetch(USER_AGENT, url)
+
+    def crawl_delay(self, url: str) -> float:
+        parser = self.parser_for(url)
+        if parser is None:
+            return 0.0
+        delay = parser.crawl_delay(USER_AGENT)
+        if delay is None:
+            rate = parser.request_rate(USER_AGENT)
+            if rate is not None and rate.requests:
+                return rate.seconds / rate.requests
+            return 0.0
+        return float(delay)
+
+
+class HostScheduler:
+    """Rate- and concurrency-limited gateway for HTTP fetches and browser navigations."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        per_host_concurrency: int = DEFAULT_PER_HOST_CONCURRENCY,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        burst: int = DEFAULT_BURST,
+        respect_robots: bool = True,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> None:
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.respect_robots = respect_robots
+        self.max_retries = max(0, max_retries)
+        self.robots = RobotsCache() if respect_robots else None
+        self._global = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = host_of(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is not None:
+                return bucket
+        rate, burst = self.requests_per_second, float(self.burst)
+        delay = self.robots.crawl_delay(url) if self.robots else 0.0
+        if delay > 0:
+            rate, burst = min(rate, 1.0 / delay), 1.0
+        with self._lock:
+            return self._buckets.setdefault(host, TokenBucket(rate, burst))
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = host_of(url)
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_concurrency)
+                self._host_slots[host] = slot
+            return slot
+
+    def allowed(self, url: str) -> bool:
+        return self.robots is None or self.robots.can_fetch(url)
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Hold a global and per-host slot and spend one token for the URL's host."""
+        bucket = self._bucket(url)
+        with self._host_slot(url):
+            bucket.acquire()
+            with self._global:
+                yield
+
+    def backoff(self, url: str, seconds: float) -> None:
+        if seconds > 0:
+            self._bucket(url).pause(seconds)
+
+    def fetch(self, url: str, pool: ConnectionPool | None = None, **kwargs) -> HttpResponse:
+        """
+        Politely fetch a URL, retrying 429/503 after the server's Retry-After.
+        With a ``pool``, the request goes over its keep-alive connections and
+        redirects are returned rather than followed.
+        """
+        archive = current_archive()
+        if archive is not None and archive.replaying:
+            return archive.replay_http(url, **kwargs)
+        response = self._fetch(url, pool, **kwargs)
+        if archive is not None:
+            archive.record_http(kwargs.get("method", "GET"), response)
+        return response
+
+    @contextmanager
+    def stream(self, url: str, **kwargs) -> Iterator[tuple[HttpResponse, Iterator[bytes]]]:
+        """
+        Politely GET a URL for :func:`http_client.open_stream`-style chunked reading.
+        The host slot is held until the block exits.
+        """
+        archive = current_archive()
+        if archive is not None:
+            # Archives hold whole responses: record and replay them buffered
+            response = self.fetch(url, **kwargs)
+            yield response, iter((response.body,))
+            return
+        if not self.allowed(url):
+            yield HttpResponse(url=url, error="Disallowed by robots.txt"), iter(())
+            return
+        for attempt in range(self.max_retries + 1):
+            with self.slot(url), open_stream(url, **kwargs) as (response, chunks):
+                if response.status not in (429, 503) or attempt == self.max_retries:
+                    yield response, chunks
+                    return
+            delay = parse_retry_after(response.header("retry-after")) or 2.0 ** (attempt + 1)
+            self.backoff(url, delay)
+
+    def _fetch(self, url: str, pool: ConnectionPool | None, **kwargs) -> HttpResponse:
+        if not self.allowed(url):
+            return HttpResponse(url=url, error="Disallowed by robots.txt")
+        response = HttpResponse(url=url)
+        for attempt in range(self.max_retries + 1):
+            with self.slot(url):
+                response = pool.request(url, **kwargs) if pool is not None else fetch(url, **kwargs)
+            if response.status not in (429, 503):
+                return response
+            delay = parse_retry_after(response.header("retry-after")) or 2.0 ** (attempt + 1)
+            self.backoff(url, delay)
+        return response
+
+    def navigate(self, browser, url: str) -> None:
+        """Load a URL in an RPA browser session under the same host limits."""
+        if not self.allowed(url):
+            raise RobotsDisallowed(f"robots.txt disallows {url}")
+        with self.slot(url):
+            browser.url(url)
+
+
+_shared: HostScheduler | None = None
+_shared_lock = threading.Lock()
+
+
+def get_scheduler() -> HostScheduler:
+    """Return the process-wide scheduler (created with defaults on first use)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HostScheduler()
+        return _shared
+
+
+def configure_scheduler(options: object) -> HostScheduler:
+    """Replace the process-wide scheduler from a ``politeness`` payload object."""
+    global _shared
+    opts = options if isinstance(options, dict) else {}
+
+    def number(key: str, default: float) -> float:
+        value = opts.get(key)
+        return float(value) if isinstance(value, (int, float)) and value > 0 else default
+
+    scheduler = HostScheduler(
+        max_concurrency=int(number("maxConcurrency", DEFAULT_MAX_CONCURRENCY)),
+        per_host_concurrency=int(number("perHostConcurrency", DEFAULT_PER_HOST_CONCURRENCY)),
+        requests_per_second=number("requestsPerSecond", DEFAULT_REQUESTS_PER_SECOND),
+        burst=int(number("burst", DEFAULT_BURST)),
+        respect_robots=opts.get("respectRobots", True) is not False,
+    )
+    with _shared_lock:
+        _shared = scheduler
+    return scheduler
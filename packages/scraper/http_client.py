@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Minimal stdlib HTTP client shared by the scraper fast paths.
+Never raises for HTTP or network failures: callers branch on ``status``
+(0 means the request did not complete) and ``error``.
+:func:`open_stream` hands the body over in decoded chunks for callers that
+parse as they read.
+:class:`ConnectionPool` keeps connections alive per host for high-volume
+callers such as the link checker.
+"""
+from __future__ import annotations
+
+import gzip
+import http.client
+import socket
+import threading
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit, urlunsplit
+from urllib.request import Request, urlopen
+
+USER_AGENT = "BaoBuildBuddy-Scraper/1.0"
+DEFAULT_TIMEOUT = 15
+MAX_BODY_BYTES = 4 * 1024 * 1024
+# Streamed bodies are never held whole; the cap only bounds how long one read can run
+MAX_STREAM_BYTES = 64 * 1024 * 1024
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+@dataclass
+class HttpResponse:
+    url: str
+    status: int = 0
+    final_url: str = ""
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def header(self, name: str) -> str:
+        return self.headers.get(name.lower(), "")
+
+    def text(self) -> str:
+        charset = "utf-8"
+        content_type = self.header("content-type")
+        if "charset=" in content_type:
+            charset = content_type.split("charset=", 1)[1].split(";", 1)[0].strip() or charset
+        try:
+            return self.body.decode(charset, errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+
+def _decode_body(raw: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(raw)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(raw)
+        except zlib.error:
+            return zlib.decompress(raw, -zlib.MAX_WBITS)
+    return raw
+
+
+def _request_headers(headers: dict[str, str] | None) -> dict[str, str]:
+    request_headers = {
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Encoding": "gzip, deflate",
+    }
+    if headers:
+        request_headers.update(headers)
+    return request_headers
+
+
+def fetch(
+    url: str,
+    method: str = "GET",
+    headers: dict[str, str] | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_bytes: int = MAX_BODY_BYTES,
+) -> HttpResponse:
+    """Issue one request and return the (decoded) response."""
+    request = Request(url, headers=_request_headers(headers), method=method)
+    response = HttpResponse(url=url)
+    try:
+        with urlopen(request, timeout=timeout) as handle:
+            response.status = handle.status
+            response.final_url = handle.geturl()
+            response.headers = {k.lower(): v for k, v in handle.headers.items()}
+            raw = handle.read(max_bytes) if method != "HEAD" else b""
+    except HTTPError as exc:
+        response.status = exc.code
+        response.final_url = exc.geturl() or url
+        response.headers = {k.lower(): v for k, v in (exc.headers or {}).items()}
+        response.error = f"HTTP {exc.code}"
+        try:
+            raw = exc.read(max_bytes)
+        except Exception:
+            raw = b""
+    except (URLError, socket.timeout, TimeoutError, ConnectionError, ValueError) as exc:
+        response.error = str(getattr(exc, "reason", exc))
+        return response
+
+    try:
+        response.body = _decode_body(raw, response.header("content-encoding").strip().lower())
+    except (OSError, zlib.error, EOFError):
+        response.body = raw
+    return response
+
+
+def _decoded_chunks(handle, encoding: str, max_bytes: int) -> Iterator[bytes]:
+    # wbits 32 + MAX_WBITS accepts both gzip and zlib-wrapped deflate
+    decoder = zlib.decompressobj(32 + zlib.MAX_WBITS) if encoding in ("gzip", "deflate") else None
+    remaining = max_bytes
+    while remaining > 0:
+        chunk = handle.read(min(STREAM_CHUNK_BYTES, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield decoder.decompress(chunk) if decoder else chunk
+    if decoder:
+        yield decoder.flush()
+
+
+@contextmanager
+def open_stream(
+    url: str,
+    headers: dict[str, str] | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_bytes: int = MAX_STREAM_BYTES,
+) -> Iterator[tuple[HttpResponse, Iterator[bytes]]]:
+    """
+    GET a URL and yield ``(response, chunks)``: the response carries status and
+    headers but no body, ``chunks`` yields the decoded body as it arrives (nothing
+    for failed requests). The connection is closed when the block exits.
+    """
+    request = Request(url, headers=_request_headers(headers))
+    response = HttpResponse(url=url)
+    handle = None
+    try:
+        handle = urlopen(request, timeout=timeout)
+    except HTTPError as exc:
+        response.status = exc.code
+        response.final_url = exc.geturl() or url
+        response.headers = {k.lower(): v for k, v in (exc.headers or {}).items()}
+        response.error = f"HTTP {exc.code}"
+        exc.close()
+    except (URLError, socket.timeout, TimeoutError, ConnectionError, ValueError) as exc:
+        response.error = str(getattr(exc, "reason", exc))
+    if handle is None:
+        yield response, iter(())
+        return
+    with handle:
+        response.status = handle.status
+        response.final_url = handle.geturl()
+        response.headers = {k.lower(): v for k, v in handle.headers.items()}
+        yield response, _decoded_chunks(handle, response.header("content-encoding").strip().lower(), max_bytes)
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections, one per host and thread, reused across requests.
+    :meth:`request` takes the same arguments as :func:`fetch` but does not follow
+    redirects: a 3xx response is returned as is, with its ``location`` header.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: set[http.client.HTTPConnection] = set()
+
+    def _connections(self) -> dict[tuple[str, str], http.client.HTTPConnection]:
+        if not hasattr(self._local, "connections"):
+            self._local.connections = {}
+        return self._local.connections
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        conn = self._connections().pop(key, None)
+        if conn is not None:
+            conn.close()
+            with self._lock:
+                self._all.discard(conn)
+
+    def request(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: dict[str, str] | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_bytes: int = MAX_BODY_BYTES,
+    ) -> HttpResponse:
+        response = HttpResponse(url=url, final_url=url)
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            response.error = "Unsupported URL"
+            return response
+        key = (parts.scheme, parts.netloc)
+        target = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        for attempt in range(2):
+            connections = self._connections()
+            reused = key in connections
+            if not reused:
+                connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+                connections[key] = connection_class(parts.netloc, timeout=timeout)
+                with self._lock:
+                    self._all.add(connections[key])
+            conn = connections[key]
+            try:
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                conn.request(method, target, headers=_request_headers(headers))
+                handle = conn.getresponse()
+                raw = handle.read(max_bytes)
+                response.status = handle.status
+                response.headers = {k.lower(): v for k, v in handle.getheaders()}
+                if handle.will_close or not handle.isclosed():
+                    # Closing, or a body left unread: the connection cannot carry another request
+                    self._discard(key)
+            except (http.client.HTTPException, OSError) as exc:
+                self._discard(key)
+                if reused and attempt == 0 and not isinstance(exc, (socket.timeout, TimeoutError)):
+                    continue  # The server dropped the idle connection; retry once on a fresh one
+                response.error = str(exc) or type(exc).__name__
+                return response
+            break
+        if response.status >= 400:
+            response.error = f"HTTP {response.status}"
+        try:
+            response.body = _decode_body(raw, response.header("content-encoding").strip().lower())
+        except (OSError, zlib.error, EOFError):
+            response.body = raw
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._all = self._all, set()
+        for conn in connections:
+            conn.close()
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Job detail-page enrichment stage.
+Takes a batch of job URLs (or job dicts) over stdin, fetches detail pages
+concurrently over HTTP through the shared host scheduler, falls back to the
+RPA browser for pages that need JavaScript, and extracts description, posted
+date, salary text and employment type.
+
+Results are cached on disk by URL (with the ETag/Last-Modified seen), so each
+listing's detail page is fetched once in its lifetime rather than on every
+refresh. Pass ``revalidate: true`` to issue conditional requests for cached
+entries instead.
+"""
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+from html.parser import HTMLParser
+
+from browser_driver import BrowserDriver
+from host_scheduler import HostScheduler, configure_scheduler, get_scheduler
+from http_client import HttpResponse
+from job_record import DESCRIPTION_LIMIT
+from page_classifier import classify_page, host_interstitial
+from posted_dates import normalize_posted_date
+from scraper_paths import data_path
+
+DEFAULT_CONCURRENCY = 8
+CACHE_FILE = "enrichment.db"
+FIELDS = ("description", "postedDate", "salary", "employmentType")
+
+SALARY_PATTERN = re.compile(
+    r"(?:[$£€]|USD|GBP|EUR|CAD|AUD)\s?\d[\d,.]*\s?[kK]?"
+    r"(?:\s?(?:-|–|—|to)\s?(?:[$£€]|USD|GBP|EUR|CAD|AUD)?\s?\d[\d,.]*\s?[kK]?)?"
+    r"(?:\s?(?:per|/|a)\s?(?:year|annum|yr|month|hour|hr))?"
+)
+EMPLOYMENT_PATTERN = re.compile(
+    r"\b(full[- ]time|part[- ]time|contract(?:or)?|freelance|intern(?:ship)?|temporary|permanent)\b",
+    re.IGNORECASE,
+)
+EMPLOYMENT_TYPES = {
+    "full_time": "full-time", "fulltime": "full-time", "full-time": "full-time", "full time": "full-time",
+    "permanent": "full-time",
+    "part_time": "part-time", "parttime": "part-time", "part-time": "part-time", "part time": "part-time",
+    "contract": "contract", "contractor": "contract", "freelance": "contract", "temporary": "contract",
+    "intern": "internship", "internship": "internship",
+}
+
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+
+class _DetailParser(HTMLParser):
+    """Single pass over a detail page collecting JSON-LD, meta tags, times and main text."""
+
+    SKIP_TAGS = {"script", "style", "noscript", "svg", "nav", "header", "footer", "form"}
+    BLOCK_TAGS = {"p", "div", "li", "br", "h1", "h2", "h3", "h4", "section", "article", "tr"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.ld_json: list[str] = []
+        self.meta: dict[str, str] = {}
+        self.times: list[str] = []
+        self.main_text: list[str] = []
+        self.body_text: list[str] = []
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._in_ld_json = False
+        self._ld_buffer: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = {k: (v or "") for k, v in attrs}
+        if tag == "script" and attributes.get("type", "").lower() == "application/ld+json":
+            self._in_ld_json = True
+            self._ld_buffer = []
+            return
+        if tag == "meta":
+            key = (attributes.get("property") or attributes.get("name") or attributes.get("itemprop") or "").lower()
+            if key and "content" in attributes:
+                self.meta.setdefault(key, attributes["content"])
+            return
+        if tag == "time" and attributes.get("datetime"):
+            self.times.append(attributes["datetime"])
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in ("main", "article") or "job-description" in attributes.get("class", ""):
+            self._main_depth += 1
+        if tag in self.BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "script" and self._in_ld_json:
+            self._in_ld_json = False
+            self.ld_json.append("".join(self._ld_buffer))
+            return
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in ("main", "article") and self._main_depth:
+            self._main_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self._in_ld_json:
+            self._ld_buffer.append(data)
+        elif not self._skip_depth:
+            self._append(data)
+
+    def _append(self, data: str) -> None:
+        (self.main_text if self._main_depth else self.body_text).append(data)
+
+
+def html_to_text(value: str) -> str:
+    """Strip tags from an HTML fragment and collapse whitespace per line."""
+    text = re.sub(r"<(?:br|/p|/li|/div|/h\d)[^>]*>", "\n", value, flags=re.IGNORECASE)
+    text = unescape(re.sub(r"<[^>]+>", " ", text))
+    return _collapse(text)
+
+
+def _collapse(text: str) -> str:
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _iter_ld_nodes(value: object):
+    if isinstance(value, list):
+        for item in value:
+            yield from _iter_ld_nodes(item)
+    elif isinstance(value, dict):
+        yield value
+        graph = value.get("@graph")
+        if graph is not None:
+            yield from _iter_ld_nodes(graph)
+
+
+def _job_posting(ld_blocks: list[str]) -> dict | None:
+    for block in ld_blocks:
+        try:
+            parsed = json.loads(block.strip())
+        except json.JSONDecodeError:
+            continue
+        for node in _iter_ld_nodes(parsed):
+            kind = node.get("@type")
+            kinds = kind if isinstance(kind, list) else [kind]
+            if "JobPosting" in kinds:
+                return node
+    return None
+
+
+def _salary_text(base_salary: object) -> str:
+    if not isinstance(base_salary, dict):
+        return str(base_salary or "").strip()
+    currency = str(base_salary.get("currency") or "").strip()
+    value = base_salary.get("value")
+    unit = ""
+    if isinstance(value, dict):
+        unit = str(value.get("unitText") or "").strip().lower()
+        low, high = value.get("minValue"), value.get("maxValue")
+        amount = value.get("value")
+        if low is not None and high is not None:
+            amount_text = f"{low}-{high}"
+        else:
+            amount_text = str(amount if amount is not None else low if low is not None else high or "")
+    else:
+        amount_text = str(value or "")
+    if not amount_text:
+        return ""
+    return " ".join(part for part in (currency, amount_text, f"per {unit}" if unit else "") if part)
+
+
+def _employment_type(value: object) -> str:
+    values = value if isinstance(value, list) else [value]
+    for item in values:
+        key = str(item or "").strip().lower()
+        if key in EMPLOYMENT_TYPES:
+            return EMPLOYMENT_TYPES[key]
+    return ""
+
+
+def extract_detail(html: str) -> dict[str, str]:
+    """Extract enrichment fields from a detail page's HTML."""
+    parser = _DetailParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+
+    detail = {name: "" for name in FIELDS}
+    posting = _job_posting(parser.ld_json)
+    if posting:
+        detail["description"] = html_to_text(str(posting.get("description") or ""))
+        detail["postedDate"] = str(posting.get("datePosted") or "").strip()
+        detail["salary"] = _salary_text(posting.get("baseSalary") or posting.get("estimatedSalary"))
+        detail["employmentType"] = _employment_type(posting.get("employmentType"))
+
+    text = _collapse("".join(parser.main_text)) or _collapse("".join(parser.body_text))
+    if not detail["description"]:
+        detail["description"] = text or parser.meta.get("og:description", "") or parser.meta.get("description", "")
+    if not detail["postedDate"]:
+        detail["postedDate"] = (
+            parser.meta.get("article:published_time")
+            or parser.meta.get("dateposted")
+            or parser.meta.get("datepublished")
+            or (parser.times[0] if parser.times else "")
+        ).strip()
+    # Same ISO-8601 UTC form as the board listings
+    detail["postedDate"] = normalize_posted_date(detail["postedDate"])
+    haystack = detail["description"] or text
+    if not detail["salary"]:
+        match = SALARY_PATTERN.search(haystack)
+        detail["salary"] = match.group(0).strip() if match else ""
+    if not detail["employmentType"]:
+        match = EMPLOYMENT_PATTERN.search(haystack)
+        detail["employmentType"] = EMPLOYMENT_TYPES.get(match.group(1).lower().replace("-", " "), "") if match else ""
+    detail["description"] = detail["description"][:DESCRIPTION_LIMIT]
+    return detail
+
+
+def _has_content(detail: dict[str, str]) -> bool:
+    return len(detail.get("description", "")) >= 80
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class DetailCache:
+    """URL-keyed SQLite cache of extracted detail fields plus validators."""
+
+    def __init__(self, path: str | None = None) -> None:
+        self.conn = sqlite3.connect(path or str(data_path(CACHE_FILE)))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS detail_cache ("
+            " url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+            " fetched_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+
+    def get_many(self, urls: list[str]) -> dict[str, dict]:
+        found: dict[str, dict] = {}
+        for offset in range(0, len(urls), 500):
+            chunk = urls[offset:offset + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT url, etag, last_modified, payload FROM detail_cache WHERE url IN ({placeholders})",
+                chunk,
+            )
+            for url, etag, last_modified, payload in rows:
+                found[url] = {"etag": etag or "", "lastModified": last_modified or "", "detail": json.loads(payload)}
+        return found
+
+    def put_many(self, entries: list[tuple[str, str, str, dict]]) -> None:
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO detail_cache (url, etag, last_modified, fetched_at, payload)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(url, etag, modified, now, json.dumps(detail)) for url, etag, modified, detail in entries],
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+
+def _fetch_one(url: str, cached: dict | None, scheduler: HostScheduler, timeout: float) -> tuple[str, HttpResponse]:
+    headers: dict[str, str] = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("lastModified"):
+            headers["If-Modified-Since"] = cached["lastModified"]
+    return url, scheduler.fetch(url, headers=headers, timeout=timeout)
+
+
+def _fetch_with_browser(urls: list[str], timeout: int) -> dict[str, dict[str, str]]:
+    """Render pages that need JavaScript in one RPA browser session."""
+    if not urls:
+        return {}
+    try:
+        import rpa
+    except ImportError:
+        rpa = None  # The CDP engine runs without TagUI
+    r = BrowserDriver(rpa)
+
+    details: dict[str, dict[str, str]] = {}
+    try:
+        r.init(turbo_mode=True, headless_mode=True)
+        r.timeout(timeout)
+        scheduler = get_scheduler()
+        for url in urls:
+            if host_interstitial(url) is not None:
+                continue  # Every page on a walled host would hit the same wall
+            try:
+                scheduler.navigate(r, url)
+                if classify_page(r, url) is not None:
+                    continue
+                r.wait(2)
+                html = r.dom("return document.documentElement.outerHTML")
+                if isinstance(html, str) and html:
+                    details[url] = extract_detail(html)
+            except Exception:
+                continue
+    except Exception as e:
+        print(f"Enrichment browser error: {e}", file=sys.stderr)
+    finally:
+        try:
+            r.close()
+        except Exception:
+            pass
+    return details
+
+
+def enrich_urls(
+    urls: list[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    revalidate: bool = False,
+    browser_fallback: bool = True,
+    timeout: float = 15,
+    cache: DetailCache | None = None,
+) -> dict[str, dict]:
+    """Return ``{url: {description, postedDate, salary, employmentType, via}}``."""
+    unique = list(dict.fromkeys(u.strip() for u in urls if isinstance(u, str) and u.strip().startswith("http")))
+    owns_cache = cache is None
+    cache = cache or DetailCache()
+    results: dict[str, dict] = {}
+    try:
+        cached = cache.get_many(unique)
+        pending = []
+        for url in unique:
+            entry = cached.get(url)
+            if entry and not revalidate:
+                results[url] = {**entry["detail"], "via": "cache"}
+            else:
+                pending.append(url)
+
+        updates: list[tuple[str, str, str, dict]] = []
+        needs_browser: list[str] = []
+        scheduler = get_scheduler()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = [pool.submit(_fetch_one, url, cached.get(url), scheduler, timeout) for url in pending]
+            for future in futures:
+                url, response = future.result()
+                if response.status == 304 and url in cached:
+                    results[url] = {**cached[url]["detail"], "via": "cache"}
+                    continue
+                detail = extract_detail(response.text()) if response.ok else None
+                if detail and _has_content(detail):
+                    results[url] = {**detail, "via": "http"}
+                    updates.append((url, response.header("etag"), response.header("last-modified"), detail))
+                elif browser_fallback and response.status not in (404, 410):
+                    needs_browser.append(url)
+                else:
+                    results[url] = {**(detail or {n: "" for n in FIELDS}), "via": "http", "error": response.error}
+
+        for url, detail in _fetch_with_browser(needs_browser, int(timeout) * 2).items():
+            results[url] = {**detail, "via": "browser"}
+            updates.append((url, "", "", detail))
+        for url in needs_browser:
+            results.setdefault(url, {**{n: "" for n in FIELDS}, "via": "browser", "error": "Detail page unavailable"})
+
+        if updates:
+            cache.put_many(updates)
+    finally:
+        if owns_cache:
+            cache.close()
+    return results
+
+
+def enrich_jobs(jobs: list[dict], **options) -> list[dict]:
+    """Fill empty description/postedDate (and add salary/employmentType) on job dicts."""
+    details = enrich_urls([str(job.get("url") or "") for job in jobs], **options)
+    for job in jobs:
+        detail = details.get(str(job.get("url") or "").strip())
+        if not detail:
+            continue
+        for name in FIELDS:
+            if detail.get(name) and not job.get(name):
+                job[name] = detail[name]
+    return jobs
+
+
+def _int_option(payload: dict, key: str, default: int) -> int:
+    value = payload.get(key)
+    return int(value) if isinstance(value, (int, float)) and int(value) > 0 else default
+
+
+if __name__ == "__main__":
+    try:
+        payload = json.loads(sys.stdin.read() or "{}")
+    except json.JSONDecodeError:
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {"urls": payload} if isinstance(payload, list) else {}
+
+    politeness = payload.get("politeness")
+    politeness = dict(politeness) if isinstance(politeness, dict) else {}
+    if "perHostConcurrency" in payload:
+        politeness.setdefault("perHostConcurrency", payload["perHostConcurrency"])
+    configure_scheduler(politeness)
+    options = {
+        "concurrency": _int_option(payload, "concurrency", DEFAULT_CONCURRENCY),
+        "revalidate": bool(payload.get("revalidate", False)),
+        "browser_fallback": bool(payload.get("browserFallback", True)),
+        "timeout": _int_option(payload, "timeout", 15),
+    }
+    jobs = payload.get("jobs")
+    if isinstance(jobs, list):
+        result = enrich_jobs([job for job in jobs if isinstance(job, dict)], **options)
+    else:
+        urls = payload.get("urls")
+        result = enrich_urls(urls if isinstance(urls, list) else [], **options)
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+RSS/Atom and JSON Feed ingestion, the first-choice source for every board.
+
+A board's feed is discovered from ``<link rel="alternate">`` tags on its
+listing page, then from well-known paths under it (``feed``, ``rss``,
+``feed.xml``, ``feed.json``). Only feeds on the listing's host and under its
+path are considered (a site-wide ``/feed`` is news, not jobs), and a candidate
+is accepted only when most of its first entries look like job postings. The
+outcome, including "no feed", is cached per listing URL in ``feeds-cache.json``
+for a day. XML feeds are parsed incrementally as the response streams in and
+each entry is dropped from the tree once converted, so memory stays flat
+however long the feed is and reading stops as soon as the result window is
+full. Boards fall back to their HTML/RPA path when no feed is found or it
+yields no entries.
+
+Payload ``feed``: ``false`` skips feeds, or a URL string uses that feed directly.
+"""
+from __future__ import annotations
+
+import html
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+import zlib
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from typing import Callable, Iterable, Iterator
+from urllib.parse import urljoin, urlparse
+
+from board_health import STATUS_OK
+from host_scheduler import get_scheduler
+from job_location import apply_location_fields
+from job_record import JobRecord
+from pagination import PageRequest, decode_feed_cursor, encode_feed_cursor
+from posted_dates import is_older, normalize_posted_date, since_from
+from scraper_io import read_payload
+from scraper_paths import data_path
+from scroll_harvest import known_urls_from
+
+FEEDS_FILE = "feeds-cache.json"
+FEED_TTL_SECONDS = 24 * 60 * 60
+FEED_TYPES = {
+    "application/rss+xml", "application/atom+xml", "application/rdf+xml",
+    "application/feed+json", "application/json", "application/xml", "text/xml",
+}
+FEED_ACCEPT = "application/rss+xml, application/atom+xml, application/feed+json, application/xml;q=0.9, */*;q=0.5"
+# Tried under the listing URL when the page links no feed
+WELL_KNOWN_PATHS = ("feed", "rss", "feed.xml", "feed.json")
+ENTRY_TAGS = {"item", "entry"}
+SNIFF_BYTES = 2048
+# Entries checked before a discovered feed is trusted as a job feed
+FEED_SAMPLE_SIZE = 10
+# Feed reads that end early: malformed XML/JSON, a dropped connection, a corrupt gzip stream
+FEED_ERRORS = (ET.ParseError, ValueError, OSError, zlib.error)
+
+# Job-board namespaces (job:company, jobs:location, ...) are matched by local name
+COMPANY_FIELDS = {"company", "companyname", "employer", "hiringorganization", "organization"}
+LOCATION_FIELDS = {"location", "joblocation", "region", "city"}
+TITLE_AT_COMPANY_RE = re.compile(r"^(?P<title>.{3,}?)\s+(?:at|@)\s+(?P<company>[^|()\[\]]{2,80})$", re.IGNORECASE)
+COMPANY_HIRING_RE = re.compile(r"^(?P<company>.{2,80}?)\s+is\s+hiring\s+(?:an?\s+)?(?P<title>.{3,}?)(?:\s+to\s+join\b.*)?$", re.IGNORECASE)
+TAG_RE = re.compile(r"<[^>]+>")
+# Job titles end in a role ("Senior Gameplay Programmer", "Lead Artist (Remote)"); news headlines rarely do
+ROLE_RE = re.compile(
+    r"\b(?:developer|engineer|programmer|artist|animator|designer|producer|director|manager|writer|tester"
+    r"|analyst|lead|intern|composer|modell?er|scientist|technician|coordinator|specialist|architect"
+    r"|recruiter|editor|researcher|marketer|generalist)s?$",
+    re.IGNORECASE,
+)
+TITLE_QUALIFIER_RE = re.compile(r"\s*(?:[-\u2013|,(\[].*)?$")
+# Root element of an RSS/Atom/RDF document, after any declaration, comments or doctype
+XML_FEED_RE = re.compile(rb"(?:<\?[^>]*\?>\s*|<!--.*?-->\s*|<!DOCTYPE[^>]*>\s*)*<(?:rss|feed|rdf:RDF)\b", re.DOTALL | re.IGNORECASE)
+
+
+def local_name(tag: object) -> str:
+    return tag.rsplit("}", 1)[-1].lower() if isinstance(tag, str) else ""
+
+
+def sniff_feed(body: bytes) -> str:
+    """Return ``xml`` or ``json`` when the body looks like a feed, else ""."""
+    head = body[:SNIFF_BYTES].lstrip(b"\xef\xbb\xbf \t\r\n")
+    if head.startswith(b"{") and b"jsonfeed.org" in head:
+        return "json"
+    return "xml" if XML_FEED_RE.match(head) else ""
+
+
+class _AlternateLinkParser(HTMLParser):
+    """Collect ``<link rel="alternate">`` feed URLs from a listing page's head."""
+
+    def __init__(self, base_url: str) -> None:
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.feeds: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag != "link":
+            return
+        values = {name: (value or "") for name, value in attrs}
+        rels = values.get("rel", "").lower().split()
+        feed_type = values.get("type", "").split(";", 1)[0].strip().lower()
+        if "alternate" in rels and feed_type in FEED_TYPES and values.get("href"):
+            self.feeds.append(urljoin(self.base_url, values["href"]))
+
+
+def alternate_feeds(page_html: str, base_url: str) -> list[str]:
+    parser = _AlternateLinkParser(base_url)
+    parser.feed(page_html)
+    parser.close()
+    return parser.feeds
+
+
+def well_known_feeds(listing_url: str) -> list[str]:
+    base = listing_url if listing_url.endswith("/") else f"{listing_url}/"
+    return [urljoin(base, path) for path in WELL_KNOWN_PATHS]
+
+
+def _host(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def listing_prefix(listing_url: str) -> str:
+    """Path prefix shared by a listing's feed and its job pages ("/jobs/" for ".../jobs")."""
+    return urlparse(listing_url).path.rstrip("/") + "/"
+
+
+def in_listing_scope(url: str, listing_url: str) -> bool:
+    """True when ``url`` is on the listing's host and under its path."""
+    if _host(url) != _host(listing_url):
+        return False
+    return (urlparse(url).path.rstrip("/") + "/").startswith(listing_prefix(listing_url))
+
+
+def job_shaped(entry: dict, prefix: str) -> bool:
+    """Whether a feed entry reads like a job posting rather than news or a forum post."""
+    if entry.get("company") or entry.get("location"):
+        return True
+    title = entry.get("title", "").strip()
+    if COMPANY_HIRING_RE.match(title):
+        return True
+    link_path = urlparse(entry.get("link", "")).path.rstrip("/") + "/"
+    if prefix != "/" and link_path != prefix and link_path.startswith(prefix):
+        return True
+    role = TITLE_QUALIFIER_RE.sub("", split_title(title)[0])
+    return bool(ROLE_RE.search(role))
+
+
+def looks_like_job_feed(entries: Iterable[dict], listing_url: str) -> bool:
+    """True when most of the feed's first entries are job-shaped."""
+    prefix = listing_prefix(listing_url)
+    sample = list(itertools.islice(entries, FEED_SAMPLE_SIZE))
+    shaped = sum(job_shaped(entry, prefix) for entry in sample)
+    return bool(sample) and shaped * 2 >= len(sample)
+
+
+class FeedCache:
+    """Discovered feed URL per listing URL ("" for none), cached on disk for a day."""
+
+    def __init__(self, path: str | None = None, ttl: float = FEED_TTL_SECONDS) -> None:
+        self.path = path or str(data_path(FEEDS_FILE))
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                self._disk: dict[str, dict] = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            self._disk = {}
+
+    def get(self, listing_url: str) -> str | None:
+        """The cached feed URL, "" when the listing has none, or None when unknown or expired."""
+        with self._lock:
+            entry = self._disk.get(listing_url)
+        if not entry or time.time() - float(entry.get("checkedAt", 0)) > self.ttl:
+            return None
+        feed_url = str(entry.get("feed") or "")
+        # Entries written before discovery was scoped to the listing are rediscovered
+        return feed_url if not feed_url or in_listing_scope(feed_url, listing_url) else None
+
+    def put(self, listing_url: str, feed_url: str) -> None:
+        with self._lock:
+            self._disk[listing_url] = {"feed": feed_url, "checkedAt": time.time()}
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as handle:
+                    json.dump(self._disk, handle)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
+
+
+@contextmanager
+def open_feed(url: str) -> Iterator[Iterator[dict] | None]:
+    """
+    Stream a feed URL: yields its entries, parsed as the body arrives, or None when
+    the URL does not serve a feed. The connection stays open inside the block.
+    """
+    with get_scheduler().stream(url, headers={"Accept": FEED_ACCEPT}) as (response, chunks):
+        if not response.ok:
+            yield None
+            return
+        kind, chunks = _sniffed(chunks)
+        yield _entries(kind, chunks) if kind else None
+
+
+def is_job_feed(url: str, listing_url: str) -> bool:
+    """Whether ``url`` serves a feed whose first entries are job postings."""
+    try:
+        with open_feed(url) as entries:
+            return entries is not None and looks_like_job_feed(entries, listing_url)
+    except FEED_ERRORS:
+        return False
+
+
+def discover_feed(listing_url: str, cache: FeedCache | None = None) -> str:
+    """Return the listing's feed URL, or "" when it has none."""
+    cache = cache or FeedCache()
+    cached = cache.get(listing_url)
+    if cached is not None:
+        return cached
+    response = get_scheduler().fetch(listing_url)
+    if response.status == 0 or response.status >= 500:
+        return ""  # Unreachable for now; do not remember the miss
+    candidates = []
+    if response.ok and sniff_feed(response.body):
+        candidates.append(listing_url)
+    elif response.ok:
+        candidates.extend(alternate_feeds(response.text(), response.final_url or listing_url))
+    candidates.extend(url for url in well_known_feeds(listing_url) if url not in candidates)
+    scoped = [url for url in candidates if in_listing_scope(url, listing_url)]
+    feed_url = next((url for url in scoped if is_job_feed(url, listing_url)), "")
+    cache.put(listing_url, feed_url)
+    return feed_url
+
+
+def _text(element: ET.Element) -> str:
+    return " ".join("".join(element.itertext()).split())
+
+
+def _xml_entry(element: ET.Element) -> dict:
+    entry: dict = {"categories": []}
+    for child in element:
+        name = local_name(child.tag)
+        if name == "link":
+            rel = child.get("rel", "alternate")
+            href = child.get("href") or _text(child)
+            if href and rel == "alternate" and not entry.get("link"):
+                entry["link"] = href
+        elif name == "category":
+            term = child.get("term") or _text(child)
+            if term:
+                entry["categories"].append(term)
+        elif name in ("author", "creator") and not entry.get("author"):
+            names = [_text(part) for part in child if local_name(part.tag) == "name"]
+            entry["author"] = names[0] if names else _text(child)
+        elif name in ("description", "summary", "encoded", "content"):
+            # content:encoded / content carry the full body; prefer them over summaries
+            if name in ("encoded", "content") or not entry.get("description"):
+                entry["description"] = "".join(child.itertext())
+        elif name in ("pubdate", "published", "date", "updated", "issued"):
+            if name != "updated" or not entry.get("published"):
+                entry["published"] = _text(child)
+        elif name in COMPANY_FIELDS:
+            entry["company"] = _text(child)
+        elif name in LOCATION_FIELDS:
+            entry["location"] = " ".join(filter(None, (entry.get("location"), _text(child))))
+        elif name in ("title", "guid", "id") and not entry.get(name):
+            entry[name] = _text(child)
+    if not entry.get("link") and entry.get("guid", "").startswith("http"):
+        entry["link"] = entry["guid"]
+    return entry
+
+
+def _xml_entries(chunks: Iterable[bytes]) -> Iterator[dict]:
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: list[ET.Element] = []
+
+    def converted() -> Iterator[dict]:
+        for event, element in parser.read_events():
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            if local_name(element.tag) in ENTRY_TAGS:
+                yield _xml_entry(element)
+                # Drop the converted entry so the tree never holds more than one
+                if stack:
+                    stack[-1].remove(element)
+                element.clear()
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from converted()
+    parser.close()
+    yield from converted()
+
+
+def _json_entries(body: bytes) -> Iterator[dict]:
+    # JSON Feed has no streaming form; its items are still converted one at a time
+    data = json.loads(body)
+    items = data.get("items") if isinstance(data, dict) else None
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        authors = item.get("authors") or ([item["author"]] if isinstance(item.get("author"), dict) else [])
+        names = [author.get("name") for author in authors if isinstance(author, dict) and author.get("name")]
+        yield {
+            "title": str(item.get("title") or ""),
+            "link": str(item.get("url") or item.get("external_url") or ""),
+            "description": str(item.get("content_text") or item.get("content_html") or item.get("summary") or ""),
+            "published": str(item.get("date_published") or item.get("date_modified") or ""),
+            "author": str(names[0]) if names else "",
+            "categories": [str(tag) for tag in item.get("tags") or [] if isinstance(tag, str)],
+        }
+
+
+def _sniffed(chunks: Iterable[bytes]) -> tuple[str, Iterator[bytes]]:
+    """Sniff the feed kind from the first chunks and return it with the whole, unconsumed body."""
+    chunks = iter(chunks)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= SNIFF_BYTES:
+            break
+    return sniff_feed(head), itertools.chain((head,), chunks)
+
+
+def _entries(kind: str, chunks: Iterable[bytes]) -> Iterator[dict]:
+    if kind == "json":
+        return _json_entries(b"".join(chunks))
+    if kind == "xml":
+        return _xml_entries(chunks)
+    return iter(())
+
+
+def parse_feed(body: bytes | Iterable[bytes]) -> Iterator[dict]:
+    """
+    Yield raw feed entries (title, link, description, published, author, categories, ...)
+    from a whole body or from its chunks as they arrive.
+    """
+    kind, chunks = _sniffed((body,) if isinstance(body, bytes) else body)
+    return _entries(kind, chunks)
+
+
+def entry_date(entry: dict) -> str:
+    return normalize_posted_date(entry.get("published", ""))
+
+
+def plain_text(markup: str) -> str:
+    return " ".join(html.unescape(TAG_RE.sub(" ", markup or "")).split())
+
+
+def split_title(title: str) -> tuple[str, str]:
+    """Split "Title at Company" / "Company is hiring a Title" into ``(title, company)``."""
+    for pattern in (COMPANY_HIRING_RE, TITLE_AT_COMPANY_RE):
+        match = pattern.match(title)
+        if match:
+            return match.group("title").strip(), match.group("company").strip()
+    return title, ""
+
+
+def scrape_feed(
+    board: str,
+    source_url: str,
+    source: str,
+    hash_job: Callable[[str, str, str], str],
+    request: PageRequest,
+    default_company: str = "Unknown",
+) -> tuple[list[JobRecord], str, str | None] | None:
+    """
+    Return the board's ``(jobs, status, next_cursor)`` from its feed, or None to
+    fall back to the HTML/RPA path. Applies ``since``, ``knownUrls``, ``limit``
+    and ``cursor`` like the listing scrapers; its cursors are feed cursors, and a
+    listing cursor resumes on the listing.
+    """
+    option = read_payload().get("feed")
+    if option is False or request.page != 1 or request.offset:
+        return None
+    if isinstance(option, str) and option.strip():
+        feed_url = option.strip()
+    else:
+        try:
+            feed_url = discover_feed(source_url)
+        except OSError as exc:
+            print(f"Feed discovery failed: {exc}", file=sys.stderr)
+            return None
+    if not feed_url:
+        return None
+
+    since = since_from(read_payload())
+    known_urls = known_urls_from(read_payload())
+    offset = decode_feed_cursor(read_payload().get("cursor"), board)
+    end = None if request.limit is None else offset + request.limit
+    kept: list[JobRecord] = []
+    location_texts: list[str] = []
+    more = False
+    entries = 0
+    try:
+        with open_feed(feed_url) as feed:
+            if feed is None:
+                return None
+            for entry in feed:
+                entries += 1
+                raw_title = entry.get("title", "").strip()
+                if len(raw_title) < 3:
+                    continue
+                title, title_company = split_title(raw_title)
+                url = urljoin(feed_url, entry.get("link", "")) if entry.get("link") else source_url
+                posted_date = entry_date(entry)
+                if is_older(posted_date, since) or url in known_urls:
+                    continue
+                if end is not None and len(kept) >= end:
+                    more = True
+                    break
+                description = plain_text(entry.get("description", ""))
+                kept.append(JobRecord(
+                    title,
+                    entry.get("company") or title_company or entry.get("author") or default_company,
+                    description=description,
+                    url=url,
+                    base_url=source_url,
+                    source=source,
+                    posted_date=posted_date,
+                ))
+                location_texts.append(
+                    entry.get("location") or " ".join([raw_title, *entry.get("categories", []), description[:500]])
+                )
+    except FEED_ERRORS as exc:
+        print(f"Feed read stopped at {feed_url}: {exc}", file=sys.stderr)
+        if not kept:
+            return None
+    if not entries:
+        return None
+
+    jobs = kept[offset:]
+    apply_location_fields(jobs, texts=location_texts[offset:])
+    for job in jobs:
+        job.content_hash = hash_job(job.title, job.company, job.location)
+    next_cursor = encode_feed_cursor(board, end) if more and end is not None else None
+    return jobs, STATUS_OK, next_cursor
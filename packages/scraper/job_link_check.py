@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Dead-link checker for stored job listings.
+Takes a batch of job URLs (or job dicts) over stdin and checks them
+concurrently through the shared host scheduler, over keep-alive connections
+pooled per host. Each URL gets a HEAD request (GET where HEAD is refused),
+and redirects are followed one hop at a time so every target is inspected.
+
+A listing is ``closed`` when it answers 404/410, when a redirect lands on a
+"closed listing" URL (``/expired``, ``?error=job-not-found``...) or on the
+listing index above the job, or, for pages fetched with GET, when the page
+says the position is filled. One ``{url, status, finalUrl, closed, reason}``
+line is printed per URL as soon as it is checked.
+"""
+from __future__ import annotations
+
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator
+from urllib.parse import parse_qsl, unquote, urljoin, urlsplit
+
+from host_scheduler import HostScheduler, configure_scheduler
+from http_client import ConnectionPool, HttpResponse
+from job_enrichment import html_to_text
+from keyword_automaton import KeywordAutomaton
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_TIMEOUT = 15
+DEFAULT_MAX_REDIRECTS = 5
+# Only the start of a page is read for closed-listing phrases
+BODY_BYTES = 256 * 1024
+# HEAD is often refused or blocked where GET works
+HEAD_REFUSED = {403, 405, 501}
+CLOSED_STATUSES = {404, 410}
+# Link checks are HEAD requests, so they can go faster than the board crawls
+DEFAULT_POLITENESS = {"requestsPerSecond": 4, "burst": 8, "perHostConcurrency": 4, "maxConcurrency": 32}
+
+CLOSED_URL_PATTERN = re.compile(
+    r"(?<![a-z0-9])(?:expired|closed|filled|no-?longer-?(?:available|active)|not-?found|page-?not-?found"
+    r"|unavailable|removed|inactive|archived|gone|404|410)(?![a-z0-9])"
+)
+CLOSED_PHRASES = (
+    "no longer accepting applications", "no longer available", "no longer active", "position has been filled",
+    "position is filled", "role has been filled", "job has been filled", "job has expired", "job has been closed",
+    "job is closed", "this job is no longer", "this position is no longer", "this position has closed",
+    "vacancy has closed", "vacancy has expired", "listing has expired", "posting has expired",
+    "posting is no longer", "applications are closed", "applications have closed", "job not found",
+    "job could not be found", "page not found",
+)
+SCRIPT_STYLE_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+_PHRASES = KeywordAutomaton((phrase, phrase) for phrase in CLOSED_PHRASES)
+
+
+def _site(netloc: str) -> str:
+    netloc = netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+def _path_parts(path: str) -> list[str]:
+    return [unquote(part).lower().replace("_", "-") for part in path.split("/") if part]
+
+
+def _query_pairs(query: str) -> set[tuple[str, str]]:
+    return {(name.lower(), value.lower().replace("_", "-")) for name, value in parse_qsl(query, keep_blank_values=True)}
+
+
+def closed_url_reason(original_url: str, target_url: str) -> str:
+    """
+    Why a redirect target marks the listing closed ('' when it does not).
+    Only what the redirect changed is inspected, so a listing whose own URL
+    says "closed" or "archived" (``/jobs/closed-captioning-engineer``) is not
+    reported by an http->https or trailing-slash hop.
+    """
+    original, target = urlsplit(original_url), urlsplit(target_url)
+    original_parts, target_parts = _path_parts(original.path), _path_parts(target.path)
+    added_parts = [part for part in target_parts if part not in original_parts]
+    added_pairs = _query_pairs(target.query) - _query_pairs(original.query)
+    marker = "/".join(added_parts) + "?" + "&".join(f"{name}={value}" for name, value in sorted(added_pairs))
+    if CLOSED_URL_PATTERN.search(marker):
+        return "closed_redirect"
+    if (
+        _site(target.netloc) == _site(original.netloc)
+        and len(target_parts) < len(original_parts)
+        and original_parts[: len(target_parts)] == target_parts
+    ):
+        # /jobs/1234-senior-artist -> /jobs/ (or the home page): the job page is gone
+        return "index_redirect"
+    return ""
+
+
+def closed_page_phrase(response: HttpResponse) -> str:
+    """The first closed-listing phrase in a fetched page ('' when none)."""
+    if not response.body or "html" not in response.header("content-type").lower():
+        return ""
+    text = html_to_text(SCRIPT_STYLE_RE.sub(" ", response.text()))
+    match = next(iter(_PHRASES.iter_matches(text)), None)
+    return str(match.value) if match else ""
+
+
+def check_url(
+    url: str,
+    scheduler: HostScheduler,
+    pool: ConnectionPool,
+    inspect_body: bool = False,
+    max_redirects: int = DEFAULT_MAX_REDIRECTS,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> dict:
+    """Check one listing URL; never raises."""
+    method = "GET" if inspect_body else "HEAD"
+    current = url
+    reason = ""
+    response = HttpResponse(url=url)
+    for _ in range(max_redirects + 1):
+        response = scheduler.fetch(current, pool=pool, method=method, timeout=timeout, max_bytes=BODY_BYTES)
+        if method == "HEAD" and response.status in HEAD_REFUSED:
+            method = "GET"
+            response = scheduler.fetch(current, pool=pool, method=method, timeout=timeout, max_bytes=BODY_BYTES)
+        location = response.header("location")
+        if not (300 <= response.status < 400 and location):
+            break
+        current = urljoin(current, location)
+        reason = reason or closed_url_reason(url, current)
+    else:
+        response.error = f"More than {max_redirects} redirects"
+
+    if response.status in CLOSED_STATUSES:
+        reason = f"http_{response.status}"
+    elif not reason and response.ok and method == "GET":
+        phrase = closed_page_phrase(response)
+        reason = f"page_text: {phrase}" if phrase else ""
+    result: dict[str, object] = {
+        "url": url,
+        "status": response.status,
+        "finalUrl": current,
+        "closed": bool(reason),
+        "reason": reason,
+    }
+    if response.error and response.status not in CLOSED_STATUSES:
+        result["error"] = response.error
+    return result
+
+
+def check_links(
+    urls: Iterable[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    inspect_body: bool = False,
+    max_redirects: int = DEFAULT_MAX_REDIRECTS,
+    timeout: float = DEFAULT_TIMEOUT,
+    scheduler: HostScheduler | None = None,
+) -> Iterator[dict]:
+    """Yield one result per unique http(s) URL, in completion order."""
+    unique = list(dict.fromkeys(u.strip() for u in urls if isinstance(u, str) and u.strip().startswith("http")))
+    scheduler = scheduler or configure_scheduler(DEFAULT_POLITENESS)
+    pool = ConnectionPool()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = [
+                executor.submit(check_url, url, scheduler, pool, inspect_body, max_redirects, timeout)
+                for url in unique
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        pool.close()
+
+
+def _int_option(payload: dict, key: str, default: int) -> int:
+    value = payload.get(key)
+    return int(value) if isinstance(value, (int, float)) and not isinstance(value, bool) and int(value) > 0 else default
+
+
+if __name__ == "__main__":
+    try:
+        payload = json.loads(sys.stdin.read() or "{}")
+    except json.JSONDecodeError:
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {"urls": payload} if isinstance(payload, list) else {}
+
+    politeness = payload.get("politeness")
+    politeness = {**DEFAULT_POLITENESS, **(politeness if isinstance(politeness, dict) else {})}
+    if "perHostConcurrency" in payload:
+        politeness["perHostConcurrency"] = payload["perHostConcurrency"]
+    jobs = payload.get("jobs")
+    if isinstance(jobs, list):
+        urls = [str(job.get("url") or "") for job in jobs if isinstance(job, dict)]
+    else:
+        urls = payload.get("urls") if isinstance(payload.get("urls"), list) else []
+    results = check_links(
+        urls,
+        concurrency=_int_option(payload, "concurrency", DEFAULT_CONCURRENCY),
+        inspect_body=payload.get("inspectBody") is True,
+        max_redirects=_int_option(payload, "maxRedirects", DEFAULT_MAX_REDIRECTS),
+        timeout=_int_option(payload, "timeout", DEFAULT_TIMEOUT),
+        scheduler=configure_scheduler(politeness),
+    )
+    for result in results:
+        sys.stdout.write(json.dumps(result, separators=(",", ":"), ensure_ascii=False) + "\n")
+        sys.stdout.flush()
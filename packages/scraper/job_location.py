@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Location normalization for scraped job listings.
+Classifies free-form location text into structured city/region/country fields
+and remote/hybrid flags using a precompiled gazetteer, so every board shares
+one consistent (and cheap) classification instead of per-board regexes.
+"""
+from __future__ import annotations
+
+import json
+import sys
+from functools import lru_cache
+from typing import Iterable
+
+from job_record import JobRecord
+from keyword_automaton import KeywordAutomaton, KeywordMatch
+
+# (name, region, country, aliases)
+CITIES: list[tuple[str, str, str, tuple[str, ...]]] = [
+    # United Kingdom & Ireland
+    ("London", "England", "United Kingdom", ()),
+    ("Manchester", "England", "United Kingdom", ()),
+    ("Brighton", "England", "United Kingdom", ()),
+    ("Liverpool", "England", "United Kingdom", ()),
+    ("Leeds", "England", "United Kingdom", ()),
+    ("Birmingham", "England", "United Kingdom", ()),
+    ("Bristol", "England", "United Kingdom", ()),
+    ("Oxford", "England", "United Kingdom", ()),
+    ("Cambridge", "England", "United Kingdom", ()),
+    ("Sheffield", "England", "United Kingdom", ()),
+    ("Newcastle", "England", "United Kingdom", ("Newcastle upon Tyne",)),
+    ("Guildford", "England", "United Kingdom", ()),
+    ("Leamington Spa", "England", "United Kingdom", ("Royal Leamington Spa",)),
+    ("Nottingham", "England", "United Kingdom", ()),
+    ("Derby", "England", "United Kingdom", ()),
+    ("Edinburgh", "Scotland", "United Kingdom", ()),
+    ("Glasgow", "Scotland", "United Kingdom", ()),
+    ("Dundee", "Scotland", "United Kingdom", ()),
+    ("Cardiff", "Wales", "United Kingdom", ()),
+    ("Belfast", "Northern Ireland", "United Kingdom", ()),
+    ("Dublin", "", "Ireland", ()),
+    # United States
+    ("Los Angeles", "California", "United States", ("LA",)),
+    ("San Francisco", "California", "United States", ("SF", "Bay Area", "San Francisco Bay Area")),
+    ("San Diego", "California", "United States", ()),
+    ("San Jose", "California", "United States", ()),
+    ("San Mateo", "California", "United States", ()),
+    ("Santa Monica", "California", "United States", ()),
+    ("Redwood City", "California", "United States", ()),
+    ("Irvine", "California", "United States", ()),
+    ("Burbank", "California", "United States", ()),
+    ("Seattle", "Washington", "United States", ()),
+    ("Bellevue", "Washington", "United States", ()),
+    ("Redmond", "Washington", "United States", ()),
+    ("Kirkland", "Washington", "United States", ()),
+    ("New York", "New York", "United States", ("New York City", "NYC")),
+    ("Boston", "Massachusetts", "United States", ()),
+    ("Austin", "Texas", "United States", ()),
+    ("Dallas", "Texas", "United States", ()),
+    ("Chicago", "Illinois", "United States", ()),
+    ("Cary", "North Carolina", "United States", ()),
+    ("Raleigh", "North Carolina", "United States", ()),
+    ("Denver", "Colorado", "United States", ()),
+    ("Portland", "Oregon", "United States", ()),
+    ("Atlanta", "Georgia", "United States", ()),
+    ("Orlando", "Florida", "United States", ()),
+    ("Salt Lake City", "Utah", "United States", ()),
+    ("Baltimore", "Maryland", "United States", ()),
+    # Canada
+    ("Montreal", "Quebec", "Canada", ("Montréal",)),
+    ("Quebec City", "Quebec", "Canada", ("Québec City",)),
+    ("Toronto", "Ontario", "Canada", ()),
+    ("Ottawa", "Ontario", "Canada", ()),
+    ("Vancouver", "British Columbia", "Canada", ()),
+    ("Victoria", "British Columbia", "Canada", ()),
+    ("Edmonton", "Alberta", "Canada", ()),
+    ("Calgary", "Alberta", "Canada", ()),
+    ("Halifax", "Nova Scotia", "Canada", ()),
+    # Australia & New Zealand
+    ("Sydney", "New South Wales", "Australia", ()),
+    ("Melbourne", "Victoria", "Australia", ()),
+    ("Brisbane", "Queensland", "Australia", ()),
+    ("Adelaide", "South Australia", "Australia", ()),
+    ("Perth", "Western Australia", "Australia", ()),
+    ("Auckland", "", "New Zealand", ()),
+    ("Wellington", "", "New Zealand", ()),
+    # Europe
+    ("Helsinki", "", "Finland", ()),
+    ("Espoo", "", "Finland", ()),
+    ("Stockholm", "", "Sweden", ()),
+    ("Malmö", "", "Sweden", ("Malmo",)),
+    ("Gothenburg", "", "Sweden", ("Göteborg",)),
+    ("Skövde", "", "Sweden", ("Skovde",)),
+    ("Copenhagen", "", "Denmark", ()),
+    ("Oslo", "", "Norway", ()),
+    ("Berlin", "", "Germany", ()),
+    ("Hamburg", "", "Germany", ()),
+    ("Munich", "", "Germany", ("München",)),
+    ("Frankfurt", "", "Germany", ()),
+    ("Cologne", "", "Germany", ("Köln",)),
+    ("Paris", "", "France", ()),
+    ("Lyon", "", "France", ()),
+    ("Bordeaux", "", "France", ()),
+    ("Montpellier", "", "France", ()),
+    ("Amsterdam", "", "Netherlands", ()),
+    ("Utrecht", "", "Netherlands", ()),
+    ("Barcelona", "", "Spain", ()),
+    ("Madrid", "", "Spain", ()),
+    ("Lisbon", "", "Portugal", ()),
+    ("Warsaw", "", "Poland", ()),
+    ("Kraków", "", "Poland", ("Krakow", "Cracow")),
+    ("Wrocław", "", "Poland", ("Wroclaw",)),
+    ("Prague", "", "Czech Republic", ()),
+    ("Brno", "", "Czech Republic", ()),
+    ("Bucharest", "", "Romania", ()),
+    ("Kyiv", "", "Ukraine", ("Kiev",)),
+    ("Vienna", "", "Austria", ()),
+    ("Zurich", "", "Switzerland", ("Zürich",)),
+    ("Milan", "", "Italy", ()),
+    ("Belgrade", "", "Serbia", ()),
+    ("Istanbul", "", "Turkey", ()),
+    ("Tbilisi", "", "Georgia", ()),
+    ("Batumi", "", "Georgia", ()),
+    # Asia, Middle East, Latin America, Africa
+    ("Tokyo", "", "Japan", ()),
+    ("Osaka", "", "Japan", ()),
+    ("Kyoto", "", "Japan", ()),
+    ("Seoul", "", "South Korea", ()),
+    ("Singapore", "", "Singapore", ()),
+    ("Shanghai", "", "China", ()),
+    ("Beijing", "", "China", ()),
+    ("Shenzhen", "", "China", ()),
+    ("Hong Kong", "", "Hong Kong", ()),
+    ("Bangalore", "Karnataka", "India", ("Bengaluru",)),
+    ("Pune", "Maharashtra", "India", ()),
+    ("Hyderabad", "Telangana", "India", ()),
+    ("Kuala Lumpur", "", "Malaysia", ()),
+    ("Bangkok", "", "Thailand", ()),
+    ("Manila", "", "Philippines", ()),
+    ("Tel Aviv", "", "Israel", ()),
+    ("Dubai", "", "United Arab Emirates", ()),
+    ("São Paulo", "", "Brazil", ("Sao Paulo",)),
+    ("Mexico City", "", "Mexico", ()),
+    ("Buenos Aires", "", "Argentina", ()),
+    ("Cape Town", "", "South Africa", ()),
+]
+
+# (name, country, case-sensitive codes, aliases)
+REGIONS: list[tuple[str, str, tuple[str, ...], tuple[str, ...]]] = [
+    ("England", "United Kingdom", (), ()),
+    ("Scotland", "United Kingdom", (), ()),
+    ("Wales", "United Kingdom", (), ()),
+    ("Northern Ireland", "United Kingdom", (), ()),
+    ("California", "United States", ("CA",), ()),
+    ("Washington", "United States", ("WA",), ()),
+    ("New York", "United States", ("NY",), ()),
+    ("Massachusetts", "United States", ("MA",), ()),
+    ("Texas", "United States", ("TX",), ()),
+    ("Illinois", "United States", ("IL",), ()),
+    ("North Carolina", "United States", ("NC",), ()),
+    ("Colorado", "United States", ("CO",), ()),
+    ("Oregon", "United States", (), ()),
+    ("Georgia", "United States", ("GA",), ()),
+    ("Florida", "United States", ("FL",), ()),
+    ("Utah", "United States", ("UT",), ()),
+    ("Maryland", "United States", ("MD",), ()),
+    ("Quebec", "Canada", ("QC",), ("Québec",)),
+    ("Ontario", "Canada", (), ()),
+    ("British Columbia", "Canada", ("BC",), ()),
+    ("Alberta", "Canada", ("AB",), ()),
+    ("Nova Scotia", "Canada", ("NS",), ()),
+    ("New South Wales", "Australia", ("NSW",), ()),
+    ("Queensland", "Australia", ("QLD",), ()),
+    ("South Australia", "Australia", (), ()),
+    ("Western Australia", "Australia", (), ()),
+]
+
+# (name, case-sensitive codes, aliases)
+COUNTRIES: list[tuple[str, tuple[str, ...], tuple[str, ...]]] = [
+    ("United Kingdom", ("UK", "GB"), ("Great Britain", "Britain")),
+    ("Ireland", (), ("Republic of Ireland",)),
+    ("United States", ("US", "USA", "U.S.", "U.S.A."), ("United States of America", "America")),
+    ("Canada", (), ()),
+    ("Australia", (), ()),
+    ("New Zealand", ("NZ",), ()),
+    ("Finland", (), ()),
+    ("Sweden", (), ()),
+    ("Denmark", (), ()),
+    ("Norway", (), ()),
+    ("Germany", (), ()),
+    ("France", (), ()),
+    ("Netherlands", (), ("The Netherlands", "Holland")),
+    ("Spain", (), ()),
+    ("Portugal", (), ()),
+    ("Poland", (), ()),
+    ("Czech Republic", (), ("Czechia",)),
+    ("Romania", (), ()),
+    ("Ukraine", (), ()),
+    ("Austria", (), ()),
+    ("Switzerland", (), ()),
+    ("Italy", (), ()),
+    ("Serbia", (), ()),
+    ("Turkey", (), ("Türkiye",)),
+    ("Japan", (), ()),
+    ("South Korea", (), ("Korea",)),
+    ("China", (), ()),
+    ("India", (), ()),
+    ("Malaysia", (), ()),
+    ("Thailand", (), ()),
+    ("Philippines", (), ()),
+    ("Israel", (), ()),
+    ("United Arab Emirates", ("UAE",), ()),
+    ("Brazil", (), ()),
+    ("Mexico", (), ()),
+    ("Argentina", (), ()),
+    ("South Africa", (), ()),
+]
+
+# Broad areas that say where a role is open without naming a country.
+AREAS: list[tuple[str, tuple[str, ...], tuple[str, ...]]] = [
+    ("Europe", ("EU", "EMEA"), ("European Union",)),
+    ("North America", (), ()),
+    ("Asia Pacific", ("APAC",), ()),
+    ("Latin America", ("LATAM",), ()),
+]
+
+REMOTE_KEYWORDS = (
+    "remote", "fully remote", "100% remote", "remote-first", "remote first",
+    "work from home", "work from anywhere", "wfh", "anywhere", "worldwide",
+    "telecommute", "home based", "home-based",
+)
+HYBRID_KEYWORDS = (
+    "hybrid", "hybrid remote", "remote hybrid", "partially remote", "partly remote",
+    "part remote", "flexible remote", "office/remote",
+)
+ONSITE_KEYWORDS = (
+    "on-site", "onsite", "on site", "in-office", "in office", "office based",
+    "office-based", "no remote", "not remote", "non-remote",
+)
+
+_KIND_RANK = {"city": 0, "region": 1, "country": 2, "area": 3}
+# Region names that are also countries: read as the country right after one of its
+# cities ("Tbilisi, Georgia"), else as the region ("Atlanta, Georgia", "Georgia")
+HOMONYM_COUNTRIES = frozenset({"Georgia"})
+# Words that negate an on-site keyword ("no on-site required", "on-site optional")
+# What may sit between a city and the region or country qualifying it ("Paris, TX", "London (Ontario)")
+_QUALIFIER_SEPARATORS = " ,(-\u2013/|"
+_ONSITE_NEGATIONS_BEFORE = ("no", "not", "without", "never")
+_ONSITE_NEGATIONS_AFTER = ("not required", "not needed", "not necessary", "optional")
+# Codes that are also ordinary upper-case words ("JOIN US NOW", "MA in Game Art") only
+# count after a comma, in parentheses, or next to another place or remote keyword.
+CONTEXT_CODES = frozenset({"US", "MA", "CO"})
+# Characters that may separate a context code from its neighbour ("Remote - US", "Boston/MA")
+_ADJACENT_SEPARATORS = " -\u2013/|"
+
+
+def _compile() -> tuple[KeywordAutomaton, KeywordAutomaton]:
+    folded = KeywordAutomaton()
+    exact = KeywordAutomaton(case_sensitive=True)
+
+    for name, region, country, aliases in CITIES:
+        entry = ("city", name, region, country)
+        for term in (name, *aliases):
+            # Short aliases such as "LA"/"SF" are only trusted in upper case.
+            (exact if len(term) <= 3 else folded).add(term, entry)
+    for name, country, codes, aliases in REGIONS:
+        entry = ("region", "", name, country)
+        for term in (name, *aliases):
+            folded.add(term, entry)
+        for code in codes:
+            exact.add(code, entry)
+    for name, codes, aliases in COUNTRIES:
+        entry = ("country", "", "", name)
+        for term in (name, *aliases):
+            folded.add(term, entry)
+        for code in codes:
+            exact.add(code, entry)
+    for name, codes, aliases in AREAS:
+        entry = ("area", "", name, "")
+        for term in (name, *aliases):
+            folded.add(term, entry)
+        for code in codes:
+            exact.add(code, entry)
+    for keyword in REMOTE_KEYWORDS:
+        folded.add(keyword, ("remote",))
+    for keyword in HYBRID_KEYWORDS:
+        folded.add(keyword, ("hybrid",))
+    for keyword in ONSITE_KEYWORDS:
+        folded.add(keyword, ("onsite",))
+    return folded, exact
+
+
+_FOLDED, _EXACT = _compile()
+
+
+def format_location(city: str, region: str, country: str) -> str:
+    """Render structured fields as a compact display string."""
+    parts = [city] if city else []
+    if region and region != city and (country in ("United States", "Canada", "Australia") or not city):
+        parts.append(region)
+    if country and country != city:
+        parts.append(country)
+    return ", ".join(parts)
+
+
+def _in_place_context(text: str, match: KeywordMatch, neighbours: list[KeywordMatch]) -> bool:
+    before = text[:match.start].rstrip()
+    after = text[match.end:].lstrip()
+    if before.endswith((",", "(")) or after.startswith(")"):
+        return True
+    if not before.strip(_ADJACENT_SEPARATORS) and not after.strip(_ADJACENT_SEPARATORS):
+        return True
+    for other in neighbours:
+        if other.end <= match.start:
+            gap = text[other.end:match.start]
+        elif other.start >= match.end:
+            gap = text[match.end:other.start]
+        else:
+            continue
+        if not gap.strip(_ADJACENT_SEPARATORS):
+            return True
+    return False
+
+
+def _negated(text: str, match: KeywordMatch) -> bool:
+    before = text[:match.start].rstrip(" -").lower()
+    after = text[match.end:].lstrip(" -").lower()
+    words = before.split()
+    return bool(words and words[-1] in _ONSITE_NEGATIONS_BEFORE) or after.startswith(_ONSITE_NEGATIONS_AFTER)
+
+
+def _agrees(city: tuple, qualifier: tuple) -> bool:
+    """Whether a region/country written after a city can be where that city is."""
+    _, _, city_region, city_country = city
+    kind, _, region, country = qualifier
+    if kind == "region":
+        return country == city_country and city_region in ("", region)
+    return country == city_country
+
+
+def _resolve_places(
+    text: str, places: list[tuple[int, int, tuple]], ends: dict[int, int],
+) -> list[tuple[int, int, tuple]]:
+    """
+    Read homonyms in context and drop cities contradicted by the region or country
+    written right after them ("London, Ontario", "Paris, TX"): the explicit place wins.
+    """
+    ordered = sorted(places, key=lambda p: p[1])
+    qualifiers: list[tuple | None] = []
+    for index, (_, start, value) in enumerate(ordered):
+        following = ordered[index + 1] if index + 1 < len(ordered) else None
+        adjacent = following is not None and not text[ends[start]:following[1]].strip(_QUALIFIER_SEPARATORS)
+        qualifiers.append(following[2] if adjacent else None)
+    for index, (_, start, value) in enumerate(ordered):
+        previous = ordered[index - 1][2] if index else None
+        if (
+            value[0] == "region" and value[2] in HOMONYM_COUNTRIES and previous
+            and previous[0] == "city" and previous[3] == value[2] and qualifiers[index - 1] is value
+        ):
+            ordered[index] = (_KIND_RANK["country"], start, ("country", "", "", value[2]))
+            qualifiers[index - 1] = ordered[index][2]
+    return [
+        place for place, qualifier in zip(ordered, qualifiers)
+        if not (place[2][0] == "city" and qualifier and qualifier[0] in ("region", "country") and not _agrees(place[2], qualifier))
+    ]
+
+
+@lru_cache(maxsize=4096)
+def _classify(text: str) -> tuple[str, str, str, bool, bool, bool]:
+    remote = hybrid = onsite = False
+    places: list[tuple[int, int, tuple]] = []
+    ends: dict[int, int] = {}
+    matches = _FOLDED.find_all(text) + _EXACT.find_all(text)
+    guarded = [match for match in matches if text[match.start:match.end] in CONTEXT_CODES]
+    if guarded:
+        neighbours = [match for match in matches if text[match.start:match.end] not in CONTEXT_CODES]
+        matches = [
+            match for match in matches
+            if text[match.start:match.end] not in CONTEXT_CODES or _in_place_context(text, match, neighbours)
+        ]
+    for match in matches:
+        value = match.value
+        kind = value[0]
+        if kind == "remote":
+            remote = True
+        elif kind == "hybrid":
+            hybrid = True
+        elif kind == "onsite":
+            onsite = onsite or not _negated(text, match)
+        else:
+            places.append((_KIND_RANK[kind], match.start, value))
+            ends[match.start] = match.end
+
+    city = region = country = ""
+    places = _resolve_places(text, places, ends)
+    if places:
+        # Most specific place wins; earlier text breaks ties.
+        places.sort(key=lambda p: (p[0], p[1]))
+        _, _, (kind, city, region, country) = places[0]
+        for _, _, (other_kind, _, other_region, other_country) in places[1:]:
+            if not country and other_country:
+                country = other_country
+            if not region and other_region and other_kind == "region" and other_country in ("", country):
+                region = other_region
+    return city, region, country, remote, hybrid, onsite
+
+
+def classify_location(text: str | None, remote_default: bool = False) -> dict[str, object]:
+    """
+    Classify one location string.
+    ``remote_default`` applies when the text carries no remote/hybrid/on-site signal
+    (e.g. boards that only list remote roles).
+    """
+    cleaned = " ".join((text or "").split())
+    city, region, country, remote, hybrid, onsite = _classify(cleaned)
+    if onsite and remote:
+        # "Remote or on-site in London": both are offered
+        hybrid = True
+    elif onsite:
+        remote = False
+    elif not remote and not hybrid:
+        remote = remote_default
+    return {
+        "city": city,
+        "region": region,
+        "country": country,
+        "remote": remote,
+        "hybrid": hybrid,
+    }
+
+
+def classify_locations(texts: Iterable[str | None], remote_default: bool = False) -> list[dict[str, object]]:
+    """Classify a batch of location strings; repeated strings are served from cache."""
+    return [classify_location(text, remote_default) for text in texts]
+
+
+def apply_location_fields(
+    jobs: list[JobRecord],
+    texts: Iterable[str | None] | None = None,
+    remote_default: bool = False,
+) -> list[JobRecord]:
+    """
+    Fill structured location fields on job records in place.
+    By default each job's own ``location`` is classified and kept for display.
+    When ``texts`` is given (free text surrounding a listing), that text is
+    classified instead and ``location`` is rebuilt from the result.
+    """
+    sources = list(texts) if texts is not None else [job.location for job in jobs]
+    for job, info in zip(jobs, classify_locations(sources, remote_default)):
+        job.city, job.region, job.country = str(info["city"]), str(info["region"]), str(info["country"])
+        job.remote, job.hybrid = bool(info["remote"]), bool(info["hybrid"])
+        location = " ".join(job.location.split())
+        if texts is not None or not location or location == "Unknown":
+            location = format_location(job.city, job.region, job.country)
+            if not location:
+                location = "Remote" if job.remote else "Unknown"
+        job.location = location
+    return jobs
+
+
+if __name__ == "__main__":
+    try:
+        payload = json.loads(sys.stdin.read() or "[]")
+    except json.JSONDecodeError:
+        payload = []
+    items = payload if isinstance(payload, list) else payload.get("locations", []) if isinstance(payload, dict) else []
+    print(json.dumps(classify_locations(str(item) for item in items), indent=2))
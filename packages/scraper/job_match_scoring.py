@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Batch job-to-resume match scoring stage.
+Takes one resume and N jobs over stdin and scores every job in vectorized
+NumPy passes, returning the jobs ranked by score with the resume terms
+each one matched.
+
+The resume supplies three term fields: ``skills`` (``skills.technical``,
+``soft`` and ``gaming``), ``technologies`` (experience and project
+technologies, game engines and platforms) and ``title`` (words and word pairs
+of experience titles). Jobs are tokenized once; skill and technology terms
+(up to four words) are matched against the title, description, requirements,
+technologies and tags, title terms against the job title only. Matches are
+kept as sparse (job, term, count) triples and weighted by sublinear TF times
+IDF over the batch. Each field scores the cosine similarity of job and resume
+over that field's terms; the overall score (0-100) is the weighted mean of
+the fields the resume has terms for.
+"""
+from __future__ import annotations
+
+import json
+import re
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FIELDS = ("skills", "technologies", "title")
+DEFAULT_WEIGHTS = {"skills": 0.4, "technologies": 0.35, "title": 0.25}
+MAX_TERM_TOKENS = 4
+MAX_MATCHED_TERMS = 20
+# Texts are matched in blocks of about this many characters, so each NumPy pass over
+# a block's bytes stays in CPU cache instead of streaming the whole batch from memory
+MATCH_BLOCK_CHARS = 256 * 1024
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+LIST_SEPARATORS = re.compile(r"[,;|\n]+")
+TITLE_STOPWORDS = frozenset({"a", "an", "and", "at", "for", "in", "of", "on", "the", "to", "with"})
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _strings(value: object) -> list[str]:
+    """Phrases from a list of strings or a comma-separated string."""
+    items = value if isinstance(value, list) else [value]
+    phrases: list[str] = []
+    for item in items:
+        if isinstance(item, str):
+            phrases.extend(part.strip() for part in LIST_SEPARATORS.split(item) if part.strip())
+    return phrases
+
+
+def _records(value: object) -> list[dict]:
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def resume_terms(resume: dict) -> dict[str, list[str]]:
+    """Raw term phrases per field, in resume order (repeats kept; they raise the term's weight)."""
+    skills = resume.get("skills") if isinstance(resume.get("skills"), dict) else {}
+    gaming = resume.get("gamingExperience") if isinstance(resume.get("gamingExperience"), dict) else {}
+    technologies: list[str] = []
+    for item in _records(resume.get("experience")) + _records(resume.get("projects")):
+        technologies.extend(_strings(item.get("technologies")))
+    technologies.extend(_strings(gaming.get("gameEngines")) + _strings(gaming.get("platforms")))
+    titles: list[str] = []
+    for item in _records(resume.get("experience")):
+        words = [token for token in tokenize(str(item.get("title") or "")) if token not in TITLE_STOPWORDS]
+        titles.extend(words)
+        titles.extend(f"{first} {second}" for first, second in zip(words, words[1:]))
+    return {
+        "skills": _strings(skills.get("technical")) + _strings(skills.get("soft")) + _strings(skills.get("gaming")),
+        "technologies": technologies,
+        "title": titles,
+    }
+
+
+# Token lengths above this share one signature bucket (they still need an exact hash match)
+MAX_SIGNATURE_LENGTH = 63
+
+if np is not None:
+    # Setting 0x20 lowercases ASCII letters and leaves digits, "+", "#" and "." unchanged
+    CASE_BIT = np.uint8(0x20)
+    HASH_MULTIPLIER = np.uint64(0x100000001B3)
+
+
+def _word_bytes(data: np.ndarray) -> np.ndarray:
+    """Mask of ASCII letters, digits, ``+`` and ``#`` (comparisons; a table gather is several times slower)."""
+    word = ((data | np.uint8(0x20)) - np.uint8(ord("a"))) < 26
+    word |= (data - np.uint8(ord("0"))) < 10
+    word |= (data == ord("+")) | (data == ord("#"))
+    return word
+
+
+class TermMatcher:
+    """Counts occurrences of multi-word terms in a batch of texts.
+
+    Texts are tokenized like :func:`tokenize`, but on the raw UTF-8 bytes with
+    NumPy: tokens are runs of word bytes, and a token is looked up only when its
+    length, first and last byte match some vocabulary token (one gather from a
+    boolean table); survivors are hashed (64-bit polynomial) and found by
+    binary search.
+    """
+
+    def __init__(self, terms: list[tuple[str, ...]]) -> None:
+        self.n_terms = len(terms)
+        vocabulary = list(dict.fromkeys(token for term in terms for token in term))
+        data, starts, lengths, _text_ends = self._spans(vocabulary)
+        self.signatures = np.zeros((MAX_SIGNATURE_LENGTH + 1) << 16, dtype=bool)
+        self.signatures[self._signatures(data, starts, lengths)] = True
+        keys = self._hash(data, starts, lengths)
+        self.key_order = np.argsort(keys)
+        self.keys = keys[self.key_order]
+        token_ids = {token: index + 1 for index, token in enumerate(vocabulary)}
+        self.base = len(vocabulary) + 1
+        # Per term length: sorted term codes (token ids as base-N digits) and the term index of each
+        self.codes: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        for length in sorted({len(term) for term in terms}):
+            indexes = np.array([i for i, term in enumerate(terms) if len(term) == length], dtype=np.int64)
+            codes = np.array([
+                sum(token_ids[token] * self.base ** offset for offset, token in enumerate(terms[i])) for i in indexes
+            ], dtype=np.int64)
+            order = np.argsort(codes)
+            self.codes[length] = (codes[order], indexes[order])
+
+    def _spans(self, texts: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Concatenated bytes, start and length of every token, and where each text ends."""
+        encoded = [text.encode("utf-8") for text in texts]
+        data = np.frombuffer(b"\n".join(encoded), dtype=np.uint8)
+        inside = _word_bytes(data)
+        # A dot belongs to the token when word bytes surround it (node.js, not "unity.")
+        dots = np.flatnonzero(data[1:-1] == ord(".")) + 1
+        inside[dots[inside[dots - 1] & inside[dots + 1]]] = True
+        # Token boundaries alternate: every even edge starts a token, the next one ends it
+        edges = np.flatnonzero(np.diff(inside, prepend=False, append=False))
+        starts = edges[::2]
+        lengths = edges[1::2] - starts
+        text_ends = np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)) + 1)
+        return data, starts, lengths, text_ends
+
+    def _signatures(self, data: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Index of each token's (length, first byte, last byte) into the signature table."""
+        first = (data[starts] | CASE_BIT).astype(np.int64)
+        last = data[starts + lengths - 1] | CASE_BIT
+        return (np.minimum(lengths, MAX_SIGNATURE_LENGTH) << 16) | (first << 8) | last
+
+    def _hash(self, data: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        if not len(starts):
+            return np.zeros(0, dtype=np.uint64)
+        # Longest tokens first, so the tokens still being hashed at each offset are a prefix
+        order = np.argsort(-lengths, kind="stable")
+        starts = starts[order]
+        remaining = np.searchsorted(-lengths[order], -np.arange(1, lengths.max() + 1), side="right")
+        keys = np.zeros(len(starts), dtype=np.uint64)
+        for offset, active in enumerate(remaining.tolist()):
+            keys[:active] = keys[:active] * HASH_MULTIPLIER + (data[starts[:active] + offset] | CASE_BIT)
+        unsorted = np.empty_like(keys)
+        unsorted[order] = keys
+        return unsorted
+
+    def count(self, texts: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sparse ``(text, term, count)`` arrays, sorted by text then term."""
+        empty = np.zeros(0, dtype=np.int64)
+        if not self.codes or not texts:
+            return empty, empty, empty
+        docs, terms, counts = [empty], [empty], [empty]
+        block_start, block_chars = 0, 0
+        for index, text in enumerate(texts):
+            block_chars += len(text)
+            if block_chars >= MATCH_BLOCK_CHARS or index == len(texts) - 1:
+                block_docs, block_terms, block_counts = self._count_block(texts[block_start:index + 1])
+                docs.append(block_docs + block_start)
+                terms.append(block_terms)
+                counts.append(block_counts)
+                block_start, block_chars = index + 1, 0
+        return np.concatenate(docs), np.concatenate(terms), np.concatenate(counts)
+
+    def _count_block(self, texts: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        empty = np.zeros(0, dtype=np.int64)
+        data, starts, lengths, text_ends = self._spans(texts)
+        positions = np.flatnonzero(self.signatures[self._signatures(data, starts, lengths)])
+        keys = self._hash(data, starts[positions], lengths[positions])
+        slot = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        found = self.keys[slot] == keys
+        positions = positions[found]
+        tokens = self.key_order[slot[found]] + 1
+        doc_of = np.searchsorted(text_ends, starts[positions], side="right")
+        # One gap between texts, so a term never spans two jobs
+        positions = positions + doc_of
+
+        hit_docs, hit_terms = [empty], [empty]
+        for length, (codes, indexes) in self.codes.items():
+            windows = len(tokens) - length + 1
+            if windows <= 0:
+                continue
+            code = tokens[:windows].copy()
+            adjacent = np.ones(windows, dtype=bool)
+            for offset in range(1, length):
+                code += tokens[offset:offset + windows] * self.base ** offset
+                adjacent &= positions[offset:offset + windows] == positions[:windows] + offset
+            code, docs_at = code[adjacent], doc_of[:windows][adjacent]
+            slot = np.minimum(np.searchsorted(codes, code), len(codes) - 1)
+            found = codes[slot] == code
+            hit_docs.append(docs_at[found])
+            hit_terms.append(indexes[slot[found]])
+
+        keys, counts = np.unique(
+            np.concatenate(hit_docs) * self.n_terms + np.concatenate(hit_terms), return_counts=True,
+        )
+        return keys // self.n_terms, keys % self.n_terms, counts
+
+
+def score_jobs(
+    resume: dict,
+    jobs: list[dict],
+    weights: dict[str, float] | None = None,
+    min_score: float = 0,
+    limit: int = 0,
+) -> list[dict]:
+    """Score every job against the resume; returns jobs scoring at least ``min_score``, best first."""
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    n_jobs = len(jobs)
+    raw = resume_terms(resume)
+
+    # One vocabulary per matching scope: skills and technologies share the job body
+    scopes = {"body": ("skills", "technologies"), "title": ("title",)}
+    scope_terms: dict[str, list[tuple[str, ...]]] = {}
+    labels: dict[str, list[str]] = {}
+    resume_counts: dict[str, dict[str, np.ndarray]] = {}
+    for scope, fields in scopes.items():
+        index: dict[tuple[str, ...], int] = {}
+        names: list[str] = []
+        per_field = {field: [] for field in fields}
+        for field in fields:
+            for phrase in raw[field]:
+                term = tuple(tokenize(phrase))
+                if not term or len(term) > MAX_TERM_TOKENS:
+                    continue
+                if term not in index:
+                    index[term] = len(index)
+                    names.append(phrase)
+                per_field[field].append(index[term])
+        scope_terms[scope] = list(index)
+        labels[scope] = names
+        resume_counts[scope] = {
+            field: np.bincount(np.array(ids, dtype=np.int64), minlength=len(index)) for field, ids in per_field.items()
+        }
+
+    texts = {"body": [_job_body(job) for job in jobs], "title": [str(job.get("title") or "") for job in jobs]}
+    field_scores = {field: np.zeros(n_jobs) for field in FIELDS}
+    field_matches: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+    for scope, fields in scopes.items():
+        terms = scope_terms[scope]
+        if not terms:
+            continue
+        doc, term, count = TermMatcher(terms).count(texts[scope])
+        idf = np.log((1 + n_jobs) / (1 + np.bincount(term, minlength=len(terms)))) + 1
+        weight = (1 + np.log(count)) * idf[term]
+        for field in fields:
+            resume_count = resume_counts[scope][field]
+            if not resume_count.any():
+                continue
+            query = np.where(resume_count > 0, (1 + np.log(np.maximum(resume_count, 1))) * idf, 0.0)
+            in_field = query[term] > 0
+            contribution = weight * query[term]
+            dot = np.bincount(doc, contribution, minlength=n_jobs)
+            norm = np.sqrt(np.bincount(doc, np.where(in_field, weight ** 2, 0.0), minlength=n_jobs))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                field_scores[field] = np.where(norm > 0, dot / (norm * np.linalg.norm(query)), 0.0)
+            field_matches[field] = (doc[in_field], term[in_field], contribution[in_field])
+
+    # Fields the resume has no terms for do not drag every score down
+    active = [field for scope, fields in scopes.items() for field in fields if resume_counts[scope][field].any()]
+    total_weight = sum(max(float(weights.get(field, 0)), 0.0) for field in active)
+    overall = np.zeros(n_jobs)
+    if total_weight > 0:
+        for field in active:
+            overall += max(float(weights.get(field, 0)), 0.0) * field_scores[field]
+        overall = overall / total_weight
+    scores = np.round(overall * 100, 1)
+    ranking = np.argsort(-overall, kind="stable")
+    ranking = ranking[scores[ranking] >= min_score]
+    if limit > 0:
+        ranking = ranking[:limit]
+
+    rows = ranking.tolist()
+    breakdown = {field: np.round(field_scores[field][ranking] * 100, 1).tolist() for field in FIELDS}
+    matched = {
+        field: _matched_terms(field_matches.get(field), labels["title" if field == "title" else "body"], ranking)
+        for field in FIELDS
+    }
+    results = []
+    for rank, (position, score) in enumerate(zip(rows, scores[ranking].tolist())):
+        job = jobs[position]
+        results.append({
+            "index": position,
+            "url": job.get("url") or "",
+            "contentHash": job.get("contentHash") or "",
+            "score": score,
+            "breakdown": {field: breakdown[field][rank] for field in FIELDS},
+            "matched": {field: matched[field][rank] for field in FIELDS},
+        })
+    return results
+
+
+def _job_body(job: dict) -> str:
+    parts = [job.get("title"), job.get("description")]
+    for key in ("requirements", "technologies", "tags"):
+        values = job.get(key)
+        if isinstance(values, list):
+            parts.extend(values)
+    return "\n".join(part for part in parts if isinstance(part, str))
+
+
+def _matched_terms(
+    matches: tuple[np.ndarray, np.ndarray, np.ndarray] | None, names: list[str], rows: np.ndarray,
+) -> list[list[str]]:
+    """Matched term labels for each of ``rows``, strongest contribution first."""
+    if matches is None or len(matches[0]) == 0:
+        return [[] for _row in rows]
+    doc, term, contribution = matches
+    order = np.lexsort((-contribution, doc))
+    doc, term = doc[order], term[order]
+    starts = np.searchsorted(doc, rows).tolist()
+    ends = np.searchsorted(doc, rows, side="right").tolist()
+    return [
+        [names[t] for t in term[start:min(end, start + MAX_MATCHED_TERMS)].tolist()]
+        for start, end in zip(starts, ends)
+    ]
+
+
+def _number(value: object, default: float) -> float:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else default
+
+
+if __name__ == "__main__":
+    try:
+        payload = json.loads(sys.stdin.read() or "{}")
+    except json.JSONDecodeError:
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
+    if np is None:
+        print(json.dumps({"error": "NumPy not installed. Run: pip install numpy", "scores": []}))
+        sys.exit(1)
+
+    started = time.perf_counter()
+    resume = payload.get("resume") if isinstance(payload.get("resume"), dict) else {}
+    jobs = [job for job in payload.get("jobs") or [] if isinstance(job, dict)]
+    weights = payload.get("weights") if isinstance(payload.get("weights"), dict) else {}
+    scores = score_jobs(
+        resume,
+        jobs,
+        {field: _number(weights.get(field), DEFAULT_WEIGHTS[field]) for field in FIELDS},
+        min_score=_number(payload.get("minScore"), 0),
+        limit=int(_number(payload.get("limit"), 0)),
+    )
+    print(json.dumps({
+        "scores": scores,
+        "count": len(jobs),
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+    }, indent=2))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Compact job record shared by every board scraper.
+Normalizes each listing once at the source: whitespace is collapsed, URLs are
+made absolute against the listing page, and fields are cut to the server's
+``jobs`` column limits, so the envelope never carries what the database would
+truncate. Records serialize to the envelope's camelCase job dicts, leaving out
+empty optional fields.
+"""
+from __future__ import annotations
+
+from dataclasses import InitVar, dataclass, field
+from urllib.parse import urljoin, urlsplit
+
+TITLE_LIMIT = 200
+COMPANY_LIMIT = 200
+LOCATION_LIMIT = 200
+URL_LIMIT = 500
+DESCRIPTION_LIMIT = 5000
+POSTED_DATE_LIMIT = 50
+CONTENT_HASH_LIMIT = 100
+MIN_TITLE_LENGTH = 3
+UNKNOWN_COMPANY = "Unknown"
+
+
+def clean_text(value: object, limit: int) -> str:
+    """Collapse all whitespace to single spaces and cut to ``limit`` characters."""
+    return " ".join(str(value or "").split())[:limit].rstrip()
+
+
+def clean_description(value: object, limit: int = DESCRIPTION_LIMIT) -> str:
+    """Collapse whitespace within lines, drop blank lines and cut to ``limit`` characters."""
+    lines = (" ".join(line.split()) for line in str(value or "").splitlines())
+    return "\n".join(line for line in lines if line)[:limit].rstrip()
+
+
+def absolute_url(value: object, base_url: str = "") -> str:
+    """Resolve ``value`` against ``base_url``; falls back to ``base_url`` when not a usable http(s) URL."""
+    url = urljoin(base_url, str(value or "").strip()) if value else base_url
+    if urlsplit(url).scheme not in ("http", "https") or len(url) > URL_LIMIT:
+        # A cut URL would point nowhere; the listing page is the better link
+        return base_url[:URL_LIMIT]
+    return url
+
+
+def valid_title(title: object) -> bool:
+    return len(clean_text(title, TITLE_LIMIT)) >= MIN_TITLE_LENGTH
+
+
+@dataclass(slots=True)
+class JobRecord:
+    title: str
+    company: str = UNKNOWN_COMPANY
+    location: str = ""
+    description: str = ""
+    url: str = ""
+    source: str = ""
+    posted_date: str = ""
+    content_hash: str = ""
+    remote: bool = False
+    hybrid: bool = False
+    city: str = ""
+    region: str = ""
+    country: str = ""
+    technologies: list[str] = field(default_factory=list)
+    base_url: InitVar[str] = ""
+
+    def __post_init__(self, base_url: str) -> None:
+        self.title = clean_text(self.title, TITLE_LIMIT)
+        self.company = clean_text(self.company, COMPANY_LIMIT) or UNKNOWN_COMPANY
+        self.location = clean_text(self.location, LOCATION_LIMIT)
+        self.description = clean_description(self.description)
+        self.url = absolute_url(self.url, base_url)
+        self.posted_date = str(self.posted_date or "")[:POSTED_DATE_LIMIT]
+        self.content_hash = str(self.content_hash or "")[:CONTENT_HASH_LIMIT]
+
+    def as_dict(self) -> dict[str, object]:
+        """The envelope job dict; empty description, place fields and technologies are left out."""
+        job: dict[str, object] = {
+            "title": self.title,
+            "company": self.company,
+            "location": clean_text(self.location, LOCATION_LIMIT),
+            "remote": self.remote,
+            "hybrid": self.hybrid,
+            "url": self.url,
+            "source": self.source,
+            "postedDate": self.posted_date,
+            "contentHash": self.content_hash[:CONTENT_HASH_LIMIT],
+        }
+        for name, value in (
+            ("description", self.description),
+            ("city", self.city),
+            ("region", self.region),
+            ("country", self.country),
+            ("technologies", self.technologies),
+        ):
+            if value:
+                job[name] = value
+        return job
@@ -3,153 +3,401 @@
 GamesJobsDirect scraper using RPA-Python.
 Scrapes gaming industry jobs from gamesjobsdirect.com and outputs JSON.
 Covers UK, USA, Canada, and Australia gaming positions.
+
+Listing pages are fetched over HTTP in parallel when the server renders them;
+the RPA browser walks the pages one by one only when it does not. The board is
+declared in board_registry.py with this module as its ``scraper``.
 """
-import json
-import hashlib
-import sys
-from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
-
-DEFAULT_SOURCE_URL = "https://www.gamesjobsdirect.com/results"
-
-try:
-    import rpa as r
-except ImportError:
-    print(json.dumps({"error": "RPA not installed. Run: pip install rpa"}), file=sys.stderr)
-    sys.exit(1)
-
-
-def resolve_source_url() -> str:
-    try:
-        payload = json.loads(sys.stdin.read() or "{}")
-        source_url = payload.get("sourceUrl") if isinstance(payload, dict) else None
-        if isinstance(source_url, str) and source_url.strip():
-            return source_url.strip()
-    except Exception:
-        pass
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Iterator
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 
-    return DEFAULT_SOURCE_URL
+from board_engine import browser_session, main, shared_browser, wait_until_ready
+from board_health import STATUS_EMPTY, STATUS_MARKUP_CHANGED, STATUS_OK, STATUS_UNCHANGED, classify_empty_page
+from board_registry import BOARDS, BoardSpec
+from host_scheduler import get_scheduler
+from job_feeds import scrape_feed
+from job_location import apply_location_fields
+from job_record import JobRecord
+from page_classifier import classify_page, raise_if_interstitial
+from page_fingerprint import fingerprint_items, listing_response, listing_unchanged, region_fingerprint
+from pagination import (
+    PageRequest,
+    decode_cursor,
+    decode_state,
+    encode_cursor,
+    encode_state,
+    page_request_from,
+    valid_position,
+)
+from posted_dates import listing_is_older, listing_posted_date, since_from
+from scraper_browser import profile_from_payload
+from scraper_io import read_payload
 
+BOARD_ID = "gamesjobsdirect"
+LISTING_SELECTOR = BOARDS[BOARD_ID].ready_selector
+DEFAULT_FAN_OUT = 4
 
-def with_page(base_url: str, page: int) -> str:
+COMPANY_RE = re.compile(r"(?:at|by|for|-)\s+([A-Z][^,.|]+)")
+PAGE_HTML_JS = "return document.documentElement ? document.documentElement.outerHTML : ''"
+
+
+def with_query(base_url: str, params: dict[str, str]) -> str:
     parsed = urlparse(base_url)
     query = dict(parse_qsl(parsed.query, keep_blank_values=True))
-    query["page"] = str(page)
+    query.update(params)
     return urlunparse(parsed._replace(query=urlencode(query)))
 
 
-def content_hash(title: str, company: str, location: str) -> str:
-    raw = f"{title}|{company}|{location}".lower().strip()
-    return f"gjd-{hashlib.sha256(raw.encode()).hexdigest()[:12]}"
-
-
-def scrape_page() -> list[dict]:
-    """Extract jobs from the current page."""
-    js_extract = """
-    (function() {
-        var results = [];
-        // GamesJobsDirect uses <li> elements with job links containing /job/ path
-        var items = document.querySelectorAll('li, [class*="job-item"], [class*="listing"]');
-        items.forEach(function(item) {
-            var link = item.querySelector('a[href*="/job/"]');
-            if (!link) return;
-
-            var title = (link.textContent || '').trim();
-            if (!title || title.length < 3 || title === 'View & apply') return;
-
-            var fullText = item.textContent.replace(/\\s+/g, ' ').trim();
-            var company = 'Unknown';
-            var location = 'Unknown';
-
-            // Try to extract company and location from surrounding text
-            var parts = fullText.replace(title, '').trim();
-
-            // Look for location patterns (city names, countries)
-            var locMatch = parts.match(/((?:London|Manchester|Brighton|Liverpool|Edinburgh|Glasgow|Bristol|Leeds|Birmingham|Oxford|Cambridge|Sheffield|Newcastle|Montreal|Toronto|Vancouver|Sydney|Melbourne|Los Angeles|San Francisco|New York|Austin|Seattle|Irvine|Boston|Chicago|Remote|Worldwide|UK|USA|US|Canada|Australia)[^,]*)/i);
-            if (locMatch) {
-                location = locMatch[1].trim().substring(0, 100);
-            }
-
-            // Company is usually mentioned after location or as separate text
-            var companyMatch = parts.match(/(?:at|by|for|-)\\s+([A-Z][^,.|]+)/);
-            if (companyMatch) {
-                company = companyMatch[1].trim().substring(0, 100);
-            }
-
-            results.push({
-                title: title.substring(0, 200),
-                company: company,
-                location: location,
-                url: link.href || ''
-            });
-        });
-
-        // Deduplicate by title+company
-        var seen = {};
-        return JSON.stringify(results.filter(function(j) {
-            var key = j.title + '|' + j.company;
-            if (seen[key]) return false;
-            seen[key] = true;
-            return true;
-        }));
-    })()
+def with_page(base_url: str, page: int) -> str:
+    return with_query(base_url, {"page": str(page)})
+
+
+def shards_from(payload: dict) -> list[dict[str, str]]:
+    """
+    Query shards (e.g. ``{"region": "usa"}`` or ``{"discipline": "art"}``) merged
+    into the listing URL. Without shards the unfiltered listing is the only shard.
     """
-    raw = r.dom(js_extract)
-    if raw and isinstance(raw, str):
-        try:
-            return json.loads(raw)
-        except json.JSONDecodeError:
-            return []
-    return []
+    shards = []
+    for shard in payload.get("shards") or []:
+        if isinstance(shard, dict):
+            params = {str(k): str(v) for k, v in shard.items() if str(k) and k != "page" and v is not None}
+            if params and params not in shards:
+                shards.append(params)
+    return shards or [{}]
 
 
-def scrape_jobs() -> list[dict]:
-    jobs = []
-    source_url = resolve_source_url()
-    try:
-        r.init(turbo_mode=True)
-        r.url(source_url)
-        r.wait(4)
-
-        # Scrape first 2 pages
-        for page in range(2):
-            page_jobs = scrape_page()
-            for item in page_jobs:
-                title = item.get("title", "").strip()
-                if not title or len(title) < 3:
-                    continue
-                company = item.get("company", "Unknown")
-                loc = item.get("location", "Unknown")
-                jobs.append({
-                    "title": title,
-                    "company": company,
-                    "location": loc,
-                    "remote": "remote" in loc.lower(),
-                    "description": "",
-                    "url": item.get("url", source_url),
-                    "source": "gamesjobsdirect",
-                    "postedDate": "",
-                    "contentHash": content_hash(title, company, loc),
-                })
-
-            # Try to go to next page
-            if page < 1:
-                try:
-                    r.url(with_page(source_url, page + 2))
-                    r.wait(3)
-                except Exception:
+def shard_key(shard: dict[str, str]) -> str:
+    return urlencode(sorted(shard.items()))
+
+
+def listing_item(title: str, full_text: str, url: str, posted_text: str = "") -> dict | None:
+    """Build one listing item from a listing block's link text, full text and /job/ link."""
+    title = re.sub(r"\s+", " ", title).strip()
+    if len(title) < 3 or title == "View & apply":
+        return None
+    # Surrounding text is classified into a location on the Python side
+    parts = re.sub(r"\s+", " ", full_text).strip().replace(title, "", 1).strip()
+    # Company is usually mentioned after location or as separate text
+    company_match = COMPANY_RE.search(parts)
+    return {
+        "title": title[:200],
+        "company": company_match.group(1).strip()[:100] if company_match else "Unknown",
+        "locationText": parts[:300],
+        "url": url,
+        "postedText": posted_text.strip(),
+    }
+
+
+class _ListingParser(HTMLParser):
+    """
+    The one GamesJobsDirect extractor: <li>/job-item/listing blocks with a /job/ link,
+    read from server-rendered HTML or from the browser's rendered DOM.
+    """
+
+    VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+    def __init__(self, base_url: str) -> None:
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.items: list[dict] = []
+        self._stack: list[tuple[str, dict | None]] = []
+        self._skip_depth = 0
+
+    def _open_blocks(self) -> list[dict]:
+        return [block for _, block in self._stack if block is not None]
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in self.VOID_TAGS:
+            return
+        attributes = {k: (v or "") for k, v in attrs}
+        if tag in ("script", "style", "noscript"):
+            self._skip_depth += 1
+        css = attributes.get("class", "")
+        block = None
+        if tag == "li" or "job-item" in css or "listing" in css:
+            block = {"text": [], "href": None, "link_text": [], "in_link": False, "time": None, "in_time": False}
+        if tag == "time":
+            for open_block in self._open_blocks():
+                if open_block["time"] is None:
+                    open_block["time"] = [attributes["datetime"]] if attributes.get("datetime") else []
+                    open_block["in_time"] = not attributes.get("datetime")
+        if tag == "a" and "/job/" in attributes.get("href", ""):
+            for open_block in self._open_blocks():
+                if open_block["href"] is None:
+                    open_block["href"] = urljoin(self.base_url, attributes["href"])
+                    open_block["in_link"] = True
+        self._stack.append((tag, block))
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        pass
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in ("script", "style", "noscript") and self._skip_depth:
+            self._skip_depth -= 1
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, block = self._stack.pop()
+            if open_tag in ("a", "time"):
+                for open_block in self._open_blocks():
+                    open_block["in_link" if open_tag == "a" else "in_time"] = False
+            if block is not None and block["href"]:
+                item = listing_item(
+                    "".join(block["link_text"]), "".join(block["text"]), block["href"], "".join(block["time"] or []),
+                )
+                if item:
+                    self.items.append(item)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        for block in self._open_blocks():
+            block["text"].append(data)
+            if block["in_link"]:
+                block["link_text"].append(data)
+            if block["in_time"]:
+                block["time"].append(data)
+
+
+def parse_listing(html: str, base_url: str) -> list[dict]:
+    parser = _ListingParser(base_url)
+    parser.feed(html)
+    parser.close()
+    # Nested blocks (an <li> inside a listing <div>) yield the same job twice
+    items = []
+    seen: set[str] = set()
+    for item in parser.items:
+        key = f"{item['title']}|{item['company']}"
+        if key not in seen:
+            seen.add(key)
+            items.append(item)
+    return items
+
+
+@dataclass
+class ShardCrawl:
+    shard: dict[str, str]
+    items: list[dict] = field(default_factory=list)
+    # (page, index) of each item, so a window cut after the cross-shard merge can resume at it
+    positions: list[tuple[int, int]] = field(default_factory=list)
+    resume: tuple[int, int] | None = None
+    empty_status: str = ""
+    # Set when ``ifChanged`` found the listing identical to the last run
+    unchanged: bool = False
+
+
+def listing_url(source_url: str, page: int) -> str:
+    return source_url if page == 1 else with_page(source_url, page)
+
+
+def fetch_listing(url: str) -> list[dict] | None:
+    """Fetch and parse one listing page over HTTP; None when the request failed."""
+    response = get_scheduler().fetch(url)
+    listing_response(url, response)
+    if not response.ok:
+        return None
+    return parse_listing(response.text(), response.final_url or url)
+
+
+def http_pages(source_url: str, first_page: int, last_page: int, fan_out: int,
+               first_items: list[dict]) -> Iterator[tuple[int, list[dict] | None]]:
+    """Yield listing pages in order, fetching them ``fan_out`` at a time (bounded per host by the scheduler)."""
+    yield first_page, first_items
+    with ThreadPoolExecutor(max_workers=fan_out) as pool:
+        for wave_start in range(first_page + 1, last_page + 1, fan_out):
+            pages = range(wave_start, min(wave_start + fan_out, last_page + 1))
+            wave = list(pool.map(fetch_listing, (listing_url(source_url, page) for page in pages)))
+            for page, items in zip(pages, wave):
+                yield page, items
+                if not items:
+                    return
+
+
+def browser_pages(spec: BoardSpec, source_url: str, first_page: int, last_page: int,
+                  crawl: ShardCrawl) -> Iterator[tuple[int, list[dict] | None]]:
+    """Walk listing pages one by one in the RPA browser (client-rendered or HTTP-blocked listings)."""
+    with browser_session(profile_from_payload(spec.browser_profile, read_payload().get("browser"))) as r:
+        for page in range(first_page, last_page + 1):
+            url = listing_url(source_url, page)
+            try:
+                get_scheduler().navigate(r, url)
+            except Exception:
+                if page == first_page:
+                    raise
+                yield page, None
+                return
+            if page == first_page:
+                raise_if_interstitial(r, url, LISTING_SELECTOR)
+            elif classify_page(r, url, LISTING_SELECTOR) is not None:
+                # Walled mid-crawl: keep what was read and resume from this page
+                yield page, None
+                return
+            wait_until_ready(r, LISTING_SELECTOR, spec.wait_seconds if page == first_page else 3)
+            if page == first_page and listing_unchanged(region_fingerprint(r, LISTING_SELECTOR)):
+                crawl.unchanged = True
+                return
+            yield page, scrape_page(r, url)
+
+
+def scrape_page(browser, url: str) -> list[dict]:
+    """Extract jobs from the rendered page with the same parser as the HTTP path."""
+    page_html = browser.dom(PAGE_HTML_JS)
+    return parse_listing(page_html, url) if page_html and isinstance(page_html, str) else []
+
+
+def posted_date_of(item: dict) -> str:
+    return listing_posted_date(item, "locationText")
+
+
+def crawl_shard(crawl: ShardCrawl, pages: Iterator[tuple[int, list[dict] | None]],
+                request: PageRequest, first_page: int, offset: int, since: datetime | None = None) -> ShardCrawl:
+    """
+    Consume one shard's pages in order, windowed by the request limit and deduped by URL.
+    Listings are newest first: a page ending in a listing older than ``since``
+    is the last one crawled.
+    """
+    last_page = first_page + request.max_pages - 1
+    seen: set[str] = set()
+    skip = offset
+    with closing(pages):
+        for page, items in pages:
+            if items is None:
+                # Page failed to load; resume from it next time
+                crawl.resume = (page, 0)
+                break
+            if not items:
+                if page == 1 and not crawl.items:
+                    crawl.empty_status = classify_empty_page(shared_browser().page_text())
+                break
+            reached_since = listing_is_older(items[-1], since)
+            for index in range(skip, len(items)):
+                if request.room(len(crawl.items)) == 0:
+                    crawl.resume = (page, index)
                     break
+                item = items[index]
+                key = item.get("url") or f"{item['title']}|{item.get('company', '')}".lower()
+                if key in seen:
+                    continue  # Listings repeat across pages as new jobs push older ones down
+                seen.add(key)
+                if listing_is_older(item, since):
+                    continue  # Returned by an earlier run
+                crawl.items.append(item)
+                crawl.positions.append((page, index))
+            skip = 0
+            if crawl.resume or reached_since:
+                break
+            if request.room(len(crawl.items)) == 0 or page >= last_page:
+                crawl.resume = (page + 1, 0)
+                break
+    return crawl
+
+
+def shard_positions(cursor: object, shards: list[dict[str, str]]) -> dict[str, tuple[int, int] | None]:
+    """Start position per shard; with a cursor, shards it does not list are already exhausted."""
+    if len(shards) == 1 and not shards[0]:
+        return {"": decode_cursor(cursor, BOARD_ID)}
+    state = decode_state(cursor, BOARD_ID)
+    if state is None or not isinstance(state.get("s"), dict):
+        return {shard_key(shard): (1, 0) for shard in shards}
+    positions: dict[str, tuple[int, int] | None] = {}
+    for shard in shards:
+        position = state["s"].get(shard_key(shard))
+        valid = isinstance(position, list) and len(position) == 2 and valid_position(*position)
+        positions[shard_key(shard)] = (position[0], position[1]) if valid else None
+    return positions
+
 
-        r.close()
-    except Exception as e:
-        try:
-            r.close()
-        except Exception:
-            pass
-        print(f"Scraper error: {e}", file=sys.stderr)
+def next_shard_cursor(crawls: list[ShardCrawl]) -> str | None:
+    if len(crawls) == 1 and not crawls[0].shard:
+        resume = crawls[0].resume
+        return encode_cursor(BOARD_ID, *resume) if resume else None
+    state = {shard_key(crawl.shard): list(crawl.resume) for crawl in crawls if crawl.resume}
+    return encode_state(BOARD_ID, {"s": state}) if state else None
+
+
+def scrape_jobs(spec: BoardSpec, source_url: str) -> tuple[list[JobRecord], str, str | None]:
+    payload = read_payload()
+    request = page_request_from(payload, BOARD_ID, spec.default_limit, spec.default_max_pages)
+    fan_out = payload.get("fanOut")
+    fan_out = max(1, min(int(fan_out), 16)) if isinstance(fan_out, int) and not isinstance(fan_out, bool) else DEFAULT_FAN_OUT
+    shards = shards_from(payload)
+    if shards == [{}]:
+        feed = scrape_feed(BOARD_ID, source_url, spec.source, spec.content_hash, request)
+        if feed is not None:
+            return feed
+    positions = shard_positions(payload.get("cursor"), shards)
+    since = since_from(payload)
+    active = [(shard, positions[shard_key(shard)]) for shard in shards if positions[shard_key(shard)]]
+
+    def shard_url(shard: dict[str, str]) -> str:
+        return with_query(source_url, shard) if shard else source_url
+
+    # Probe every shard's first page over HTTP at once; server-rendered shards then
+    # fan out concurrently, the rest share the single RPA browser one after another
+    with ThreadPoolExecutor(max_workers=max(1, min(len(active), fan_out))) as pool:
+        probes = list(pool.map(lambda job: fetch_listing(listing_url(shard_url(job[0]), job[1][0])), active))
+        futures = []
+        browser_shards = []
+        crawls: list[ShardCrawl] = []
+        for (shard, (page, offset)), first_items in zip(active, probes):
+            crawl = ShardCrawl(shard)
+            if first_items and listing_unchanged(fingerprint_items(first_items)):
+                crawl.unchanged = True
+                crawls.append(crawl)
+            elif first_items:
+                pages = http_pages(shard_url(shard), page, page + request.max_pages - 1, fan_out, first_items)
+                futures.append(pool.submit(crawl_shard, crawl, pages, request, page, offset, since))
+            else:
+                browser_shards.append((crawl, page, offset))
+        crawls.extend(future.result() for future in futures)
+    for crawl, page, offset in browser_shards:
+        pages = browser_pages(spec, shard_url(crawl.shard), page, page + request.max_pages - 1, crawl)
+        crawls.append(crawl_shard(crawl, pages, request, page, offset, since))
+    crawls.sort(key=lambda crawl: shards.index(crawl.shard))
+    if any(crawl.unchanged for crawl in crawls):
+        # Only tracked for a single unsharded crawl from the top of the listing
+        return [], STATUS_UNCHANGED, None
+
+    jobs = []
+    location_texts: list[str] = []
+    seen: set[str] = set()
+    for crawl in crawls:
+        for item, position in zip(crawl.items, crawl.positions):
+            key = item.get("url") or f"{item['title']}|{item.get('company', '')}".lower()
+            if key in seen:
+                continue  # The same job is often listed under several regions/disciplines
+            if request.room(len(jobs)) == 0:
+                # Each shard fills its own window; the limit applies to the merged jobs,
+                # and a shard cut short resumes at its first job not returned
+                crawl.resume = position
+                break
+            seen.add(key)
+            jobs.append(JobRecord(
+                item["title"], item.get("company"), url=item.get("url"), base_url=source_url,
+                source=spec.source, posted_date=posted_date_of(item),
+            ))
+            location_texts.append(item.get("locationText", ""))
 
-    return jobs[:80]  # Cap at 80 jobs across pages
+    apply_location_fields(jobs, texts=location_texts)
+    for job in jobs:
+        job.content_hash = spec.content_hash(job.title, job.company, job.location)
+    next_cursor = next_shard_cursor(crawls)
+    if jobs:
+        return jobs, STATUS_OK, next_cursor
+    empty_statuses = [crawl.empty_status for crawl in crawls if crawl.empty_status]
+    if empty_statuses and len(empty_statuses) == len(crawls):
+        return [], STATUS_EMPTY if STATUS_EMPTY in empty_statuses else empty_statuses[0], None
+    resumed = any(position != (1, 0) for position in positions.values())
+    return [], STATUS_OK if resumed else STATUS_MARKUP_CHANGED, next_cursor
 
 
 if __name__ == "__main__":
-    result = scrape_jobs()
-    print(json.dumps(result, indent=2))
+    main(BOARD_ID)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Persistent listing store for the board scrapers.
+
+Every healthy run records each listing's ``(source, contentHash, url,
+first_seen, last_seen, seen_count)`` in ``jobs.db`` under the scraper data
+directory, in one transaction, and reports what changed since the previous run:
+
+- ``added``: listings not seen before (or seen again after being removed)
+- ``still_present``: listings already known and still on the board
+- ``removed``: known listings missing from a run that covered the whole board
+
+Removal is only decided on complete runs: no cursor in or out, no
+``knownUrls``, ``since`` or ``shards`` filtering, the board's own listing URL,
+and at least one job found. A paged, filtered or sharded request never expires
+the listings it did not visit, and neither does an ``empty`` run, which is
+only a guess from the page text.
+"""
+from __future__ import annotations
+
+import sqlite3
+import time
+
+from result_cache import normalize_url
+from scraper_paths import data_path
+
+STORE_FILE = "jobs.db"
+
+
+def run_is_complete(payload: dict, next_cursor: str | None, found_jobs: bool, default_url: str = "") -> bool:
+    """True when a run saw the board's whole listing, so absent listings are really gone."""
+    if next_cursor or not found_jobs:
+        return False
+    if any(payload.get(key) for key in ("cursor", "knownUrls", "since", "shards")):
+        return False
+    source_url = payload.get("sourceUrl")
+    if isinstance(source_url, str) and source_url.strip():
+        # A custom or filtered listing URL shows only part of the board
+        return bool(default_url) and normalize_url(source_url) == normalize_url(default_url)
+    return True
+
+
+class JobStore:
+    """SQLite-backed listing lifecycle per ``(source, contentHash)``."""
+
+    def __init__(self, path: str | None = None) -> None:
+        self.conn = sqlite3.connect(path or str(data_path(STORE_FILE)))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS listings ("
+            " source TEXT NOT NULL, content_hash TEXT NOT NULL, url TEXT,"
+            " first_seen REAL NOT NULL, last_seen REAL NOT NULL,"
+            " seen_count INTEGER NOT NULL DEFAULT 1, removed_at REAL,"
+            " PRIMARY KEY (source, content_hash))"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS listings_active_idx ON listings (source, removed_at, last_seen)"
+        )
+
+    def record_run(self, source: str, jobs: list[dict], complete: bool, now: float | None = None) -> dict:
+        """Upsert one run's listings and return the ``added``/``still_present``/``removed`` delta."""
+        now = now or time.time()
+        listings: dict[str, str | None] = {}
+        for job in jobs:
+            content_hash = job.get("contentHash")
+            if isinstance(content_hash, str) and content_hash:
+                listings[content_hash] = str(job.get("url") or "") or None
+
+        with self.conn:
+            active = {
+                row[0]
+                for row in self.conn.execute(
+                    "SELECT content_hash FROM listings WHERE source = ? AND removed_at IS NULL", (source,)
+                )
+            }
+            self.conn.executemany(
+                "INSERT INTO listings (source, content_hash, url, first_seen, last_seen, seen_count)"
+                " VALUES (?, ?, ?, ?, ?, 1)"
+                " ON CONFLICT (source, content_hash) DO UPDATE SET"
+                " url = COALESCE(excluded.url, listings.url), last_seen = excluded.last_seen,"
+                " seen_count = listings.seen_count + 1, removed_at = NULL",
+                [(source, content_hash, url, now, now) for content_hash, url in listings.items()],
+            )
+            removed: list[dict] = []
+            if complete:
+                removed = [
+                    {"contentHash": content_hash, "url": url}
+                    for content_hash, url in self.conn.execute(
+                        "SELECT content_hash, url FROM listings"
+                        " WHERE source = ? AND removed_at IS NULL AND last_seen < ?",
+                        (source, now),
+                    )
+                ]
+                self.conn.execute(
+                    "UPDATE listings SET removed_at = ? WHERE source = ? AND removed_at IS NULL AND last_seen < ?",
+                    (now, source, now),
+                )
+
+        return {
+            "added": [content_hash for content_hash in listings if content_hash not in active],
+            "still_present": [content_hash for content_hash in listings if content_hash in active],
+            "removed": removed,
+            "complete": complete,
+        }
+
+    def touch_source(self, source: str, now: float | None = None) -> dict:
+        """
+        Record a run whose listing was unchanged: every active listing is still
+        present and nothing is added or removed.
+        """
+        now = now or time.time()
+        with self.conn:
+            active = [
+                row[0]
+                for row in self.conn.execute(
+                    "SELECT content_hash FROM listings WHERE source = ? AND removed_at IS NULL", (source,)
+                )
+            ]
+            self.conn.execute(
+                "UPDATE listings SET last_seen = ?, seen_count = seen_count + 1"
+                " WHERE source = ? AND removed_at IS NULL",
+                (now, source),
+            )
+        return {"added": [], "still_present": active, "removed": [], "complete": False}
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Technology tagging for scraped job listings.
+Compiles the studio technology vocabulary (``studio_scraper.STUDIOS``) plus
+aliases ("UE5", "Unreal", "C-sharp") into one keyword automaton, so each job's
+title and description are tagged in a single linear pass and every board emits
+the same canonical ``technologies`` names. Names that are also ordinary
+capitalized words ("Go", "Swift", "React", "Metal", "Rust") are only tagged in
+a technology context: a list, a line of their own, a language word next to them
+("Go developer", "React components") or "experience with ...".
+"""
+from __future__ import annotations
+
+import json
+import re
+import sys
+from typing import Iterable
+
+from job_record import JobRecord
+from keyword_automaton import KeywordAutomaton, KeywordMatch
+from studio_scraper import STUDIOS
+
+# Studio entries too vague to tag a listing with
+VAGUE_TECHNOLOGIES = frozenset({
+    "A/B testing pipelines", "Cloud infrastructure", "Data analytics", "GameFreak tools", "ICE Team tools",
+    "Infrastructure at scale", "Mobile SDKs", "Open-source tools", "Proprietary engine", "Proprietary engines",
+    "Proprietary tools", "Quake-era tech", "Various (publisher)",
+})
+# Studio entries folded into another canonical name
+CANONICAL_NAMES = {
+    "Unreal Engine 5": "Unreal Engine",
+    "DirectX 12": "DirectX",
+    "id Tech Engine": "id Tech",
+    "AR Kit": "ARKit",
+    "AR Core": "ARCore",
+}
+# Common job-ad tools missing from the studio data
+EXTRA_TECHNOLOGIES = (
+    "JavaScript", "TypeScript", "HLSL", "GLSL", "OpenGL", "Metal", "SQL", "Docker", "Git", "Perforce", "Jira",
+    "Houdini", "Blender", "Maya", "3ds Max", "ZBrush", "Substance Painter", "Photoshop",
+)
+ALIASES: dict[str, tuple[str, ...]] = {
+    "Unreal Engine": (
+        "Unreal", "UE4", "UE5", "UE 4", "UE 5", "Unreal Engine 4", "Unreal Engine 5", "UDK",
+    ),
+    "Unity": ("Unity3D", "Unity 3D", "Unity Engine"),
+    "C#": ("C-sharp", "CSharp", "C sharp"),
+    "C++": ("CPP",),
+    "Go": ("Golang",),
+    "Blueprints": ("Blueprint scripting", "Blueprint visual scripting"),
+    "Kubernetes": ("K8s",),
+    "Godot": ("Godot Engine",),
+    "GameMaker": ("GameMaker Studio", "Game Maker"),
+    "AWS": ("Amazon Web Services",),
+    "Google Cloud": ("GCP", "Google Cloud Platform"),
+    "Azure": ("Microsoft Azure",),
+    "DirectX": ("DirectX 11", "DirectX 12", "DX11", "DX12", "Direct3D", "D3D11", "D3D12"),
+    "CryEngine": ("Cry Engine",),
+    "id Tech": ("idTech", "id Tech Engine"),
+    "Source 2 Engine": ("Source 2",),
+    "Frostbite Engine": ("Frostbite",),
+    "Snowdrop Engine": ("Snowdrop",),
+    "Decima Engine": ("Decima",),
+    "REDengine": ("RED Engine",),
+    "ARKit": ("AR Kit",),
+    "ARCore": ("AR Core",),
+    "DOTS": ("Unity DOTS",),
+    "JavaScript": ("JS",),
+    "3ds Max": ("3DS Max", "3dsMax"),
+    "Substance Painter": ("Adobe Substance Painter",),
+}
+# Names that are ordinary words in lower case ("rust", "swift", "go") only count as written
+CASE_SENSITIVE = frozenset({"Go", "Rust", "Swift", "React", "Ruby", "Elixir", "Metal"})
+# ...and these are ordinary words even capitalized ("Go to market", "Metal Gear", the game "Rust")
+CONTEXT_TERMS = frozenset({"Go", "Rust", "Swift", "React", "Metal"})
+CONTEXT_BEFORE_RE = re.compile(
+    r"\b(?:experience|proficiency|proficient|fluent|fluency|knowledge|expertise|skilled|skills)\s+(?:in|with|of)\s+$",
+    re.IGNORECASE,
+)
+CONTEXT_AFTER_RE = re.compile(
+    r"^\s*(?:developers?|engineers?|engineering|programmers?|programming|language|code|codebase|back-?end"
+    r"|front-?end|services|microservices|components|hooks|APIs?|shaders?|SDKs?|framework|development)\b",
+    re.IGNORECASE,
+)
+# What may separate a context term from another technology in a list ("C++, Go", "Swift/Objective-C")
+LIST_GAP_RE = re.compile(r"\s*(?:[,/|;&+]|\band\b|\bor\b)?\s*")
+BULLETS = "-*\u2022\u00b7 \t"
+
+
+def technology_vocabulary() -> dict[str, tuple[str, ...]]:
+    """Canonical technology name -> aliases, studio vocabulary first."""
+    names = [tech for studio in STUDIOS for tech in studio.get("technologies", [])] + list(EXTRA_TECHNOLOGIES)
+    vocabulary: dict[str, tuple[str, ...]] = {}
+    for name in names:
+        if name in VAGUE_TECHNOLOGIES:
+            continue
+        canonical = CANONICAL_NAMES.get(name, name)
+        vocabulary.setdefault(canonical, ALIASES.get(canonical, ()))
+    return vocabulary
+
+
+def _case_sensitive(term: str) -> bool:
+    # Acronyms ("AWS", "DOTS", "URP") are plain words when lower-cased
+    return term in CASE_SENSITIVE or term.isupper()
+
+
+def _compile() -> tuple[KeywordAutomaton, KeywordAutomaton]:
+    folded = KeywordAutomaton()
+    exact = KeywordAutomaton(case_sensitive=True)
+    for canonical, aliases in technology_vocabulary().items():
+        for term in dict.fromkeys((canonical, *aliases)):
+            (exact if _case_sensitive(term) else folded).add(term, canonical)
+    return folded, exact
+
+
+_FOLDED, _EXACT = _compile()
+
+
+def _longest_matches(text: str) -> list[KeywordMatch]:
+    """Leftmost-longest matches across both automata ("React Native" over "React")."""
+    candidates = sorted(
+        [*_FOLDED.iter_matches(text), *_EXACT.iter_matches(text)], key=lambda m: (m.start, -(m.end - m.start)),
+    )
+    selected: list[KeywordMatch] = []
+    cursor = 0
+    for match in candidates:
+        if match.start >= cursor:
+            selected.append(match)
+            cursor = match.end
+    return selected
+
+
+def _in_technology_context(text: str, match: KeywordMatch, neighbours: list[KeywordMatch]) -> bool:
+    before = text[:match.start]
+    after = text[match.end:]
+    if before.rstrip().endswith((",", "/", "(", ":", "|", ";")) or after.lstrip().startswith((",", "/", ")", "|", ";")):
+        return True
+    line_start = before.rfind("\n") + 1
+    line_end = len(text) if after.find("\n") < 0 else match.end + after.find("\n")
+    if not text[line_start:match.start].strip(BULLETS) and not text[match.end:line_end].strip(" \t.;"):
+        return True
+    if CONTEXT_BEFORE_RE.search(before[-80:]) or CONTEXT_AFTER_RE.match(after[:40]):
+        return True
+    for other in neighbours:
+        if other.end <= match.start:
+            gap = text[other.end:match.start]
+        elif other.start >= match.end:
+            gap = text[match.end:other.start]
+        else:
+            continue
+        if LIST_GAP_RE.fullmatch(gap):
+            return True
+    return False
+
+
+def tag_technologies(*texts: str | None) -> list[str]:
+    """Canonical technology names found in the texts, in order of first mention."""
+    found: dict[str, None] = {}
+    for text in texts:
+        if not text:
+            continue
+        matches = _longest_matches(text)
+        neighbours = [match for match in matches if text[match.start:match.end] not in CONTEXT_TERMS]
+        found.update(
+            (str(match.value), None)
+            for match in matches
+            if text[match.start:match.end] not in CONTEXT_TERMS or _in_technology_context(text, match, neighbours)
+        )
+    return list(found)
+
+
+def apply_technology_tags(jobs: Iterable[JobRecord]) -> None:
+    """Set each job's ``technologies`` from its title and description (keeping any it already has)."""
+    for job in jobs:
+        existing = [tech for tech in job.technologies if tech]
+        tags = tag_technologies(job.title, job.description, *existing)
+        known = {tag.lower() for tag in tags}
+        job.technologies = tags + [tech for tech in existing if tech.lower() not in known]
+
+
+if __name__ == "__main__":
+    try:
+        payload = json.loads(sys.stdin.read() or "[]")
+    except json.JSONDecodeError:
+        payload = []
+    items = payload if isinstance(payload, list) else payload.get("jobs", []) if isinstance(payload, dict) else []
+    jobs = [
+        JobRecord(
+            str(item.get("title") or ""),
+            description=str(item.get("description") or ""),
+            technologies=[str(tech) for tech in item.get("technologies") or []],
+        ) if isinstance(item, dict) else JobRecord("", description=str(item))
+        for item in items
+    ]
+    apply_technology_tags(jobs)
+    print(json.dumps([job.technologies for job in jobs], indent=2))
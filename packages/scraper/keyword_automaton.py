@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Multi-pattern keyword matching for scraped job text.
+Compiles a vocabulary into one Aho-Corasick automaton so every pattern is
+found in a single linear pass over the input, regardless of vocabulary size.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, NamedTuple
+
+
+class KeywordMatch(NamedTuple):
+    start: int
+    end: int
+    value: object
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over whole-word keywords mapped to arbitrary values."""
+
+    __slots__ = ("case_sensitive", "_goto", "_fail", "_out", "_built")
+
+    def __init__(self, patterns: Iterable[tuple[str, object]] = (), case_sensitive: bool = False) -> None:
+        self.case_sensitive = case_sensitive
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, object]]] = [[]]
+        self._built = False
+        for pattern, value in patterns:
+            self.add(pattern, value)
+
+    def add(self, pattern: str, value: object) -> None:
+        """Register a keyword; the automaton is rebuilt lazily on the next search."""
+        key = pattern.strip() if self.case_sensitive else pattern.strip().lower()
+        if not key:
+            return
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(key), value))
+        self._built = False
+
+    def _build(self) -> None:
+        queue: deque[int] = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Precompute inherited outputs so matching never walks fail links.
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterable[KeywordMatch]:
+        """Yield every whole-word occurrence, including overlapping ones."""
+        if not self._built:
+            self._build()
+        haystack = text if self.case_sensitive else text.lower()
+        # lower() can change length for a handful of code points; fall back to the
+        # original text so offsets always index the string we report against.
+        if len(haystack) != len(text):
+            haystack = text
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        size = len(haystack)
+        for index, ch in enumerate(haystack):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = index + 1
+            for length, value in out[state]:
+                start = end - length
+                if start > 0 and _is_word_char(haystack[start - 1]) and _is_word_char(haystack[start]):
+                    continue
+                if end < size and _is_word_char(haystack[end]) and _is_word_char(haystack[end - 1]):
+                    continue
+                yield KeywordMatch(start, end, value)
+
+    def find_all(self, text: str) -> list[KeywordMatch]:
+        """Return leftmost-longest, non-overlapping whole-word matches in text order."""
+        if not text:
+            return []
+        candidates = sorted(self.iter_matches(text), key=lambda m: (m.start, -(m.end - m.start)))
+        selected: list[KeywordMatch] = []
+        cursor = 0
+        for match in candidates:
+            if match.start >= cursor:
+                selected.append(match)
+                cursor = match.end
+        return selected
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Record/replay of scraper page traffic for offline debugging, regression runs
+and profiling.
+
+Payload ``archive``: ``{"mode": "record" | "replay", "path": "...", "dom": false}``.
+``path`` defaults to ``archives/<script>.zip`` in the scraper data directory.
+
+- ``record`` writes a deflate-compressed zip of every HTTP response fetched
+  through the host scheduler, the final HTML of every page the RPA browser
+  loaded (taken when the scraper navigates away or closes the browser, so
+  after its readiness waits and scrolling), and every ``dom``/``read`` result.
+- ``replay`` serves that archive from a local HTTP server. HTTP fetches and
+  browser navigations are rewritten to it, so nothing leaves the machine.
+  Replayed pages have their scripts stripped, subresources blocked and a
+  ``<base>`` pointing at the original URL, so extractors see the recorded DOM
+  and its original links. ``dom`` results that differ from the recording are
+  reported on stderr. With ``dom: true`` the recorded results are returned
+  as-is and no browser is launched at all.
+
+Both modes run against a fresh temporary data directory, swapped in when
+:func:`scraper_io.read_payload` first reads the payload, so circuit breakers,
+caches and the listing store neither skip the run nor keep its results.
+
+``python3 page_archive.py serve <archive.zip> [port]`` serves an archive for
+manual inspection at ``http://127.0.0.1:<port>/page?url=<original url>``.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from http_client import HttpResponse, fetch
+from result_cache import normalize_url
+from scraper_io import read_payload
+from scraper_paths import data_path
+
+ARCHIVE_MODES = ("record", "replay")
+OUTER_HTML_JS = "return document.documentElement ? document.documentElement.outerHTML : ''"
+# Response headers that describe the wire encoding rather than the recorded (decoded) body
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+SCRIPT_RE = re.compile(r"<script\b[^>]*>.*?</script\s*>|<script\b[^>]*/>", re.IGNORECASE | re.DOTALL)
+HEAD_RE = re.compile(r"<head\b[^>]*>", re.IGNORECASE)
+REPLAY_CSP = "default-src 'none'; style-src 'unsafe-inline'; img-src data:"
+
+
+def entry_key(*parts: str) -> str:
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:24]
+
+
+def http_key(method: str, url: str) -> str:
+    return entry_key(method.upper(), normalize_url(url))
+
+
+def page_key(url: str) -> str:
+    return entry_key("page", normalize_url(url))
+
+
+def result_prefix(kind: str, page_url: str, script: str) -> str:
+    """Archive name prefix of the results of one script on one page (suffixed by occurrence)."""
+    return f"{kind}/{entry_key(normalize_url(page_url), script)}"
+
+
+class ArchiveWriter:
+    """Appends entries to a new zip archive; the first entry under a name wins."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._names: set[str] = set()
+        self._lock = threading.Lock()
+
+    def write(self, name: str, data: bytes | str) -> None:
+        with self._lock:
+            if self._zip.fp is None or name in self._names:
+                return
+            self._names.add(name)
+            self._zip.writestr(name, data)
+
+    def close(self) -> None:
+        with self._lock:
+            self._zip.close()
+
+
+class ArchiveReader:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        self._names = set(self._zip.namelist())
+        self._lock = threading.Lock()
+
+    def read(self, name: str) -> bytes | None:
+        if name not in self._names:
+            return None
+        with self._lock:
+            return self._zip.read(name)
+
+    def read_json(self, name: str) -> dict | None:
+        raw = self.read(name)
+        if raw is None:
+            return None
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, dict) else None
+
+    def http(self, method: str, url: str) -> tuple[dict, bytes] | None:
+        key = http_key(method, url)
+        meta = self.read_json(f"http/{key}.json")
+        if meta is None:
+            return None
+        return meta, self.read(f"http/{key}.body") or b""
+
+    def page(self, url: str) -> str | None:
+        raw = self.read(f"page/{page_key(url)}.html")
+        return raw.decode("utf-8", errors="replace") if raw is not None else None
+
+
+def replayable_html(page_html: str, original_url: str) -> str:
+    """Strip scripts and pin the page to its original URL and to no network access."""
+    head = (
+        f'<meta http-equiv="Content-Security-Policy" content="{REPLAY_CSP}">'
+        f'<base href="{original_url.replace(chr(34), "%22")}">'
+    )
+    body = SCRIPT_RE.sub("", page_html)
+    match = HEAD_RE.search(body)
+    if match:
+        return body[:match.end()] + head + body[match.end():]
+    return head + body
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    reader: ArchiveReader
+
+    def do_GET(self) -> None:
+        request = urlparse(self.path)
+        query = {name: values[0] for name, values in parse_qs(request.query).items()}
+        url = query.get("url", "")
+        if request.path == "/page":
+            page_html = self.reader.page(url) if url else None
+            if page_html is None:
+                self._send(404, {"X-Bao-Archive": "miss"}, b"Not in archive")
+                return
+            self._send(200, {"Content-Type": "text/html; charset=utf-8"}, replayable_html(page_html, url).encode())
+            return
+        if request.path == "/http":
+            entry = self.reader.http(query.get("method", "GET"), url) if url else None
+            if entry is None:
+                self._send(404, {"X-Bao-Archive": "miss"}, b"Not in archive")
+                return
+            meta, body = entry
+            headers = {name: value for name, value in (meta.get("headers") or {}).items() if name not in DROPPED_HEADERS}
+            headers["X-Bao-Final-Url"] = str(meta.get("finalUrl") or url)
+            if not meta.get("status"):
+                headers["X-Bao-Archive"] = "error"
+                headers["X-Bao-Error"] = str(meta.get("error") or "")
+            self._send(int(meta.get("status") or 502), headers, body)
+            return
+        self._send(404, {}, b"")
+
+    def _send(self, status: int, headers: dict[str, str], body: bytes) -> None:
+        body = b"" if status == 304 else body
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def start_replay_server(reader: ArchiveReader, port: int = 0) -> ThreadingHTTPServer:
+    handler = type("ReplayHandler", (_ReplayHandler,), {"reader": reader})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="archive-replay", daemon=True).start()
+    return server
+
+
+class PageArchive:
+    """The archive of the running script, in record or replay mode."""
+
+    def __init__(self, mode: str, path: Path, offline_dom: bool = False) -> None:
+        self.mode = mode
+        self.path = path
+        self.offline_dom = mode == "replay" and offline_dom
+        self.writer: ArchiveWriter | None = None
+        self.reader: ArchiveReader | None = None
+        self.server: ThreadingHTTPServer | None = None
+        if mode == "record":
+            self.writer = ArchiveWriter(path)
+        else:
+            self.reader = ArchiveReader(path)
+            self.server = start_replay_server(self.reader)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2] if self.server else ("127.0.0.1", 0)
+        return f"http://{host}:{port}"
+
+    def replay_page_url(self, url: str) -> str:
+        return f"{self.base_url}/page?{urlencode({'url': url})}"
+
+    def record_http(self, method: str, response: HttpResponse) -> None:
+        if self.writer is None:
+            return
+        key = http_key(method, response.url)
+        meta = {
+            "url": response.url,
+            "finalUrl": response.final_url,
+            "status": response.status,
+            "error": response.error,
+            "headers": {k: v for k, v in response.headers.items() if k not in DROPPED_HEADERS},
+        }
+        self.writer.write(f"http/{key}.json", json.dumps(meta))
+        self.writer.write(f"http/{key}.body", response.body)
+
+    def replay_http(self, url: str, method: str = "GET", **kwargs) -> HttpResponse:
+        """Serve a fetch from the replay server; absent entries fail like an unreachable host."""
+        local_url = f"{self.base_url}/http?{urlencode({'method': method.upper(), 'url': url})}"
+        response = fetch(local_url, **kwargs)
+        archived = response.header("x-bao-archive")
+        if archived in ("miss", "error"):
+            return HttpResponse(url=url, error=response.header("x-bao-error") or "Not in archive")
+        response.url = url
+        response.final_url = response.header("x-bao-final-url") or url
+        response.headers.pop("x-bao-final-url", None)
+        return response
+
+    def record_page(self, url: str, page_html: str) -> None:
+        if self.writer is not None and url and page_html:
+            self.writer.write(f"page/{page_key(url)}.html", page_html)
+
+    def record_result(self, name: str, page_url: str, result: object) -> None:
+        if self.writer is not None:
+            self.writer.write(name, json.dumps({"url": page_url, "result": result}))
+
+    def recorded_result(self, name: str) -> tuple[bool, object]:
+        entry = self.reader.read_json(name) if self.reader else None
+        return (entry is not None, entry.get("result") if entry else None)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        if self.server is not None:
+            self.server.shutdown()
+
+
+class ArchiveBrowser:
+    """RPA module proxy that records or replays navigations and ``dom``/``read`` results."""
+
+    def __init__(self, rpa, archive: PageArchive) -> None:
+        self._rpa = rpa
+        self._archive = archive
+        self._page = ""
+        self._counts: dict[str, int] = {}
+        self.offline = archive.offline_dom
+
+    def __getattr__(self, name: str):
+        return getattr(self._rpa, name)
+
+    def _snapshot(self) -> None:
+        if self._archive.mode == "record" and self._page:
+            try:
+                page_html = self._rpa.dom(OUTER_HTML_JS)
+            except Exception:
+                return
+            if isinstance(page_html, str):
+                self._archive.record_page(self._page, page_html)
+
+    def _result(self, kind: str, script: str, live) -> object:
+        prefix = result_prefix(kind, self._page, script)
+        occurrence = self._counts.get(prefix, 0)
+        self._counts[prefix] = occurrence + 1
+        name = f"{prefix}-{occurrence}.json"
+        if self.offline:
+            return self._archive.recorded_result(name)[1]
+        result = live()
+        if self._archive.mode == "record":
+            self._archive.record_result(name, self._page, result)
+        else:
+            found, recorded = self._archive.recorded_result(name)
+            if found and recorded != result:
+                print(f"Replay: {kind} result #{occurrence} on {self._page} differs from the recording", file=sys.stderr)
+        return result
+
+    def init(self, *args, **kwargs):
+        return True if self.offline else self._rpa.init(*args, **kwargs)
+
+    def url(self, webpage_url: str | None = None):
+        if webpage_url is None:
+            return self._page if self._archive.replaying else self._rpa.url()
+        self._snapshot()
+        self._page = webpage_url
+        if self.offline:
+            return True
+        if self._archive.replaying:
+            return self._rpa.url(self._archive.replay_page_url(webpage_url))
+        return self._rpa.url(webpage_url)
+
+    def wait(self, delay=None):
+        if self.offline:
+            return True
+        return self._rpa.wait() if delay is None else self._rpa.wait(delay)
+
+    def dom(self, script: str):
+        return self._result("dom", script, lambda: self._rpa.dom(script))
+
+    def read(self, element: str):
+        return self._result("read", element, lambda: self._rpa.read(element))
+
+    def close(self):
+        self._snapshot()
+        self._page = ""
+        return True if self.offline else self._rpa.close()
+
+
+_archive: PageArchive | None = None
+_resolved = False
+_lock = threading.Lock()
+
+
+def archive_options(payload: dict) -> dict | None:
+    options = payload.get("archive")
+    if not isinstance(options, dict) or options.get("mode") not in ARCHIVE_MODES:
+        return None
+    return options
+
+
+def current_archive() -> PageArchive | None:
+    """The archive requested by the stdin payload, opened once per process (None when off)."""
+    global _archive, _resolved
+    with _lock:
+        if _resolved:
+            return _archive
+        _resolved = True
+        options = archive_options(read_payload())
+        if options is None:
+            return None
+        raw_path = options.get("path")
+        script = Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else "scraper"
+        path = Path(raw_path).expanduser() if isinstance(raw_path, str) and raw_path.strip() else data_path("archives", f"{script}.zip")
+        try:
+            archive = PageArchive(options["mode"], path.resolve(), options.get("dom") is True)
+        except (OSError, zipfile.BadZipFile) as exc:
+            print(f"Archive unavailable ({path}): {exc}", file=sys.stderr)
+            return None
+        # Isolate the run from the real breaker, caches and listing store
+        scratch = tempfile.mkdtemp(prefix="bao-archive-")
+        os.environ["BAO_SCRAPER_DATA_DIR"] = scratch
+        atexit.register(shutil.rmtree, scratch, True)
+        atexit.register(archive.close)
+        if archive.replaying:
+            # Everything is local: no robots.txt lookups and no rate limiting
+            from host_scheduler import configure_scheduler
+
+            configure_scheduler({
+                "respectRobots": False, "requestsPerSecond": 1000, "burst": 1000,
+                "maxConcurrency": 64, "perHostConcurrency": 16,
+            })
+        print(f"Archive {archive.mode}: {archive.path}", file=sys.stderr)
+        _archive = archive
+        return _archive
+
+
+def archive_browser(rpa):
+    """Return ``rpa`` itself, or a recording/replaying proxy when the payload asks for one."""
+    archive = current_archive()
+    return ArchiveBrowser(rpa, archive) if archive is not None else rpa
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "serve":
+        print("Usage: page_archive.py serve <archive.zip> [port]", file=sys.stderr)
+        sys.exit(2)
+    served = start_replay_server(ArchiveReader(Path(sys.argv[2])), int(sys.argv[3]) if len(sys.argv) > 3 else 8799)
+    print(f"Serving {sys.argv[2]} at http://127.0.0.1:{served.server_address[1]}/page?url=...", file=sys.stderr)
+    threading.Event().wait()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Fast classification of interstitial pages: bot challenges, captchas, login and consent walls.
+
+Run once right after navigation. One ``dom`` call checks the page for
+known DOM markers, titles, URLs and phrases, and reports ``challenge``,
+``captcha``, ``login`` or ``consent``. A page is never an interstitial when
+``content_selector`` (the listing or form the caller came for) is present,
+and never a login wall when it has form fields beyond a login form's (an
+application form with a password field for account creation is still a form).
+Self-solving JavaScript challenges (e.g. Cloudflare's "Just a moment...") are
+re-checked for a few seconds before they count.
+
+:func:`raise_if_interstitial` raises :class:`InterstitialDetected`, which board
+runs report as ``blocked`` with an ``interstitial`` object. The page's host is
+remembered for the rest of the run, so :func:`host_interstitial` lets callers
+skip further pages on a walled host.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from urllib.parse import urlsplit
+
+CHALLENGE_SETTLE_SECONDS = 8.0
+POLL_SECONDS = 1.0
+# Consent markers only count when the dialog is most of the page, not a banner over the content
+CONSENT_MAX_TEXT = 1500
+# A login form is a user name, a password and perhaps a one-time code; more visible fields make it a form to fill
+LOGIN_MAX_FIELDS = 3
+
+# Checked in order; the first kind with a match wins
+RULES: dict[str, dict[str, list[str]]] = {
+    "challenge": {
+        "selectors": [
+            "#challenge-form", "#challenge-stage", "#challenge-running", "#cf-challenge-running",
+            ".cf-browser-verification", "#cf-please-wait", "#trk_jschal_js", "#distil_ident_block",
+            "script[src*='/cdn-cgi/challenge-platform/']", "#sec-if-cpt-container", "#ddg-l10n-title",
+        ],
+        "titles": [
+            "just a moment", "attention required", "checking your browser",
+            "ddos-guard", "security check", "pardon our interruption",
+        ],
+        "texts": [
+            "checking your browser before accessing", "enable javascript and cookies to continue",
+            "checking if the site connection is secure", "needs to review the security of your connection",
+            "you don't have permission to access",
+        ],
+        "urls": ["/cdn-cgi/challenge-platform/", "__cf_chl_"],
+    },
+    "captcha": {
+        "selectors": [
+            # Invisible widgets (and the buttons that trigger them) sit on forms that still submit
+            "iframe[src*='recaptcha/api2/anchor']:not([src*='size=invisible'])",
+            "iframe[src*='recaptcha/enterprise/anchor']:not([src*='size=invisible'])",
+            "iframe[src*='hcaptcha.com'][src*='checkbox']", ".cf-turnstile", "iframe[src*='challenges.cloudflare.com']",
+            "#px-captcha", "iframe[src*='captcha-delivery.com']", "#captcha", "[name='captcha']",
+            "iframe[src*='arkoselabs.com']", "#FunCaptcha",
+        ],
+        "titles": ["one more step", "captcha", "are you a robot", "verify you are human"],
+        "texts": [
+            "verify you are human", "are you a robot", "prove you're not a robot", "i'm not a robot",
+            "complete the security check", "unusual traffic from your computer",
+        ],
+        "urls": ["/captcha", "sorry/index"],
+    },
+    "login": {
+        "selectors": ["input[type='password']", "form[action*='login']", "form[action*='signin']"],
+        "titles": ["sign in", "log in", "login", "sign-in", "log-in"],
+        "texts": ["sign in to continue", "log in to continue", "please log in", "please sign in", "login required"],
+        "urls": ["/login", "/signin", "/sign-in", "/log-in", "/sso/", "/oauth", "/auth/", "accounts.google.com"],
+    },
+    "consent": {
+        "selectors": [
+            "#onetrust-consent-sdk", "#CybotCookiebotDialog", ".fc-consent-root", "#didomi-host",
+            "#qc-cmp2-container", "[id^='sp_message_container']", "#usercentrics-root", ".cmp-container",
+        ],
+        "titles": ["before you continue", "privacy settings", "cookie consent", "your privacy"],
+        "texts": ["before you continue to", "we value your privacy"],
+        "urls": ["consent.google.", "consent.youtube.", "consent.yahoo.", "guce.yahoo.", "/consent"],
+    },
+}
+
+CLASSIFY_JS = """
+return (function(rules, contentSelector, consentMaxText, loginMaxFields) {
+    if (contentSelector) {
+        try { if (document.querySelector(contentSelector)) return ''; } catch (e) {}
+    }
+    function visible(el) {
+        if (!el) return false;
+        if (el.tagName === 'SCRIPT') return true;
+        var rect = el.getBoundingClientRect();
+        if (!(rect.width > 0 && rect.height > 0)) return false;
+        var style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.opacity !== '0';
+    }
+    // Textareas, selects, uploads or more than a login's worth of inputs make the page a form, not a wall
+    function formBeyondLogin() {
+        var fields = document.querySelectorAll('input, textarea, select'), count = 0;
+        for (var f = 0; f < fields.length; f++) {
+            var field = fields[f], type = (field.getAttribute('type') || 'text').toLowerCase();
+            if (type === 'hidden' || type === 'submit' || type === 'button' || type === 'checkbox' || !visible(field)) continue;
+            if (field.tagName !== 'INPUT' || type === 'file') return true;
+            count++;
+        }
+        return count > loginMaxFields;
+    }
+    var title = (document.title || '').toLowerCase().trim();
+    var href = location.href.toLowerCase();
+    var text = document.body ? (document.body.innerText || '').slice(0, 5000).toLowerCase() : '';
+    var kinds = ['challenge', 'captcha', 'login', 'consent'];
+    for (var k = 0; k < kinds.length; k++) {
+        var kind = kinds[k], rule = rules[kind], i;
+        if (kind === 'login' && formBeyondLogin()) continue;
+        for (i = 0; i < rule.urls.length; i++) {
+            if (href.indexOf(rule.urls[i]) !== -1) return JSON.stringify({kind: kind, marker: 'url:' + rule.urls[i]});
+        }
+        for (i = 0; i < rule.titles.length; i++) {
+            if (title.indexOf(rule.titles[i]) === 0) return JSON.stringify({kind: kind, marker: 'title:' + rule.titles[i]});
+        }
+        if (kind === 'consent' && text.length > consentMaxText) continue;
+        for (i = 0; i < rule.selectors.length; i++) {
+            var el = null;
+            try { el = document.querySelector(rule.selectors[i]); } catch (e) {}
+            if (visible(el)) return JSON.stringify({kind: kind, marker: 'selector:' + rule.selectors[i]});
+        }
+        for (i = 0; i < rule.texts.length; i++) {
+            if (text.indexOf(rule.texts[i]) !== -1) return JSON.stringify({kind: kind, marker: 'text:' + rule.texts[i]});
+        }
+    }
+    return '';
+})(%s, %s, %d, %d)
+"""
+
+
+@dataclass(frozen=True)
+class Interstitial:
+    kind: str
+    marker: str
+    url: str = ""
+
+    def as_dict(self) -> dict[str, str]:
+        return asdict(self)
+
+
+class InterstitialDetected(Exception):
+    """Raised when the page is a challenge, captcha, login or consent wall instead of content."""
+
+    def __init__(self, interstitial: Interstitial) -> None:
+        super().__init__(f"{interstitial.kind} interstitial at {interstitial.url} ({interstitial.marker})")
+        self.interstitial = interstitial
+
+
+_walled_hosts: dict[str, Interstitial] = {}
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def _classify_once(browser, content_selector: str) -> Interstitial | None:
+    script = CLASSIFY_JS % (json.dumps(RULES), json.dumps(content_selector), CONSENT_MAX_TEXT, LOGIN_MAX_FIELDS)
+    try:
+        raw = browser.dom(script)
+        found = json.loads(raw) if isinstance(raw, str) and raw.strip().startswith("{") else None
+    except Exception as exc:
+        print(f"Page classification failed: {exc}", file=sys.stderr)
+        return None
+    if not isinstance(found, dict) or found.get("kind") not in RULES:
+        return None
+    return Interstitial(found["kind"], str(found.get("marker") or ""))
+
+
+def classify_page(
+    browser,
+    url: str = "",
+    content_selector: str = "",
+    settle_seconds: float = CHALLENGE_SETTLE_SECONDS,
+) -> Interstitial | None:
+    """Classify the loaded page; walled hosts are remembered for :func:`host_interstitial`."""
+    found = _classify_once(browser, content_selector)
+    deadline = time.monotonic() + settle_seconds
+    while found is not None and found.kind == "challenge" and time.monotonic() < deadline:
+        time.sleep(POLL_SECONDS)
+        found = _classify_once(browser, content_selector)
+    if found is None:
+        return None
+    found = Interstitial(found.kind, found.marker, url)
+    if _host(url):
+        _walled_hosts[_host(url)] = found
+    return found
+
+
+def raise_if_interstitial(browser, url: str = "", content_selector: str = "") -> None:
+    found = classify_page(browser, url, content_selector)
+    if found is not None:
+        raise InterstitialDetected(found)
+
+
+def host_interstitial(url: str) -> Interstitial | None:
+    """The interstitial already met on this URL's host during this run, if any."""
+    return _walled_hosts.get(_host(url))
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Change detection for board listings: HTTP validators plus a listing-region fingerprint.
+
+Per board and ``sourceUrl``, ``fingerprints.db`` keeps the listing's last
+``ETag``/``Last-Modified`` and a hash of its listing region (the nodes the
+board extracts from). With ``ifChanged: true`` in the payload, a
+run first issues a conditional request when validators are stored and, once
+the page is loaded, compares the region hash; either match ends the run as
+``unchanged`` before extraction. Validators are learned from responses the run
+fetches anyway (HTTP fast paths and non-304 conditional requests).
+State is only saved for healthy runs. Paged (``cursor``) and sharded requests
+are never short-circuited, since they do not load the listing as a whole.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+
+from host_scheduler import get_scheduler
+from result_cache import cache_key
+from scraper_paths import data_path
+
+FINGERPRINT_FILE = "fingerprints.db"
+
+REGION_FINGERPRINT_JS = """
+return (function() {
+    var nodes = document.querySelectorAll(%s);
+    var hash = 0x811c9dc5, length = 0;
+    for (var i = 0; i < nodes.length; i++) {
+        var text = (nodes[i].textContent || '').replace(/\\s+/g, ' ').trim() + '|' + (nodes[i].href || '') + '\\n';
+        length += text.length;
+        for (var j = 0; j < text.length; j++) {
+            hash ^= text.charCodeAt(j);
+            hash = Math.imul(hash, 0x01000193) >>> 0;
+        }
+    }
+    return nodes.length + ':' + length + ':' + hash.toString(16);
+})()
+"""
+
+
+def fingerprint_items(items: list[dict]) -> str:
+    """Fingerprint of already-parsed listing items (HTTP fast paths)."""
+    raw = json.dumps(items, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def region_fingerprint(browser, selector: str) -> str:
+    """Hash the listing region in the page, so only a short string crosses the RPA bridge."""
+    try:
+        value = browser.dom(REGION_FINGERPRINT_JS % json.dumps(selector))
+    except Exception:
+        return ""
+    return value if isinstance(value, str) and not value.startswith("0:") else ""
+
+
+class FingerprintStore:
+    def __init__(self, path: str | None = None) -> None:
+        self.conn = sqlite3.connect(path or str(data_path(FINGERPRINT_FILE)), timeout=10)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            " key TEXT PRIMARY KEY, url TEXT NOT NULL, etag TEXT, last_modified TEXT,"
+            " fingerprint TEXT, updated_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> dict:
+        row = self.conn.execute(
+            "SELECT etag, last_modified, fingerprint FROM fingerprints WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return {}
+        return {"etag": row[0] or "", "lastModified": row[1] or "", "fingerprint": row[2] or ""}
+
+    def put(self, key: str, url: str, state: dict) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (key, url, etag, last_modified, fingerprint, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, state.get("etag") or None, state.get("lastModified") or None,
+                 state.get("fingerprint") or None, time.time()),
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class ChangeTracker:
+    """One run's view of the stored validators/fingerprint and the values observed this run."""
+
+    def __init__(self, board: str, source_url: str, payload: dict, store: FingerprintStore | None = None) -> None:
+        self.source_url = source_url
+        self.key = cache_key(board, source_url, {})
+        # Only runs from the top of the unfiltered listing describe it as a whole
+        self.tracking = not payload.get("cursor") and not payload.get("shards")
+        self.short_circuit = self.tracking and payload.get("ifChanged") is True
+        self.previous: dict = {}
+        self.observed: dict = {}
+        self.store = store
+        if self.tracking:
+            try:
+                self.store = store or FingerprintStore()
+                self.previous = self.store.get(self.key)
+            except (sqlite3.Error, OSError) as exc:
+                print(f"Fingerprint store unavailable: {exc}", file=sys.stderr)
+                self.tracking = self.short_circuit = False
+        self.observed = dict(self.previous)
+
+    def not_modified(self) -> bool:
+        """
+        Conditional request for the listing URL; True on 304 Not Modified.
+
+        Without stored validators there is nothing to make the request conditional
+        on, so no request is sent and the region fingerprint decides.
+        """
+        if not self.short_circuit:
+            return False
+        headers: dict[str, str] = {}
+        if self.previous.get("etag"):
+            headers["If-None-Match"] = self.previous["etag"]
+        if self.previous.get("lastModified"):
+            headers["If-Modified-Since"] = self.previous["lastModified"]
+        if not headers:
+            return False
+        response = get_scheduler().fetch(self.source_url, headers=headers, timeout=10)
+        if response.status == 304:
+            return True
+        self.record_response(self.source_url, response)
+        return False
+
+    def record_response(self, url: str, response) -> None:
+        """Keep the validators of a listing URL response the run fetched anyway."""
+        if self.tracking and url == self.source_url and response.ok:
+            self.observed["etag"] = response.header("etag")
+            self.observed["lastModified"] = response.header("last-modified")
+
+    def region_unchanged(self, fingerprint: str) -> bool:
+        """Record this run's region fingerprint; True when short-circuiting and it matches the last one."""
+        if not self.tracking or not fingerprint:
+            return False
+        self.observed["fingerprint"] = fingerprint
+        return self.short_circuit and fingerprint == self.previous.get("fingerprint")
+
+    def commit(self) -> None:
+        if not self.tracking or self.store is None:
+            return
+        try:
+            self.store.put(self.key, self.source_url, self.observed)
+        except (sqlite3.Error, OSError) as exc:
+            print(f"Fingerprint store write failed: {exc}", file=sys.stderr)
+
+
+_current: ChangeTracker | None = None
+
+
+def start_tracking(board: str, source_url: str, payload: dict) -> ChangeTracker:
+    global _current
+    _current = ChangeTracker(board, source_url, payload)
+    return _current
+
+
+def current_tracker() -> ChangeTracker | None:
+    """The tracker of the board run in progress (None outside ``run_board``)."""
+    return _current
+
+
+def listing_response(url: str, response) -> None:
+    """Convenience for HTTP fast paths: learn the listing's validators from its response."""
+    tracker = current_tracker()
+    if tracker is not None:
+        tracker.record_response(url, response)
+
+
+def listing_unchanged(fingerprint: str) -> bool:
+    """Convenience for board scrapers: record the region fingerprint and report whether to stop."""
+    tracker = current_tracker()
+    return tracker is not None and tracker.region_unchanged(fingerprint)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Result limits and cursor-based pagination for the board scrapers.
+
+The stdin payload may carry ``limit`` (jobs to return, 0 for no limit),
+``maxPages`` (listing pages or scroll steps to visit) and an opaque ``cursor``
+taken from a previous run's ``nextCursor``. Cursors encode the board, the
+listing page to resume on and how many items of it were already returned, so
+the server can page through a board in small requests or fetch it in one run.
+Feed cursors count feed entries instead and are tagged as such, so a run that
+falls back to the HTML listing restarts at its top rather than at a feed offset.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+
+# Upper bounds so a bulk run still terminates on a misbehaving board
+MAX_LIMIT = 2000
+MAX_PAGES = 50
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    board: str
+    limit: int | None
+    max_pages: int
+    page: int = 1
+    offset: int = 0
+
+    @property
+    def window_end(self) -> int | None:
+        """Index (on the start page, or overall for single-page boards) one past the last item wanted."""
+        return None if self.limit is None else self.offset + self.limit
+
+    def room(self, taken: int) -> int | None:
+        return None if self.limit is None else max(self.limit - taken, 0)
+
+
+def encode_state(board: str, state: dict) -> str:
+    raw = json.dumps({"b": board, **state}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_state(cursor: object, board: str) -> dict | None:
+    """Return the state stored in a cursor, or None when it is absent, invalid or from another board."""
+    if not isinstance(cursor, str) or not cursor.strip():
+        return None
+    try:
+        padded = cursor.strip() + "=" * (-len(cursor.strip()) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(state, dict) or state.get("b") != board:
+        return None
+    return state
+
+
+def valid_position(page: object, offset: object) -> bool:
+    return isinstance(page, int) and isinstance(offset, int) and page >= 1 and offset >= 0
+
+
+def encode_cursor(board: str, page: int, offset: int) -> str:
+    return encode_state(board, {"p": page, "o": offset})
+
+
+def decode_cursor(cursor: object, board: str) -> tuple[int, int]:
+    """Return ``(page, offset)``; cursors that are invalid or from another board restart at the top."""
+    state = decode_state(cursor, board) or {}
+    page, offset = state.get("p"), state.get("o")
+    if not valid_position(page, offset):
+        return 1, 0
+    return page, offset
+
+
+def encode_feed_cursor(board: str, offset: int) -> str:
+    return encode_state(board, {"feed": offset})
+
+
+def decode_feed_cursor(cursor: object, board: str) -> int:
+    """Return the feed entry offset; listing cursors and invalid ones start at the first entry."""
+    offset = (decode_state(cursor, board) or {}).get("feed")
+    return offset if valid_position(1, offset) else 0
+
+
+def _positive_int(value: object) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)) and value >= 0:
+        return int(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    return None
+
+
+def page_request_from(payload: dict, board: str, default_limit: int, default_max_pages: int = 1) -> PageRequest:
+    limit = _positive_int(payload.get("limit"))
+    if limit is None:
+        limit = default_limit
+    max_pages = _positive_int(payload.get("maxPages")) or default_max_pages
+    page, offset = decode_cursor(payload.get("cursor"), board)
+    return PageRequest(
+        board=board,
+        limit=min(limit, MAX_LIMIT) if limit else None,
+        max_pages=min(max_pages, MAX_PAGES),
+        page=page,
+        offset=offset,
+    )
+
+
+def take_window(items: list, request: PageRequest) -> tuple[list, str | None]:
+    """
+    Slice one window out of a fully extracted single-page listing.
+    Returns the window and the cursor for the next one (None at the end).
+    """
+    end = request.window_end
+    window = items[request.offset:end]
+    if end is not None and len(items) > end:
+        return window, encode_cursor(request.board, request.page, end)
+    return window, None
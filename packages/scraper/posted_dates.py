@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Posted-date parsing and the ``since`` watermark for the board scrapers.
+
+Listings show dates as ISO timestamps, relative phrases ("3 days ago",
+"yesterday", "2h ago") or day/month text ("Posted: 12 Oct", "Oct 12, 2024").
+``find_posted_date`` reads the first of these from a date element's text
+and returns an ISO-8601 UTC timestamp ("" when no date is found).
+
+Free text around a listing is only read through ``find_labelled_date``, which
+takes a date right after a "Posted"/"Listed"/"Published" label: month names
+like "may" and stray numbers in titles and locations are not dates. Dates
+from surrounding text are reported but never drop a listing or stop a crawl
+(``listing_is_older``).
+"""
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH = r"(?P<month>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+
+UNIT_SECONDS = {
+    "s": 1, "sec": 1, "second": 1,
+    "m": 60, "min": 60, "minute": 60,
+    "h": 3600, "hr": 3600, "hour": 3600,
+    "d": 86400, "day": 86400,
+    "w": 7 * 86400, "wk": 7 * 86400, "week": 7 * 86400,
+    "mo": 30 * 86400, "month": 30 * 86400,
+    "y": 365 * 86400, "yr": 365 * 86400, "year": 365 * 86400,
+}
+
+ISO_RE = re.compile(r"\b(?P<date>\d{4}-\d{2}-\d{2})(?:[T ](?P<time>\d{2}:\d{2}(?::\d{2})?)(?:\.\d+)?(?P<tz>Z|[+-]\d{2}:?\d{2})?)?\b")
+RELATIVE_RE = re.compile(
+    r"\b(?P<count>\d+|an?|one)\s*\+?\s*"
+    r"(?P<unit>seconds?|secs?|minutes?|mins?|hours?|hrs?|days?|weeks?|wks?|months?|mo|years?|yrs?|[smhdwy])"
+    r"\s+ago\b",
+    re.IGNORECASE,
+)
+KEYWORD_RE = re.compile(r"\b(?P<word>just now|today|yesterday)\b", re.IGNORECASE)
+DAY_MONTH_RE = re.compile(rf"\b(?P<day>\d{{1,2}})(?:st|nd|rd|th)?\s+{_MONTH}\.?,?(?:\s+(?P<year>\d{{4}}))?\b", re.IGNORECASE)
+MONTH_DAY_RE = re.compile(rf"\b{_MONTH}\.?\s+(?P<day>\d{{1,2}})(?:st|nd|rd|th)?,?(?:\s+(?P<year>\d{{4}}))?\b", re.IGNORECASE)
+LABEL_RE = re.compile(r"\b(?:posted|listed|published|added)(?:\s+on)?\s*:?\s*", re.IGNORECASE)
+
+
+def to_iso(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_iso(value: str) -> datetime | None:
+    """Parse an ISO date/datetime (naive values are taken as UTC)."""
+    text = (value or "").strip()
+    if not text:
+        return None
+    try:
+        moment = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        match = ISO_RE.search(text)
+        if not match:
+            return None
+        try:
+            moment = datetime.fromisoformat(match.group("date"))
+        except ValueError:
+            return None
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def _calendar_date(day: str, month: str, year: str | None, now: datetime) -> datetime | None:
+    month_number = MONTHS.get(month.lower()[:4].rstrip("."), MONTHS.get(month.lower()[:3]))
+    if not month_number:
+        return None
+    try:
+        moment = datetime(int(year) if year else now.year, month_number, int(day), tzinfo=timezone.utc)
+    except ValueError:
+        return None
+    if not year and moment > now + timedelta(days=1):
+        # "12 Dec" read in January refers to last year
+        moment = moment.replace(year=now.year - 1)
+    return moment
+
+
+def _first_date(text: str, now: datetime) -> tuple[int, datetime] | None:
+    """The earliest date in ``text`` and where it starts."""
+    candidates: list[tuple[int, datetime]] = []
+
+    match = ISO_RE.search(text)
+    if match:
+        moment = parse_iso(match.group(0))
+        if moment:
+            candidates.append((match.start(), moment))
+    match = RELATIVE_RE.search(text)
+    if match:
+        count = match.group("count").lower()
+        amount = 1 if count in ("a", "an", "one") else int(count)
+        unit = match.group("unit").lower()
+        seconds = UNIT_SECONDS.get(unit) or UNIT_SECONDS.get(unit.rstrip("s")) or 0
+        if seconds:
+            candidates.append((match.start(), now - timedelta(seconds=amount * seconds)))
+    match = KEYWORD_RE.search(text)
+    if match:
+        word = match.group("word").lower()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        if word == "yesterday":
+            candidates.append((match.start(), midnight - timedelta(days=1)))
+        elif word == "today":
+            candidates.append((match.start(), midnight))
+        else:
+            candidates.append((match.start(), now))
+    for pattern in (DAY_MONTH_RE, MONTH_DAY_RE):
+        match = pattern.search(text)
+        if match:
+            moment = _calendar_date(match.group("day"), match.group("month"), match.group("year"), now)
+            if moment:
+                candidates.append((match.start(), moment))
+
+    return min(candidates, key=lambda candidate: candidate[0]) if candidates else None
+
+
+def find_posted_date(text: str, now: datetime | None = None) -> str:
+    """Return the first posted date in a date element's ``text`` as an ISO-8601 UTC timestamp, or ""."""
+    if not text:
+        return ""
+    found = _first_date(text, now or datetime.now(timezone.utc))
+    return to_iso(found[1]) if found else ""
+
+
+def find_labelled_date(text: str, now: datetime | None = None) -> str:
+    """Return the date following a "Posted ..." label in free ``text``, or ""."""
+    now = now or datetime.now(timezone.utc)
+    for label in LABEL_RE.finditer(text or ""):
+        found = _first_date(text[label.end():label.end() + 40], now)
+        if found and found[0] == 0:
+            return to_iso(found[1])
+    return ""
+
+
+def listing_posted_date(item: dict, context_key: str = "postedContext", now: datetime | None = None) -> str:
+    """A listing's date from its date element (``postedText``), else from a labelled fragment of its text."""
+    return find_posted_date(item.get("postedText", ""), now) or find_labelled_date(item.get(context_key, ""), now)
+
+
+def normalize_posted_date(value: str, now: datetime | None = None) -> str:
+    """
+    Normalize a machine-readable date (ISO-8601, RFC 822 as in feeds and meta tags)
+    or listing text to the ISO-8601 UTC form used for ``postedDate`` ("" when none).
+    """
+    text = (value or "").strip()
+    if not text:
+        return ""
+    moment = parse_iso(text) if ISO_RE.match(text) else None
+    if moment is None:
+        try:
+            moment = parsedate_to_datetime(text)
+        except (TypeError, ValueError, IndexError):
+            return find_posted_date(text, now)
+        if not moment.tzinfo:
+            moment = moment.replace(tzinfo=timezone.utc)
+    return to_iso(moment)
+
+
+def since_from(payload: dict) -> datetime | None:
+    """The ``since`` watermark from the stdin payload (typically the last successful run)."""
+    since = payload.get("since")
+    return parse_iso(since) if isinstance(since, str) else None
+
+
+def is_older(posted_date: str, since: datetime | None) -> bool:
+    """True when a listing is dated before the watermark; undated listings are never older."""
+    if since is None or not posted_date:
+        return False
+    moment = parse_iso(posted_date)
+    return moment is not None and moment < since
+
+
+def listing_is_older(item: dict, since: datetime | None) -> bool:
+    """True when a listing's date element dates it before the watermark; text-inferred dates never count."""
+    return is_older(find_posted_date(item.get("postedText", "")), since)
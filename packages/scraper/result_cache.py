@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of board run envelopes with stale-while-revalidate.
+
+Entries are keyed by board, normalized ``sourceUrl`` and the result-shaping
+payload options, and stored in ``result-cache.db`` under the scraper data
+directory. A fresh entry is returned without launching a browser; a stale one
+(older than ``ttl`` but within ``maxStale``) is returned immediately while a
+detached copy of the script refreshes it in the background.
+
+Payload ``cache`` options: ``false`` disables the cache, or an object with
+``ttl`` (seconds, default 600), ``maxStale`` (seconds, default 3600) and
+``refresh`` (``true`` bypasses the lookup and rewrites the entry).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from scraper_paths import data_path
+
+CACHE_FILE = "result-cache.db"
+DEFAULT_TTL_SECONDS = 600
+DEFAULT_MAX_STALE_SECONDS = 3600
+# A background refresh started within this window is assumed to still be running
+REFRESH_LOCK_SECONDS = 300
+# Payload keys that do not change which jobs a run returns
+UNKEYED_OPTIONS = {"sourceUrl", "cache", "browser", "politeness", "ifChanged"}
+
+
+def normalize_url(url: str) -> str:
+    parsed = urlparse(url.strip())
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    path = parsed.path.rstrip("/") or "/"
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), path, "", query, ""))
+
+
+def cache_key(board: str, source_url: str, payload: dict) -> str:
+    options = {k: v for k, v in payload.items() if k not in UNKEYED_OPTIONS}
+    raw = json.dumps([board, normalize_url(source_url), options], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def cache_options(payload: dict) -> dict | None:
+    """Resolved cache options, or None when caching is disabled for this run."""
+    options = payload.get("cache", {})
+    if options is False or payload.get("archive"):
+        # Record/replay runs must reach the (recorded) board every time
+        return None
+    options = options if isinstance(options, dict) else {}
+
+    def seconds(name: str, default: int) -> float:
+        value = options.get(name)
+        return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0 else default
+
+    return {
+        "ttl": seconds("ttl", DEFAULT_TTL_SECONDS),
+        "maxStale": seconds("maxStale", DEFAULT_MAX_STALE_SECONDS),
+        "refresh": options.get("refresh") is True,
+    }
+
+
+class ResultCache:
+    """SQLite store of run envelopes keyed by :func:`cache_key`."""
+
+    def __init__(self, path: str | None = None) -> None:
+        self.conn = sqlite3.connect(path or str(data_path(CACHE_FILE)), timeout=10)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS result_cache ("
+            " key TEXT PRIMARY KEY, board TEXT NOT NULL, source_url TEXT NOT NULL,"
+            " stored_at REAL NOT NULL, refreshing_at REAL, envelope TEXT NOT NULL)"
+        )
+
+    def get(self, key: str) -> tuple[dict, float, float | None] | None:
+        """Return ``(envelope, stored_at, refreshing_at)`` or None."""
+        row = self.conn.execute(
+            "SELECT envelope, stored_at, refreshing_at FROM result_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0]), row[1], row[2]
+        except json.JSONDecodeError:
+            return None
+
+    def put(self, key: str, board: str, source_url: str, envelope: dict) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO result_cache (key, board, source_url, stored_at, refreshing_at, envelope)"
+                " VALUES (?, ?, ?, ?, NULL, ?)",
+                (key, board, source_url, time.time(), json.dumps(envelope)),
+            )
+
+    def claim_refresh(self, key: str, now: float | None = None) -> bool:
+        """Mark a background refresh as started; False if another one is already running."""
+        now = now or time.time()
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE result_cache SET refreshing_at = ?"
+                " WHERE key = ? AND (refreshing_at IS NULL OR refreshing_at < ?)",
+                (now, key, now - REFRESH_LOCK_SECONDS),
+            )
+        return cursor.rowcount > 0
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def spawn_refresh(payload: dict, script: str = "") -> bool:
+    """
+    Re-run ``script`` (a scraper file name; the current script by default) detached
+    with ``cache.refresh`` set, so it rewrites the entry.
+    """
+    if script:
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), script)
+    else:
+        script = os.path.abspath(sys.argv[0]) if sys.argv and sys.argv[0] else ""
+    if not script.endswith(".py") or not os.path.exists(script):
+        return False
+    refresh_payload = dict(payload)
+    cache = payload.get("cache") if isinstance(payload.get("cache"), dict) else {}
+    refresh_payload["cache"] = {**cache, "refresh": True}
+    try:
+        # Supervised like a server-started run, so a hung refresh cannot linger
+        proc = subprocess.Popen(
+            [sys.executable, os.path.join(os.path.dirname(script), "run_watchdog.py"), os.path.basename(script)],
+            cwd=os.path.dirname(script),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        proc.stdin.write(json.dumps(refresh_payload).encode())
+        proc.stdin.close()
+    except OSError as exc:
+        print(f"Background refresh failed to start: {exc}", file=sys.stderr)
+        return False
+    return True
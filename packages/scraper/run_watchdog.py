@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Run supervisor enforcing per-phase and total deadlines on a scraper script.
+
+``python3 run_watchdog.py <script.py> [args...]`` forwards stdin to the
+script, run in its own process group, and passes its stdout/stderr through
+as they arrive, so a multi-board run's envelopes reach the server board by
+board.
+Scripts report the phase they are in with :func:`phase`, which writes
+a ``{"type": "phase"}`` line to stderr only when running under the supervisor.
+``BrowserDriver`` marks ``init``, ``navigate`` (``url``), ``dom``, ``interact``
+(``read``/``click``/``type``...) and ``close`` for every browser call, and
+``board_engine.run_board`` announces the board being scraped (``scrape``).
+Every phase the scripts report has a deadline.
+
+When a phase or the whole run overruns, the supervisor kills the script's
+process group (the script plus any Chrome/TagUI it started) and prints a
+``timeout`` result naming the phase on its own line after whatever the script
+had already printed: a board envelope (also recorded in the board's circuit
+breaker) for board scrapers, else ``success: false``.
+The group is also killed when the script exits, so a crash between ``init``
+and ``close`` leaves no browser behind. Each run is registered under
+``watchdog/`` in the data directory; at startup, groups left by supervisors
+that died (e.g. killed by the server) are reaped.
+
+Deadlines come from the payload's ``watchdog`` object
+(``{"totalSeconds": 600, "phases": {"navigate": 90}}``).
+"""
+from __future__ import annotations
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from scraper_io import write_result
+from scraper_paths import data_path
+
+WATCHDOG_ENV = "BAO_WATCHDOG"
+DEFAULT_TOTAL_SECONDS = 600
+# "scrape" is a board's own work between browser calls (HTTP fetches, parsing); "script" is
+# time outside any phase, bounded like the run as a whole
+PHASE_DEADLINES = {
+    "init": 60, "navigate": 90, "dom": 60, "interact": 60, "close": 30,
+    "scrape": 300, "script": DEFAULT_TOTAL_SECONDS,
+}
+KILL_GRACE_SECONDS = 3
+POLL_SECONDS = 0.2
+# Registered process groups older than this are forgotten rather than killed (pid reuse)
+ORPHAN_MAX_AGE_SECONDS = 24 * 60 * 60
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Script side ---------------------------------------------------------------
+
+_phases: list[tuple[str, dict]] = []
+
+
+def supervised() -> bool:
+    return os.environ.get(WATCHDOG_ENV) == "1"
+
+
+def _emit(name: str, fields: dict) -> None:
+    try:
+        sys.stderr.write(json.dumps({"type": "phase", "phase": name, **fields}) + "\n")
+        sys.stderr.flush()
+    except (OSError, ValueError):
+        pass
+
+
+@contextmanager
+def phase(name: str, **fields: object):
+    """Mark a phase for the supervisor (``detail``, ``board`` and ``minSeconds`` are reported)."""
+    if not supervised():
+        yield
+        return
+    _phases.append((name, fields))
+    _emit(name, fields)
+    try:
+        yield
+    finally:
+        _phases.pop()
+        outer, outer_fields = _phases[-1] if _phases else ("script", {})
+        # Leaving a phase restarts the outer one's clock; only the total deadline spans phases
+        _emit(outer, outer_fields)
+
+
+# Supervisor side -----------------------------------------------------------
+
+
+def watchdog_options(payload: object) -> tuple[float, dict[str, float]]:
+    options = payload.get("watchdog") if isinstance(payload, dict) else None
+    options = options if isinstance(options, dict) else {}
+    total = options.get("totalSeconds")
+    total = float(total) if isinstance(total, (int, float)) and not isinstance(total, bool) and total > 0 else DEFAULT_TOTAL_SECONDS
+    phases: dict[str, float] = dict(PHASE_DEADLINES)
+    overrides = options.get("phases")
+    if isinstance(overrides, dict):
+        for name, seconds in overrides.items():
+            if isinstance(seconds, (int, float)) and not isinstance(seconds, bool) and seconds > 0:
+                phases[str(name)] = float(seconds)
+    return total, phases
+
+
+def kill_group(pid: int) -> None:
+    """Terminate the process group led by ``pid`` (SIGTERM, then SIGKILL after a grace period)."""
+    if os.name == "nt":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True)
+        return
+    try:
+        os.killpg(pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        return
+    deadline = time.monotonic() + KILL_GRACE_SECONDS
+    while time.monotonic() < deadline:
+        try:
+            os.killpg(pid, 0)
+        except (ProcessLookupError, PermissionError):
+            return
+        time.sleep(0.1)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def reap_orphans(now: float | None = None) -> list[int]:
+    """Kill process groups registered by supervisors that are gone; returns the groups killed."""
+    if os.name == "nt":
+        return []
+    now = now or time.time()
+    reaped: list[int] = []
+    for entry_path in data_path("watchdog", "run.json").parent.glob("*.json"):
+        try:
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+            supervisor, group, started = int(entry["supervisor"]), int(entry["group"]), float(entry["startedAt"])
+        except (OSError, ValueError, KeyError, TypeError):
+            entry_path.unlink(missing_ok=True)
+            continue
+        age = now - started
+        if supervisor != os.getpid() and _pid_alive(supervisor) and age < ORPHAN_MAX_AGE_SECONDS:
+            continue
+        if age < ORPHAN_MAX_AGE_SECONDS and group != os.getpid():
+            try:
+                os.killpg(group, 0)
+            except (ProcessLookupError, PermissionError):
+                pass
+            else:
+                print(f"Reaping orphaned {entry.get('script', 'scraper')} process group {group}", file=sys.stderr)
+                kill_group(group)
+                reaped.append(group)
+        entry_path.unlink(missing_ok=True)
+    return reaped
+
+
+class Supervisor:
+    def __init__(self, script: str, args: list[str], stdin: bytes) -> None:
+        self.script = script
+        self.args = args
+        self.stdin = stdin
+        try:
+            payload = json.loads(stdin or b"{}")
+        except ValueError:
+            payload = {}
+        self.total, self.deadlines = watchdog_options(payload)
+        self.phase, self.phase_fields = "script", {}
+        self.phase_started = self.started = time.monotonic()
+        self.board = ""
+        self.stdout_at_line_start = True
+        self.lock = threading.Lock()
+        self.child: subprocess.Popen | None = None
+        self.entry_path = data_path("watchdog", f"{os.getpid()}.json")
+
+    def _read_stdout(self) -> None:
+        out = sys.stdout.buffer
+        for chunk in iter(lambda: self.child.stdout.read1(65536), b""):
+            out.write(chunk)
+            out.flush()
+            self.stdout_at_line_start = chunk.endswith(b"\n")
+
+    def _read_stderr(self) -> None:
+        for line in iter(self.child.stderr.readline, b""):
+            marker = None
+            if line.startswith(b'{"type": "phase"'):
+                try:
+                    marker = json.loads(line)
+                except ValueError:
+                    marker = None
+            if not isinstance(marker, dict):
+                sys.stderr.buffer.write(line)
+                sys.stderr.buffer.flush()
+                continue
+            with self.lock:
+                self.phase = str(marker.get("phase") or "script")
+                self.phase_fields = marker
+                self.phase_started = time.monotonic()
+                if isinstance(marker.get("board"), str):
+                    self.board = marker["board"]
+
+    def _write_stdin(self) -> None:
+        try:
+            self.child.stdin.write(self.stdin)
+            self.child.stdin.close()
+        except OSError:
+            pass
+
+    def expired(self) -> dict | None:
+        """The timeout report when a deadline has passed, else None."""
+        now = time.monotonic()
+        with self.lock:
+            deadline = self.deadlines.get(self.phase)
+            min_seconds = self.phase_fields.get("minSeconds")
+            if deadline is not None and isinstance(min_seconds, (int, float)):
+                deadline = max(deadline, float(min_seconds))
+            report = {
+                "phase": self.phase,
+                "detail": str(self.phase_fields.get("detail") or "")[:300] or None,
+                "elapsedSeconds": round(now - self.started, 1),
+                "phaseSeconds": round(now - self.phase_started, 1),
+            }
+        if deadline is not None and now - self.phase_started > deadline:
+            return {**report, "deadline": "phase", "deadlineSeconds": deadline}
+        if now - self.started > self.total:
+            return {**report, "deadline": "total", "deadlineSeconds": self.total}
+        return None
+
+    def _register(self) -> None:
+        try:
+            self.entry_path.write_text(json.dumps({
+                "supervisor": os.getpid(), "group": self.child.pid, "script": self.script, "startedAt": time.time(),
+            }), encoding="utf-8")
+        except OSError:
+            pass
+
+    def terminate(self, *_args) -> None:
+        """SIGTERM handler: take the script's process group down with the supervisor."""
+        if self.child is not None:
+            kill_group(self.child.pid)
+        self.entry_path.unlink(missing_ok=True)
+        raise SystemExit(143)
+
+    def run(self) -> int:
+        reap_orphans()
+        popen_kwargs: dict = {"start_new_session": True}
+        if os.name == "nt":
+            popen_kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        self.child = subprocess.Popen(
+            [sys.executable, str(SCRIPT_DIR / self.script), *self.args],
+            cwd=str(SCRIPT_DIR),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env={**os.environ, WATCHDOG_ENV: "1"},
+            **popen_kwargs,
+        )
+        self._register()
+        if os.name != "nt":
+            signal.signal(signal.SIGTERM, self.terminate)
+        readers = [threading.Thread(target=target, daemon=True) for target in (self._read_stdout, self._read_stderr)]
+        for thread in [threading.Thread(target=self._write_stdin, daemon=True), *readers]:
+            thread.start()
+
+        timeout = None
+        while self.child.poll() is None:
+            timeout = self.expired()
+            if timeout is not None:
+                break
+            time.sleep(POLL_SECONDS)
+        # Also sweeps browsers left behind by a script that crashed before closing them
+        kill_group(self.child.pid)
+        exit_code = self.child.wait()
+        for thread in readers:
+            thread.join(timeout=KILL_GRACE_SECONDS)
+        self.entry_path.unlink(missing_ok=True)
+
+        if timeout is None:
+            return exit_code
+        print(f"Watchdog: {timeout_message(self.script, timeout)}", file=sys.stderr)
+        if not self.stdout_at_line_start:
+            # The script was killed mid-line; keep the result on a line of its own
+            sys.stdout.write("\n")
+        write_result(self.timeout_result(timeout))
+        sys.stdout.flush()
+        return 0 if self.board else 1
+
+    def timeout_result(self, timeout: dict) -> dict:
+        error = timeout_message(self.script, timeout)
+        if not self.board:
+            return {
+                "success": False, "status": "timeout", "error": error, "screenshots": [],
+                "steps": [{"action": "watchdog", "status": "error", "message": error}], "watchdog": timeout,
+            }
+        from board_health import STATUS_TIMEOUT, CircuitBreaker, board_result
+
+        entry = CircuitBreaker().record(self.board, STATUS_TIMEOUT, error)
+        return board_result(
+            self.board, STATUS_TIMEOUT, error=error, watchdog=timeout,
+            circuit={
+                "state": "open" if entry["openUntil"] else "closed",
+                "failures": entry["failures"],
+                "retryAt": entry["openUntil"] or None,
+            },
+        )
+
+
+def timeout_message(script: str, timeout: dict) -> str:
+    detail = f" ({timeout['detail']})" if timeout.get("detail") else ""
+    if timeout["deadline"] == "total":
+        overrun = f"run exceeded {timeout['deadlineSeconds']:g}s during the {timeout['phase']} phase"
+    else:
+        overrun = f"{timeout['phase']} phase exceeded {timeout['deadlineSeconds']:g}s"
+    return f"{script} {overrun}{detail}; process group killed"
+
+
+def main() -> int:
+    if len(sys.argv) < 2 or not sys.argv[1].endswith(".py"):
+        print("Usage: run_watchdog.py <script.py> [args...]", file=sys.stderr)
+        return 2
+    script = Path(sys.argv[1]).name
+    if not (SCRIPT_DIR / script).is_file():
+        print(json.dumps({"success": False, "error": f"Unknown script: {script}"}))
+        return 2
+    return Supervisor(script, sys.argv[2:], sys.stdin.buffer.read()).run()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
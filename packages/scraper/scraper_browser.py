@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Shared RPA browser helpers for the board scrapers.
+
+Board runs use a scraper browser profile: headless by default, with images,
+media, fonts and third-party trackers blocked so pages become ready sooner and
+Chrome holds less memory. Blocking is installed over the DevTools port TagUI
+opens for its Chrome, before the first navigation. Boards whose listings are
+rendered by third-party scripts (e.g. Work With Indies/Jetboost) keep scripts
+enabled through their profile, and every option can be overridden per run via
+the ``browser`` object in the stdin payload. ``persistentProfile: true`` runs
+the CDP engine on a managed ``scraper`` profile (browser_profiles.py) whose
+HTTP cache, capped at ``cacheSizeMb``, survives between runs.
+"""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field, replace
+
+from browser_profiles import DEFAULT_CACHE_MB
+from cdp_client import DEFAULT_DEBUG_PORT, CdpError, CdpSession, page_websocket_url
+
+PAGE_TEXT_JS = "return document.body ? document.body.innerText.slice(0, 5000) : ''"
+
+# DevTools resource types (Network.ResourceType)
+RESOURCE_TYPES = {"Image", "Media", "Font", "Stylesheet", "Script", "XHR", "Fetch", "Other"}
+DEFAULT_BLOCKED_TYPES = ("Image", "Media", "Font")
+TRACKER_PATTERNS = (
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.*", "*facebook.net*",
+    "*connect.facebook.*", "*hotjar.com*", "*clarity.ms*", "*segment.io*",
+    "*cdn.segment.com*", "*mixpanel.com*", "*scorecardresearch.com*",
+    "*quantserve.com*", "*adnxs.com*", "*criteo.*", "*taboola.com*",
+    "*outbrain.com*", "*intercom.io*", "*hs-analytics.net*", "*hs-scripts.com*",
+    "*cookielaw.org*", "*onetrust.com*", "*fullstory.com*", "*newrelic.com*",
+    "*nr-data.net*", "*sentry.io*", "*tiktok.com/i18n/pixel*", "*bat.bing.com*",
+    "*linkedin.com/px*", "*snap.licdn.com*", "*twitter.com/i/adsct*",
+)
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    headless: bool = True
+    block_types: tuple[str, ...] = DEFAULT_BLOCKED_TYPES
+    block_patterns: tuple[str, ...] = TRACKER_PATTERNS
+    debug_port: int = DEFAULT_DEBUG_PORT
+    # ``auto``/``cdp``/``tagui`` (see browser_driver.py); empty defers to BAO_BROWSER_ENGINE, else TagUI
+    engine: str = ""
+    persistent: bool = False
+    cache_mb: int = DEFAULT_CACHE_MB
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.block_types or self.block_patterns)
+
+
+DEFAULT_PROFILE = BrowserProfile()
+
+
+def profile_from_payload(base: BrowserProfile, options: object) -> BrowserProfile:
+    """Apply the payload's ``browser`` overrides on top of a board profile."""
+    if not isinstance(options, dict):
+        return base
+    profile = base
+    if isinstance(options.get("headless"), bool):
+        profile = replace(profile, headless=options["headless"])
+    if isinstance(options.get("engine"), str):
+        profile = replace(profile, engine=options["engine"])
+    if isinstance(options.get("persistentProfile"), bool):
+        profile = replace(profile, persistent=options["persistentProfile"])
+    cache_mb = options.get("cacheSizeMb")
+    if isinstance(cache_mb, int) and not isinstance(cache_mb, bool) and cache_mb > 0:
+        profile = replace(profile, cache_mb=cache_mb)
+    if options.get("blockResources") is False:
+        return replace(profile, block_types=(), block_patterns=())
+    types = options.get("blockResourceTypes")
+    if isinstance(types, list):
+        wanted = {str(t).strip().lower() for t in types}
+        profile = replace(profile, block_types=tuple(t for t in sorted(RESOURCE_TYPES) if t.lower() in wanted))
+    patterns = options.get("blockPatterns")
+    if isinstance(patterns, list):
+        profile = replace(profile, block_patterns=tuple(str(p) for p in patterns if str(p).strip()))
+    extra = options.get("extraBlockPatterns")
+    if isinstance(extra, list):
+        profile = replace(profile, block_patterns=profile.block_patterns + tuple(str(p) for p in extra if str(p).strip()))
+    return profile
+
+
+@dataclass
+class ResourceBlocker:
+    """Keeps a DevTools session open for the run and fails matching requests."""
+
+    profile: BrowserProfile
+    session: CdpSession | None = None
+    blocked: int = 0
+    _types: set[str] = field(default_factory=set)
+
+    def install(self) -> bool:
+        try:
+            self.session = CdpSession(page_websocket_url(self.profile.debug_port), timeout=10)
+            if self.profile.block_patterns:
+                self.session.send("Network.enable")
+                self.session.send("Network.setBlockedURLs", {"urls": list(self.profile.block_patterns)})
+            if self.profile.block_types:
+                self._types = set(self.profile.block_types)
+                self.session.on("Fetch.requestPaused", self._on_paused)
+                self.session.send(
+                    "Fetch.enable",
+                    {"patterns": [{"resourceType": t, "requestStage": "Request"} for t in self.profile.block_types]},
+                )
+            return True
+        except (CdpError, OSError, ValueError) as exc:
+            print(f"Resource blocking unavailable: {exc}", file=sys.stderr)
+            self.close()
+            return False
+
+    def _on_paused(self, params: dict) -> None:
+        request_id = params.get("requestId")
+        if not request_id or self.session is None:
+            return
+        if params.get("resourceType") in self._types:
+            self.blocked += 1
+            self.session.send_async("Fetch.failRequest", {"requestId": request_id, "errorReason": "BlockedByClient"})
+        else:
+            self.session.send_async("Fetch.continueRequest", {"requestId": request_id})
+
+    def close(self) -> None:
+        if self.session is not None:
+            try:
+                self.session.close()
+            except Exception:
+                pass
+            self.session = None
+
+
+_blockers: dict[int, ResourceBlocker] = {}
+
+
+def init_browser(browser, profile: BrowserProfile = DEFAULT_PROFILE) -> None:
+    """Start the RPA browser with the scraper profile and install resource blocking."""
+    browser.init(
+        turbo_mode=True,
+        headless_mode=profile.headless,
+        engine=profile.engine or None,
+        profile="scraper" if profile.persistent else None,
+        cache_mb=profile.cache_mb,
+    )
+    if profile.blocks_anything and not getattr(browser, "offline", False):
+        # The CDP engine runs its own Chrome on a private DevTools port
+        port = getattr(browser, "debug_port", None)
+        blocker = ResourceBlocker(replace(profile, debug_port=port) if port else profile)
+        if blocker.install():
+            _blockers[id(browser)] = blocker
+
+
+def page_text(browser) -> str:
+    """Return (a bounded prefix of) the visible page text, or '' if unavailable."""
+    try:
+        text = browser.dom(PAGE_TEXT_JS)
+    except Exception:
+        return ""
+    return text if isinstance(text, str) else ""
+
+
+def close_browser(browser) -> None:
+    blocker = _blockers.pop(id(browser), None)
+    if blocker is not None:
+        blocker.close()
+    try:
+        browser.close()
+    except Exception:
+        pass
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Stdin payload handling shared by the board scrapers.
+The payload is read once per process and memoized, so any helper can look up
+its own options without re-reading stdin. A multi-board run swaps in each
+board's payload with :func:`using_payload`. A payload ``archive`` is opened
+as soon as the payload is read, so the scratch data directory it swaps in is
+in place before any breaker, cache or store opens its file.
+"""
+from __future__ import annotations
+
+import json
+import sys
+from contextlib import contextmanager
+from typing import Iterator
+
+_payload: dict | None = None
+
+
+def read_payload() -> dict:
+    """Return the JSON object sent on stdin ({} when absent or invalid)."""
+    global _payload
+    if _payload is None:
+        try:
+            parsed = json.loads(sys.stdin.read() or "{}")
+        except Exception:
+            parsed = {}
+        _payload = parsed if isinstance(parsed, dict) else {}
+        if "archive" in _payload:
+            from page_archive import current_archive
+
+            current_archive()
+    return _payload
+
+
+@contextmanager
+def using_payload(payload: dict) -> Iterator[dict]:
+    """Serve ``payload`` from :func:`read_payload` inside the block."""
+    global _payload
+    outer = read_payload()
+    _payload = payload
+    try:
+        yield payload
+    finally:
+        _payload = outer
+
+
+def source_url_from(payload: dict, default: str) -> str:
+    source_url = payload.get("sourceUrl")
+    if isinstance(source_url, str) and source_url.strip():
+        return source_url.strip()
+    return default
+
+
+def write_result(result: dict) -> None:
+    """Print a board envelope as compact JSON (the server parses it; nobody reads it indented)."""
+    sys.stdout.write(json.dumps(result, separators=(",", ":"), ensure_ascii=False) + "\n")
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Filesystem locations for scraper state (caches, stores, profiles).
+Everything lives under ``BAO_SCRAPER_DATA_DIR`` (default ``~/.bao/scraper``),
+next to the server's default ``~/.bao/bao.db``.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+DEFAULT_DATA_DIR = "~/.bao/scraper"
+
+
+def data_dir() -> Path:
+    """Return the scraper data directory, creating it on first use."""
+    raw = os.environ.get("BAO_SCRAPER_DATA_DIR", "").strip() or DEFAULT_DATA_DIR
+    path = Path(raw).expanduser().resolve()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def data_path(*parts: str) -> Path:
+    """Return a path inside the data directory, creating its parent directory."""
+    path = data_dir().joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Incremental harvesting for JS-rendered boards with infinite scroll or "load more".
+
+Each step extracts only listing nodes that were appended since the previous
+step (nodes are tagged in the page once read, and item URLs are tracked in a
+page-side seen set), then clicks a "load more" control or scrolls to the
+bottom. Harvesting stops when a step yields no new items, when the limit is
+reached, when every new item is already known to the caller, or when the
+listing reaches items the caller marks as stale (older than a watermark).
+"""
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Callable
+
+DEFAULT_MAX_STEPS = 40
+DEFAULT_STEP_WAIT = 1.5
+# Empty steps tolerated after a scroll before concluding the listing is exhausted
+DEFAULT_IDLE_STEPS = 2
+DEFAULT_LOAD_MORE_TEXT = ("load more", "show more", "more jobs", "view more", "see more")
+
+_STEP_JS = """
+return (function() {
+    var seen = window.__baoHarvestSeen || (window.__baoHarvestSeen = {});
+    var extract = %(extract)s;
+    var nodes = document.querySelectorAll(%(selector)s);
+    var fresh = [];
+    for (var i = 0; i < nodes.length; i++) {
+        var node = nodes[i];
+        if (node.__baoHarvested) continue;
+        node.__baoHarvested = true;
+        var item = null;
+        try { item = extract(node); } catch (e) { item = null; }
+        if (!item || !item.title) continue;
+        var key = item.url || item.title;
+        if (seen[key]) continue;
+        seen[key] = true;
+        fresh.push(item);
+    }
+    return JSON.stringify(fresh);
+})()
+"""
+
+_ADVANCE_JS = """
+return (function() {
+    var labels = %(labels)s;
+    var controls = document.querySelectorAll(%(selector)s);
+    for (var i = 0; i < controls.length; i++) {
+        var el = controls[i];
+        var text = (el.textContent || el.value || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+        var visible = el.offsetParent !== null && !el.disabled;
+        if (!visible) continue;
+        for (var j = 0; j < labels.length; j++) {
+            if (text.indexOf(labels[j]) !== -1) { el.click(); return 'clicked'; }
+        }
+    }
+    window.scrollTo(0, document.documentElement.scrollHeight);
+    return 'scrolled';
+})()
+"""
+
+
+@dataclass
+class HarvestResult:
+    items: list[dict] = field(default_factory=list)
+    steps: int = 0
+    stop_reason: str = ""
+
+
+def _parse_items(raw: object) -> list[dict]:
+    if not raw or not isinstance(raw, str):
+        return []
+    try:
+        parsed = json.loads(raw)
+    except json.JSONDecodeError:
+        return []
+    return [item for item in parsed if isinstance(item, dict)] if isinstance(parsed, list) else []
+
+
+def harvest(
+    browser,
+    item_selector: str,
+    extract_js: str,
+    limit: int,
+    known_urls: set[str] | frozenset[str] = frozenset(),
+    load_more_selector: str = "button, a[role='button'], a[class*='more'], [class*='load-more']",
+    load_more_text: tuple[str, ...] = DEFAULT_LOAD_MORE_TEXT,
+    max_steps: int = DEFAULT_MAX_STEPS,
+    step_wait: float = DEFAULT_STEP_WAIT,
+    idle_steps: int = DEFAULT_IDLE_STEPS,
+    is_stale: Callable[[dict], bool] | None = None,
+) -> HarvestResult:
+    """
+    Harvest listing items from the current page.
+
+    ``extract_js`` is a JavaScript function expression taking one listing node
+    and returning ``{title, url, ...}`` or null. Listings are assumed newest
+    first; stale items are dropped and a step ending in one ends the harvest.
+    """
+    step_js = _STEP_JS % {"extract": extract_js, "selector": json.dumps(item_selector)}
+    advance_js = _ADVANCE_JS % {
+        "labels": json.dumps([label.lower() for label in load_more_text]),
+        "selector": json.dumps(load_more_selector),
+    }
+    result = HarvestResult()
+    idle = 0
+    while result.steps < max_steps:
+        result.steps += 1
+        fresh = _parse_items(browser.dom(step_js))
+        if not fresh:
+            idle += 1
+            if result.steps == 1 or idle >= idle_steps:
+                result.stop_reason = "no_new_items"
+                break
+            browser.dom(advance_js)
+            browser.wait(step_wait)
+            continue
+        idle = 0
+        reached_since = False
+        if is_stale is not None:
+            stale = [is_stale(item) for item in fresh]
+            # A stale tail means the listing has scrolled past the watermark; a stale
+            # item further up is usually a pinned/featured listing
+            reached_since = stale[-1]
+            fresh = [item for item, old in zip(fresh, stale) if not old]
+        unknown = [item for item in fresh if item.get("url") not in known_urls]
+        result.items.extend(unknown[: max(limit - len(result.items), 0)])
+        if len(result.items) >= limit:
+            result.stop_reason = "limit"
+            break
+        if reached_since:
+            result.stop_reason = "reached_since"
+            break
+        if not unknown:
+            result.stop_reason = "all_known"
+            break
+        browser.dom(advance_js)
+        browser.wait(step_wait)
+    else:
+        result.stop_reason = "max_steps"
+    print(
+        f"Harvested {len(result.items)} items in {result.steps} steps ({result.stop_reason})",
+        file=sys.stderr,
+    )
+    return result
+
+
+def known_urls_from(payload: dict) -> set[str]:
+    """URLs the caller already has (``knownUrls`` in the stdin payload)."""
+    urls = payload.get("knownUrls")
+    if not isinstance(urls, list):
+        return set()
+    return {url.strip() for url in urls if isinstance(url, str) and url.strip()}
@@ -0,0 +1,16 @@
+"""Put the flat scraper modules on the import path and keep scraper state out of ~/.bao."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(autouse=True)
+def scraper_data_dir(tmp_path, monkeypatch):
+    data_dir = tmp_path / "scraper-data"
+    monkeypatch.setenv("BAO_SCRAPER_DATA_DIR", str(data_dir))
+    return data_dir
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+import board_engine
+from board_engine import SharedBrowser, run_boards
+from board_health import STATUS_ERROR, STATUS_OK
+from board_registry import BoardSpec, Extractor
+from scraper_browser import BrowserProfile
+
+QUIET = BrowserProfile(block_types=(), block_patterns=())
+LISTINGS = {
+    "https://alpha.example.com/jobs": [
+        {"title": "Senior Gameplay Programmer", "company": "Alpha", "location": "Remote", "url": "/jobs/1"},
+        {"title": "Senior Gameplay Programmer", "company": "Alpha", "location": "Remote", "url": "/jobs/1"},
+        {"title": "Technical Artist", "company": "Alpha", "location": "London, UK", "url": "/jobs/2"},
+    ],
+    "https://beta.example.com/careers": [
+        {"title": "QA Tester", "company": "Beta", "description": "On-site in Montreal, Canada", "url": "/careers/7"},
+    ],
+}
+
+
+class FakeBrowser:
+    """Answers the engine's in-page scripts from ``LISTINGS`` for the loaded URL."""
+
+    def __init__(self) -> None:
+        self.loaded: list[str] = []
+        self.inits = 0
+        self.closes = 0
+        self.current = ""
+
+    def init(self, **kwargs):
+        self.inits += 1
+        return True
+
+    def close(self):
+        self.closes += 1
+
+    def url(self, url=None):
+        if url is not None:
+            self.current = url
+            self.loaded.append(url)
+        return self.current
+
+    def wait(self, seconds):
+        pass
+
+    def dom(self, script):
+        items = LISTINGS.get(self.current, [])
+        if "var extract =" in script:
+            return json.dumps(items)
+        if script.startswith("return document.querySelectorAll("):
+            return str(len(items))
+        if "0x811c9dc5" in script:
+            return f"{len(items)}:1:ab"
+        return ""
+
+
+class FakeScheduler:
+    def navigate(self, browser, url):
+        browser.url(url)
+
+
+def spec(board_id: str, url: str, **fields) -> BoardSpec:
+    return BoardSpec(
+        board_id=board_id, script=f"job_scraper_{board_id}.py", default_url=url, source=board_id,
+        hash_prefix=f"{board_id[:2]}_", default_limit=50,
+        extractors=(Extractor("a.job", "function(node) { return null; }"),),
+        wait_seconds=1, browser_profile=QUIET, **fields,
+    )
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    browser = FakeBrowser()
+    monkeypatch.setattr(board_engine, "_shared", SharedBrowser(browser))
+    monkeypatch.setattr(board_engine, "get_scheduler", lambda: FakeScheduler())
+    monkeypatch.setattr(board_engine, "BOARDS", {
+        "alpha": spec("alpha", "https://alpha.example.com/jobs"),
+        "beta": spec("beta", "https://beta.example.com/careers", location_from="description", default_location=""),
+    })
+    return browser
+
+
+def test_specs_drive_extraction_and_normalization(engine):
+    alpha, beta = run_boards({"boards": ["alpha", "beta"], "feed": False, "cache": False})
+    assert alpha["status"] == beta["status"] == STATUS_OK
+    assert [job["url"] for job in alpha["jobs"]] == ["https://alpha.example.com/jobs/1", "https://alpha.example.com/jobs/2"]
+    assert all(job["contentHash"].startswith("al_") for job in alpha["jobs"])
+    assert alpha["jobs"][1]["location"] == "London, UK"
+    assert beta["jobs"][0]["url"] == "https://beta.example.com/careers/7"
+    assert "Montreal" in beta["jobs"][0]["location"]
+
+
+def test_boards_share_one_browser_and_report_unknown_ids(engine):
+    results = list(run_boards({"boards": ["alpha", "nope", {"board": "beta", "limit": 1}], "feed": False, "cache": False}))
+    assert [(result["board"], result["status"]) for result in results] == [
+        ("alpha", STATUS_OK), ("nope", STATUS_ERROR), ("beta", STATUS_OK),
+    ]
+    assert engine.loaded == ["https://alpha.example.com/jobs", "https://beta.example.com/careers"]
+    assert (engine.inits, engine.closes) == (1, 1)
+
+
+def test_per_board_overrides_do_not_leak(engine):
+    alpha, beta = run_boards({"boards": [{"board": "alpha", "limit": 1}, "beta"], "feed": False, "cache": False})
+    assert len(alpha["jobs"]) == 1 and alpha["nextCursor"]
+    assert len(beta["jobs"]) == 1 and beta["nextCursor"] is None
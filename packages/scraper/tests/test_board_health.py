@@ -0,0 +1,63 @@
+import multiprocessing
+
+from board_health import (
+    FAILURE_THRESHOLD,
+    STATUS_EMPTY,
+    STATUS_MARKUP_CHANGED,
+    STATUS_OK,
+    STATUS_TIMEOUT,
+    CircuitBreaker,
+    classify_empty_page,
+)
+
+
+def test_breaker_trips_after_threshold_and_resets_on_success(tmp_path):
+    breaker = CircuitBreaker(str(tmp_path / "breakers.db"))
+    for _ in range(FAILURE_THRESHOLD):
+        entry = breaker.record("grackle", STATUS_TIMEOUT, "slow", now=1000)
+    assert entry["openUntil"] > 1000
+    assert breaker.check("grackle", now=1001) == "open"
+    assert breaker.check("grackle", now=entry["openUntil"] + 1) == "half_open"
+    breaker.record("grackle", STATUS_OK, now=2000)
+    assert breaker.check("grackle", now=2001) == "closed"
+
+
+def test_breakers_opened_by_separate_instances_merge(tmp_path):
+    path = str(tmp_path / "breakers.db")
+    first = CircuitBreaker(path)
+    second = CircuitBreaker(path)
+    for _ in range(FAILURE_THRESHOLD):
+        first.record("grackle", STATUS_TIMEOUT, "slow")
+    second.record("pocketgamer", STATUS_OK)
+
+    reloaded = CircuitBreaker(path)
+    assert reloaded.entry("grackle")["failures"] == FAILURE_THRESHOLD
+    assert reloaded.check("grackle") == "open"
+    assert reloaded.entry("pocketgamer")["lastStatus"] == STATUS_OK
+
+
+def _record_failures(path: str, board: str, count: int) -> None:
+    breaker = CircuitBreaker(path)
+    for _ in range(count):
+        breaker.record(board, STATUS_TIMEOUT, "slow")
+
+
+def test_concurrent_processes_keep_every_failure(tmp_path):
+    path = str(tmp_path / "breakers.db")
+    CircuitBreaker(path).close()
+    workers = [
+        multiprocessing.Process(target=_record_failures, args=(path, board, 5))
+        for board in ("grackle", "grackle", "gamedev-net")
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+    breaker = CircuitBreaker(path)
+    assert breaker.entry("grackle")["failures"] == 10
+    assert breaker.entry("gamedev-net")["failures"] == 5
+
+
+def test_classify_empty_page():
+    assert classify_empty_page("Sorry, no jobs match your search") == STATUS_EMPTY
+    assert classify_empty_page("Welcome to our site") == STATUS_MARKUP_CHANGED
@@ -0,0 +1,94 @@
+import pytest
+
+import browser_driver
+import cdp_client
+from browser_driver import BrowserDriver, engine_from
+from cdp_client import CdpError, page_websocket_url
+
+
+class FakeTagui:
+    def __init__(self) -> None:
+        self.started = False
+
+    def init(self, turbo_mode=True, headless_mode=True, **kwargs):
+        self.started = True
+        return True
+
+
+class FakeCdpBrowser:
+    launches: list[str] = []
+    fails = False
+
+    def __init__(self, chrome_path, headless=True, lease=None) -> None:
+        self.chrome_path = chrome_path
+
+    def start(self) -> None:
+        FakeCdpBrowser.launches.append(self.chrome_path)
+        if FakeCdpBrowser.fails:
+            raise CdpError("Chrome exited during startup (1)")
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def chrome(monkeypatch):
+    """A Chrome binary is installed; launching it is recorded instead of run."""
+    monkeypatch.delenv("BAO_BROWSER_ENGINE", raising=False)
+    monkeypatch.setattr(browser_driver, "find_chrome", lambda preferred="chrome": "/usr/bin/google-chrome")
+    monkeypatch.setattr(browser_driver, "CdpBrowser", FakeCdpBrowser)
+    monkeypatch.setattr(FakeCdpBrowser, "launches", [])
+    monkeypatch.setattr(FakeCdpBrowser, "fails", False)
+
+
+def test_tagui_is_the_default_engine(monkeypatch):
+    monkeypatch.delenv("BAO_BROWSER_ENGINE", raising=False)
+    assert engine_from(None) == "tagui"
+    assert engine_from("warp") == "tagui"
+    monkeypatch.setenv("BAO_BROWSER_ENGINE", "CDP")
+    assert engine_from(None) == "cdp"
+    assert engine_from(" tagui ") == "tagui"
+
+
+def test_chrome_being_installed_does_not_move_runs_to_cdp(chrome):
+    tagui = FakeTagui()
+    driver = BrowserDriver(tagui)
+    assert driver.init(headless_mode=True)
+    assert driver.engine == "tagui" and tagui.started
+    assert FakeCdpBrowser.launches == []
+
+
+def test_cdp_is_opt_in_by_payload_or_environment(chrome, monkeypatch):
+    driver = BrowserDriver(FakeTagui())
+    driver.init(engine="cdp")
+    assert driver.engine == "cdp"
+    monkeypatch.setenv("BAO_BROWSER_ENGINE", "auto")
+    driver = BrowserDriver(FakeTagui())
+    driver.init()
+    assert driver.engine == "cdp"
+    assert len(FakeCdpBrowser.launches) == 2
+
+
+def test_tagui_is_the_fallback_when_chrome_cannot_start(chrome, monkeypatch):
+    FakeCdpBrowser.fails = True
+    tagui = FakeTagui()
+    driver = BrowserDriver(tagui)
+    driver.init(engine="cdp")
+    assert driver.engine == "tagui" and tagui.started
+    monkeypatch.setattr(browser_driver, "find_chrome", lambda preferred="chrome": None)
+    with pytest.raises(RuntimeError, match="No Chrome"):
+        BrowserDriver(None).init(engine="cdp")
+    with pytest.raises(RuntimeError, match="RPA not installed"):
+        BrowserDriver(None).init()
+
+
+def test_page_websocket_url_skips_non_page_targets(monkeypatch):
+    targets = [
+        {"type": "service_worker", "webSocketDebuggerUrl": "ws://127.0.0.1:9222/devtools/worker/1"},
+        {"type": "page", "webSocketDebuggerUrl": "ws://127.0.0.1:9222/devtools/page/2"},
+    ]
+    monkeypatch.setattr(cdp_client, "list_targets", lambda port, host: targets)
+    assert page_websocket_url(9222) == "ws://127.0.0.1:9222/devtools/page/2"
+    monkeypatch.setattr(cdp_client, "list_targets", lambda port, host: targets[:1])
+    with pytest.raises(CdpError):
+        page_websocket_url(9222)
@@ -0,0 +1,57 @@
+import json
+import os
+import time
+
+from browser_profiles import CACHE_DIRS, MAX_SLOTS, META_FILE, STALE_PROFILE_DAYS, cleanup_profiles, lease_profile
+
+DAY = 86400
+NOW = time.time()
+
+
+def test_slots_are_exclusive_until_released():
+    leases = [lease_profile("scraper", now=NOW) for _ in range(MAX_SLOTS)]
+    assert len({lease.path for lease in leases}) == MAX_SLOTS
+    assert lease_profile("scraper", now=NOW) is None
+    assert lease_profile("apply", now=NOW) is not None  # Purposes have their own slots
+    leases[1].release()
+    again = lease_profile("scraper", now=NOW)
+    assert again.path == leases[1].path
+    assert json.loads((again.path / META_FILE).read_text())["runs"] == 1
+
+
+def test_caches_are_cleared_when_a_slot_outgrows_the_cap():
+    lease = lease_profile("scraper", cache_mb=1, now=NOW)
+    cache = lease.path / "Default" / CACHE_DIRS[0]
+    cache.mkdir(parents=True)
+    with open(cache / "data_1", "wb") as handle:
+        handle.truncate(300 * 1024 * 1024)  # Sparse: counted by size, not written
+    (lease.path / "Default" / "Cookies").write_text("consent=yes")
+    lease.release()
+    lease = lease_profile("scraper", cache_mb=1, now=NOW)
+    assert not cache.exists()
+    assert (lease.path / "Default" / "Cookies").read_text() == "consent=yes"
+
+
+def test_slots_within_the_cap_keep_their_cache():
+    lease = lease_profile("scraper", cache_mb=256, now=NOW)
+    cache = lease.path / CACHE_DIRS[0]
+    cache.mkdir()
+    (cache / "data_1").write_bytes(b"x" * 1024)
+    lease.release()
+    lease_profile("scraper", cache_mb=256, now=NOW)
+    assert (cache / "data_1").exists()
+
+
+def test_leasing_removes_idle_stale_slots():
+    first, second = lease_profile("scraper", now=NOW), lease_profile("scraper", now=NOW)
+    second.release()
+    meta_path = second.path / META_FILE
+    meta = json.loads(meta_path.read_text())
+    meta["lastUsedAt"] = NOW - (STALE_PROFILE_DAYS + 1) * DAY
+    meta_path.write_text(json.dumps(meta))
+    first.release()
+    lease = lease_profile("scraper", now=NOW)
+    assert lease.path == first.path
+    assert not second.path.exists()
+    assert cleanup_profiles("scraper", now=NOW) == []  # The leased slot is locked, not stale
+    assert os.path.isdir(lease.path)
@@ -0,0 +1,123 @@
+import threading
+import time
+
+import job_scraper_gamesjobsdirect
+from board_registry import BOARDS
+from http_client import HttpResponse
+from job_scraper_gamesjobsdirect import (
+    ShardCrawl, crawl_shard, http_pages, listing_url, parse_listing, scrape_jobs, shard_positions, shards_from,
+    with_query,
+)
+from pagination import PageRequest
+from scraper_io import using_payload
+
+LISTING_HTML = """
+<html><body><ul>
+  <li><a href="/job/123-senior-artist">Senior Artist</a> <time datetime="2026-03-01">1 Mar</time>
+      London, UK - at Rocksteady Studios</li>
+  <li><a href="/job/124-producer">Producer</a> Remote - for Team17</li>
+  <li><a href="/job/124-producer">View &amp; apply</a></li>
+  <li><a href="/about">About us</a></li>
+</ul>
+<div class="listing"><ul><li><a href="/job/125-qa">QA Tester</a> Guildford</li></ul></div>
+<script>var html = '<li><a href="/job/999">Injected</a></li>';</script>
+</body></html>
+"""
+
+
+def test_parse_listing_reads_job_blocks_once():
+    items = parse_listing(LISTING_HTML, "https://www.gamesjobsdirect.com/results")
+    assert [item["title"] for item in items] == ["Senior Artist", "Producer", "QA Tester"]
+    first = items[0]
+    assert first["url"] == "https://www.gamesjobsdirect.com/job/123-senior-artist"
+    assert first["company"] == "Rocksteady Studios"
+    assert first["postedText"] == "2026-03-01"
+    assert "London" in first["locationText"]
+
+
+def test_shards_and_cursor_positions():
+    shards = shards_from({"shards": [{"region": "usa"}, {"region": "usa"}, {"region": "uk", "page": 3}]})
+    assert shards == [{"region": "usa"}, {"region": "uk"}]
+    assert shards_from({}) == [{}]
+    assert shard_positions(None, shards) == {"region=usa": (1, 0), "region=uk": (1, 0)}
+
+
+SOURCE = "https://www.gamesjobsdirect.com/results"
+
+
+def listing_page(*job_ids: int) -> bytes:
+    rows = "".join(f'<li><a href="/job/{job_id}">Job number {job_id}</a> London</li>' for job_id in job_ids)
+    return f"<html><body><ul>{rows}</ul></body></html>".encode()
+
+
+class StubScheduler:
+    """Serves listing pages by number and records how many requests were in flight at once."""
+
+    def __init__(self, pages: dict[int, bytes], urls: dict[str, bytes] | None = None) -> None:
+        self.pages = {listing_url(SOURCE, page): body for page, body in pages.items()}
+        self.pages.update(urls or {})
+        self.fetched: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def fetch(self, url, **kwargs):
+        with self.lock:
+            self.fetched.append(url)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        body = self.pages.get(url)
+        return HttpResponse(url=url, status=200 if body is not None else 404, final_url=url, body=body or b"")
+
+
+def crawl(monkeypatch, pages: dict[int, bytes], limit: int | None, page: int = 1, offset: int = 0, fan_out: int = 3):
+    scheduler = StubScheduler(pages)
+    monkeypatch.setattr(job_scraper_gamesjobsdirect, "get_scheduler", lambda: scheduler)
+    request = PageRequest("gamesjobsdirect", limit, max_pages=10, page=page, offset=offset)
+    first_items = parse_listing(pages[page].decode(), SOURCE)
+    result = crawl_shard(ShardCrawl({}), http_pages(SOURCE, page, page + 9, fan_out, first_items), request, page, offset)
+    return result, scheduler
+
+
+def test_pages_fan_out_concurrently_and_stop_at_the_first_empty_page(monkeypatch):
+    pages = {1: listing_page(1, 2), 2: listing_page(3), 3: listing_page(4), 4: listing_page(), 5: listing_page(5)}
+    result, scheduler = crawl(monkeypatch, pages, limit=None)
+    assert [item["url"].rsplit("/", 1)[1] for item in result.items] == ["1", "2", "3", "4"]
+    assert scheduler.peak == 3
+    assert listing_url(SOURCE, 5) not in scheduler.fetched  # The wave ending in the empty page was the last
+    assert result.resume is None
+
+
+def test_jobs_pushed_down_a_page_are_returned_once(monkeypatch):
+    result, _ = crawl(monkeypatch, {1: listing_page(1, 2), 2: listing_page(2, 3), 3: listing_page()}, limit=None)
+    assert [item["url"].rsplit("/", 1)[1] for item in result.items] == ["1", "2", "3"]
+
+
+def test_a_full_window_resumes_where_it_stopped(monkeypatch):
+    pages = {1: listing_page(1, 2), 2: listing_page(3, 4), 3: listing_page(5), 4: listing_page()}
+    first, _ = crawl(monkeypatch, pages, limit=3)
+    assert [item["url"].rsplit("/", 1)[1] for item in first.items] == ["1", "2", "3"]
+    assert first.resume == (2, 1)
+    rest, scheduler = crawl(monkeypatch, pages, limit=3, page=first.resume[0], offset=first.resume[1])
+    assert [item["url"].rsplit("/", 1)[1] for item in rest.items] == ["4", "5"]
+    assert listing_url(SOURCE, 1) not in scheduler.fetched
+
+
+def test_limit_applies_after_the_shard_merge(monkeypatch):
+    usa, uk = with_query(SOURCE, {"region": "usa"}), with_query(SOURCE, {"region": "uk"})
+    scheduler = StubScheduler({}, {
+        usa: listing_page(1, 2), listing_url(usa, 2): listing_page(),
+        uk: listing_page(2, 3, 4), listing_url(uk, 2): listing_page(),
+    })
+    monkeypatch.setattr(job_scraper_gamesjobsdirect, "get_scheduler", lambda: scheduler)
+    payload = {"shards": [{"region": "usa"}, {"region": "uk"}], "limit": 3, "maxPages": 2}
+    with using_payload(payload):
+        jobs, _, cursor = scrape_jobs(BOARDS["gamesjobsdirect"], SOURCE)
+    assert [job.url.rsplit("/", 1)[1] for job in jobs] == ["1", "2", "3"]
+    assert shard_positions(cursor, shards_from(payload)) == {"region=usa": None, "region=uk": (1, 2)}
+    with using_payload({**payload, "cursor": cursor}):
+        jobs, _, cursor = scrape_jobs(BOARDS["gamesjobsdirect"], SOURCE)
+    assert [job.url.rsplit("/", 1)[1] for job in jobs] == ["4"] and cursor is None
@@ -0,0 +1,89 @@
+import json
+import time
+
+import pytest
+
+import host_scheduler
+from host_scheduler import HostScheduler, RobotsCache, RobotsDisallowed, TokenBucket, parse_retry_after
+from http_client import HttpResponse
+
+URL = "https://jobs.example.com/listing"
+
+
+def scheduler_with_robots(tmp_path, body: str, **options) -> HostScheduler:
+    path = tmp_path / "robots.json"
+    path.write_text(json.dumps({"jobs.example.com": {"fetchedAt": time.time(), "body": body}}))
+    scheduler = HostScheduler(**options)
+    scheduler.robots = RobotsCache(str(path))
+    return scheduler
+
+
+def test_token_bucket_allows_a_burst_then_paces():
+    bucket = TokenBucket(rate=20, capacity=2)
+    started = time.monotonic()
+    bucket.acquire()
+    bucket.acquire()
+    assert time.monotonic() - started < 0.03
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.04
+
+
+def test_token_bucket_pause_holds_callers():
+    bucket = TokenBucket(rate=100, capacity=5)
+    bucket.pause(0.1)
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_retry_after_seconds_and_dates():
+    assert parse_retry_after("5") == 5
+    assert parse_retry_after("9999") == host_scheduler.MAX_RETRY_AFTER_SECONDS
+    assert parse_retry_after("Sun, 01 Mar 2026 09:30:30 GMT", now=1772357400) == 30
+    assert parse_retry_after("soon") == 0
+    assert parse_retry_after("") == 0
+
+
+def test_robots_crawl_delay_lowers_the_host_rate(tmp_path):
+    scheduler = scheduler_with_robots(tmp_path, "User-agent: *\nCrawl-delay: 4\n", requests_per_second=2, burst=3)
+    bucket = scheduler._bucket(URL)
+    assert bucket.rate == 0.25 and bucket.capacity == 1
+    assert scheduler._bucket(URL) is bucket
+
+
+def test_robots_disallow_blocks_fetches_and_navigations(tmp_path, monkeypatch):
+    scheduler = scheduler_with_robots(tmp_path, "User-agent: *\nDisallow: /listing\n")
+    monkeypatch.setattr(host_scheduler, "fetch", lambda url, **kwargs: pytest.fail("fetched a disallowed URL"))
+
+    class Browser:
+        def url(self, url):
+            pytest.fail("navigated to a disallowed URL")
+
+    assert scheduler.fetch(URL).error == "Disallowed by robots.txt"
+    with pytest.raises(RobotsDisallowed):
+        scheduler.navigate(Browser(), URL)
+
+
+def test_retry_after_pauses_the_host_before_one_retry(tmp_path, monkeypatch):
+    scheduler = scheduler_with_robots(tmp_path, "", max_retries=1)
+    responses = [
+        HttpResponse(url=URL, status=429, headers={"retry-after": "7"}),
+        HttpResponse(url=URL, status=200),
+    ]
+    monkeypatch.setattr(host_scheduler, "fetch", lambda url, **kwargs: responses.pop(0))
+    pauses: list[float] = []
+    monkeypatch.setattr(scheduler, "backoff", lambda url, seconds: pauses.append(seconds))
+    assert scheduler.fetch(URL).status == 200
+    assert pauses == [7]
+
+
+def test_navigations_take_a_host_slot(tmp_path):
+    scheduler = scheduler_with_robots(tmp_path, "")
+    loaded: list[str] = []
+
+    class Browser:
+        def url(self, url):
+            loaded.append(url)
+
+    scheduler.navigate(Browser(), URL)
+    assert loaded == [URL]
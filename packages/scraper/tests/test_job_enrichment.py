@@ -0,0 +1,22 @@
+from job_enrichment import extract_detail
+
+JSON_LD_PAGE = """
+<html><head><script type="application/ld+json">
+{"@type": "JobPosting", "title": "Gameplay Programmer", "datePosted": "2026-02-03T10:00:00+01:00",
+ "description": "<p>Build combat systems in Unreal Engine for our next title.</p>", "employmentType": "FULL_TIME"}
+</script></head><body><main>Gameplay Programmer</main></body></html>
+"""
+META_PAGE = """
+<html><head><meta property="article:published_time" content="Tue, 03 Feb 2026 10:00:00 GMT"></head>
+<body><main>Level designer wanted for a cosy farming game.</main></body></html>
+"""
+
+
+def test_json_ld_posted_date_is_normalized():
+    detail = extract_detail(JSON_LD_PAGE)
+    assert detail["postedDate"] == "2026-02-03T09:00:00Z"
+    assert "combat systems" in detail["description"]
+
+
+def test_meta_posted_date_is_normalized():
+    assert extract_detail(META_PAGE)["postedDate"] == "2026-02-03T10:00:00Z"
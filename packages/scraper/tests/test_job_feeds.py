@@ -0,0 +1,97 @@
+from contextlib import contextmanager
+
+import job_feeds
+from http_client import HttpResponse
+from job_feeds import (
+    FeedCache, discover_feed, in_listing_scope, looks_like_job_feed, parse_feed, scrape_feed, well_known_feeds,
+)
+from pagination import encode_cursor, page_request_from
+from scraper_io import using_payload
+
+LISTING = "https://www.example.com/jobs"
+JOBS_RSS = b"""<?xml version="1.0"?><rss><channel>
+<item><title>Senior Gameplay Programmer</title><link>https://www.example.com/jobs/1</link></item>
+<item><title>Lead Artist (Remote)</title><link>https://www.example.com/jobs/2</link></item>
+</channel></rss>"""
+NEWS_RSS = b"""<?xml version="1.0"?><rss><channel>
+<item><title>Studio ships its biggest update yet</title><link>https://www.example.com/news/1</link></item>
+<item><title>Developer interview: making the sequel</title><link>https://www.example.com/news/2</link></item>
+</channel></rss>"""
+
+
+class FakeScheduler:
+    def __init__(self, pages: dict[str, bytes]) -> None:
+        self.pages = pages
+        self.streamed: list[str] = []
+
+    def fetch(self, url, **kwargs):
+        body = self.pages.get(url)
+        return HttpResponse(url=url, status=200 if body is not None else 404, final_url=url, body=body or b"")
+
+    @contextmanager
+    def stream(self, url, **kwargs):
+        self.streamed.append(url)
+        response = self.fetch(url)
+        yield response, iter(response.body[i:i + 7] for i in range(0, len(response.body), 7))
+
+
+def test_feed_scope_is_the_listing_host_and_path():
+    assert in_listing_scope("https://example.com/jobs/feed", LISTING)
+    assert not in_listing_scope("https://www.example.com/feed", LISTING)
+    assert not in_listing_scope("https://www.example.com/jobsearch/feed", LISTING)
+    assert not in_listing_scope("https://feeds.other.com/jobs/feed", LISTING)
+    assert all(url.startswith(LISTING + "/") for url in well_known_feeds(LISTING))
+
+
+def test_job_feeds_are_told_apart_from_news():
+    assert looks_like_job_feed(parse_feed(JOBS_RSS), LISTING)
+    assert not looks_like_job_feed(parse_feed(NEWS_RSS), LISTING)
+    assert not looks_like_job_feed(iter(()), LISTING)
+
+
+def test_parse_feed_reads_chunks_as_they_arrive():
+    chunks = [JOBS_RSS[i:i + 5] for i in range(0, len(JOBS_RSS), 5)]
+    assert [entry["title"] for entry in parse_feed(iter(chunks))] == ["Senior Gameplay Programmer", "Lead Artist (Remote)"]
+
+
+def test_discovery_ignores_site_feeds_and_news(monkeypatch, tmp_path):
+    page = b'<html><head><link rel="alternate" type="application/rss+xml" href="/feed"></head></html>'
+    scheduler = FakeScheduler({LISTING: page, "https://www.example.com/feed": JOBS_RSS, LISTING + "/rss": NEWS_RSS})
+    monkeypatch.setattr(job_feeds, "get_scheduler", lambda: scheduler)
+    cache = FeedCache(str(tmp_path / "feeds.json"))
+    assert discover_feed(LISTING, cache) == ""
+    assert "https://www.example.com/feed" not in scheduler.streamed
+    assert LISTING + "/rss" in scheduler.streamed
+
+
+def test_discovery_accepts_a_job_feed_under_the_listing(monkeypatch, tmp_path):
+    page = b'<html><head><link rel="alternate" type="application/rss+xml" href="/jobs/feed"></head></html>'
+    scheduler = FakeScheduler({LISTING: page, LISTING + "/feed": JOBS_RSS})
+    monkeypatch.setattr(job_feeds, "get_scheduler", lambda: scheduler)
+    assert discover_feed(LISTING, FeedCache(str(tmp_path / "feeds.json"))) == LISTING + "/feed"
+
+
+def test_cached_site_feeds_are_rediscovered(tmp_path):
+    cache = FeedCache(str(tmp_path / "feeds.json"))
+    cache.put(LISTING, "https://www.example.com/feed")
+    assert cache.get(LISTING) is None
+    cache.put(LISTING, "")
+    assert cache.get(LISTING) == ""
+
+
+def scrape_example_feed(payload: dict):
+    with using_payload(payload):
+        request = page_request_from(payload, "example", 25)
+        return request, scrape_feed("example", LISTING, "example", lambda *parts: "|".join(parts), request)
+
+
+def test_feed_cursors_resume_the_feed_and_never_the_listing(monkeypatch):
+    monkeypatch.setattr(job_feeds, "get_scheduler", lambda: FakeScheduler({LISTING + "/feed": JOBS_RSS}))
+    options = {"feed": LISTING + "/feed", "limit": 1}
+    _, (jobs, _, cursor) = scrape_example_feed(options)
+    assert [job.title for job in jobs] == ["Senior Gameplay Programmer"] and cursor
+    request, (jobs, _, cursor) = scrape_example_feed({**options, "cursor": cursor})
+    assert (request.page, request.offset) == (1, 0)  # Were the feed gone, the listing would start at its top
+    assert [job.title for job in jobs] == ["Lead Artist (Remote)"] and cursor is None
+    _, feed = scrape_example_feed({**options, "cursor": encode_cursor("example", 1, 1)})
+    assert feed is None
@@ -0,0 +1,22 @@
+from job_link_check import closed_url_reason
+
+JOB = "https://studio.example.com/jobs/1234-senior-artist"
+
+
+def test_redirects_to_closed_pages_are_closed():
+    assert closed_url_reason(JOB, "https://studio.example.com/jobs/expired") == "closed_redirect"
+    assert closed_url_reason(JOB, JOB + "?error=job_not_found") == "closed_redirect"
+    assert closed_url_reason(JOB, "https://careers.other.com/position-filled") == "closed_redirect"
+
+
+def test_redirects_to_the_listing_index_are_closed():
+    assert closed_url_reason(JOB, "https://www.studio.example.com/jobs/") == "index_redirect"
+    assert closed_url_reason(JOB, "https://studio.example.com/") == "index_redirect"
+
+
+def test_unchanged_closed_words_in_the_listing_url_are_ignored():
+    listing = "http://studio.example.com/jobs/closed-captioning-engineer?team=archived-content"
+    assert closed_url_reason(listing, "https://studio.example.com/jobs/closed-captioning-engineer/?team=archived-content") == ""
+    assert closed_url_reason(listing, "https://studio.example.com/jobs/closed-captioning-engineer?team=archived-content&utm=1") == ""
+    assert closed_url_reason(listing, "https://apply.example.net/jobs/closed-captioning-engineer") == ""
+    assert closed_url_reason(JOB, JOB + "/apply") == ""
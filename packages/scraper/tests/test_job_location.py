@@ -0,0 +1,56 @@
+from job_location import classify_location
+
+
+def test_classifies_city_region_and_country():
+    info = classify_location("Austin, TX")
+    assert (info["city"], info["region"], info["country"]) == ("Austin", "Texas", "United States")
+
+
+def test_remote_and_onsite_keywords():
+    assert classify_location("Fully remote (EU)")["remote"] is True
+    assert classify_location("London - on-site")["remote"] is False
+    assert classify_location("", remote_default=True)["remote"] is True
+
+
+def test_bare_us_in_prose_is_not_a_country():
+    assert classify_location("JOIN US NOW")["country"] == ""
+    assert classify_location("Tell US about yourself")["country"] == ""
+
+
+def test_us_in_location_context():
+    for text in ("Remote (US)", "Austin, US", "Remote - US", "Seattle US", "US"):
+        assert classify_location(text)["country"] == "United States", text
+
+
+def test_ambiguous_state_codes_need_context():
+    assert classify_location("MA in Game Art preferred")["region"] == ""
+    assert classify_location("Boston MA")["region"] == "Massachusetts"
+    assert classify_location("Denver, CO")["region"] == "Colorado"
+
+
+def test_remote_survives_on_site_mentions():
+    both = classify_location("Remote or on-site in London")
+    assert (both["remote"], both["hybrid"], both["city"]) == (True, True, "London")
+    negated = classify_location("Remote, no on-site required")
+    assert (negated["remote"], negated["hybrid"]) == (True, False)
+    assert classify_location("On-site optional")["remote"] is False
+    assert classify_location("No remote")["remote"] is False
+
+
+def test_explicit_region_or_country_beats_a_same_named_city():
+    cases = {
+        "London, Ontario": ("", "Ontario", "Canada"),
+        "Paris, TX": ("", "Texas", "United States"),
+        "Tbilisi, Georgia": ("Tbilisi", "", "Georgia"),
+        "Atlanta, Georgia": ("Atlanta", "Georgia", "United States"),
+        "London, UK or Toronto, Canada": ("London", "England", "United Kingdom"),
+        "Cambridge, MA": ("", "Massachusetts", "United States"),
+    }
+    for text, expected in cases.items():
+        info = classify_location(text)
+        assert (info["city"], info["region"], info["country"]) == expected, text
+
+
+def test_distant_places_do_not_override_a_city():
+    info = classify_location("Our London studio works with partners across Canada")
+    assert (info["city"], info["country"]) == ("London", "United Kingdom")
@@ -0,0 +1,45 @@
+import pytest
+
+import job_match_scoring
+from job_match_scoring import TermMatcher, score_jobs, tokenize
+
+pytestmark = pytest.mark.skipif(job_match_scoring.np is None, reason="NumPy not installed")
+
+TEXTS = [
+    "Senior C++ Engineer: Unreal Engine 5, C# tools and Node.js services.",
+    "We use UNITY. Unity and unity3d are different tokens; so is c++17.",
+    "No matching terms here.",
+    "Unreal\nEngine on separate lines, then unreal engine again",
+]
+TERMS = [("c++",), ("unreal", "engine"), ("unity",), ("node.js",), ("c#",)]
+
+
+def counts(texts: list[str]) -> set[tuple[int, str, int]]:
+    docs, terms, hits = TermMatcher(TERMS).count(texts)
+    return {(doc, " ".join(TERMS[term]), hit) for doc, term, hit in zip(docs.tolist(), terms.tolist(), hits.tolist())}
+
+
+def test_matcher_tokenizes_like_tokenize():
+    assert tokenize("Node.js, C++ and unity.") == ["node.js", "c++", "and", "unity"]
+    assert counts(TEXTS) == {
+        (0, "c++", 1), (0, "unreal engine", 1), (0, "c#", 1), (0, "node.js", 1),
+        (1, "unity", 2),
+        (3, "unreal engine", 2),
+    }
+
+
+def test_matching_in_blocks_gives_the_same_counts(monkeypatch):
+    whole = counts(TEXTS * 50)
+    monkeypatch.setattr(job_match_scoring, "MATCH_BLOCK_CHARS", 100)
+    assert counts(TEXTS * 50) == whole
+
+
+def test_score_jobs_ranks_the_closest_job_first():
+    resume = {"skills": {"technical": ["C++", "Unreal Engine"]}, "experience": [{"title": "Gameplay Programmer"}]}
+    jobs = [
+        {"title": "Marketing Manager", "description": "Brand campaigns."},
+        {"title": "Gameplay Programmer", "description": "C++ and Unreal Engine 5.", "url": "https://x/1"},
+    ]
+    ranked = score_jobs(resume, jobs)
+    assert ranked[0]["url"] == "https://x/1"
+    assert set(ranked[0]["matched"]["skills"]) == {"C++", "Unreal Engine"}
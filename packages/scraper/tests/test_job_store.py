@@ -0,0 +1,43 @@
+from job_store import JobStore, run_is_complete
+
+DEFAULT_URL = "https://www.gamesjobsdirect.com/results"
+
+
+def test_full_run_of_the_default_listing_is_complete():
+    assert run_is_complete({}, None, True, DEFAULT_URL)
+    assert run_is_complete({"sourceUrl": DEFAULT_URL + "/"}, None, True, DEFAULT_URL)
+
+
+def test_partial_runs_are_not_complete():
+    assert not run_is_complete({}, "next", True, DEFAULT_URL)
+    assert not run_is_complete({"cursor": "abc"}, None, True, DEFAULT_URL)
+    assert not run_is_complete({"since": "2026-01-01T00:00:00Z"}, None, True, DEFAULT_URL)
+    assert not run_is_complete({"knownUrls": ["https://x/job/1"]}, None, True, DEFAULT_URL)
+
+
+def test_sharded_runs_are_not_complete():
+    assert not run_is_complete({"shards": [{"region": "usa"}]}, None, True, DEFAULT_URL)
+
+
+def test_custom_source_urls_are_not_complete():
+    assert not run_is_complete({"sourceUrl": DEFAULT_URL + "?region=uk"}, None, True, DEFAULT_URL)
+    assert not run_is_complete({"sourceUrl": DEFAULT_URL}, None, True)
+
+
+def test_runs_without_jobs_never_expire_the_board():
+    assert not run_is_complete({}, None, False, DEFAULT_URL)
+
+
+def test_record_run_reports_delta_and_only_removes_on_complete_runs(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    jobs = [{"contentHash": "a", "url": "https://x/job/a"}, {"contentHash": "b", "url": "https://x/job/b"}]
+    first = store.record_run("gjd", jobs, complete=True, now=100)
+    assert first["added"] == ["a", "b"]
+
+    partial = store.record_run("gjd", jobs[:1], complete=False, now=200)
+    assert partial["still_present"] == ["a"]
+    assert partial["removed"] == []
+
+    full = store.record_run("gjd", jobs[:1], complete=True, now=300)
+    assert full["removed"] == [{"contentHash": "b", "url": "https://x/job/b"}]
+    assert store.record_run("gjd", jobs, complete=True, now=400)["added"] == ["b"]
@@ -0,0 +1,24 @@
+from job_record import JobRecord
+from job_tags import apply_technology_tags, tag_technologies
+
+
+def test_prose_words_are_not_technologies():
+    assert tag_technologies("Go to market with our new title.") == []
+    assert tag_technologies("React quickly to player feedback") == []
+    assert tag_technologies("Metal Gear fans welcome") == []
+    assert tag_technologies("Taylor Swift concert tickets for the team") == []
+
+
+def test_language_and_list_context_tags_ambiguous_names():
+    assert tag_technologies("We are looking for a Go developer") == ["Go"]
+    assert tag_technologies("Golang services") == ["Go"]
+    assert tag_technologies("Skills: C++, Go, Python") == ["C++", "Go", "Python"]
+    assert tag_technologies("Experience with React and TypeScript") == ["React", "TypeScript"]
+    assert tag_technologies("Rendering with Vulkan, Metal and DirectX 12") == ["Vulkan", "Metal", "DirectX"]
+    assert tag_technologies("- Swift\n- Kubernetes") == ["Swift", "Kubernetes"]
+
+
+def test_existing_technologies_are_kept():
+    job = JobRecord("Backend Engineer", description="Go to the next level with us.", technologies=["Go"])
+    apply_technology_tags([job])
+    assert job.technologies == ["Go"]
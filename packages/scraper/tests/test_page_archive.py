@@ -0,0 +1,37 @@
+import io
+import os
+
+import page_archive
+import scraper_io
+from board_health import CircuitBreaker
+from scraper_paths import data_dir
+
+
+def test_reading_an_archive_payload_isolates_the_data_dir(tmp_path, monkeypatch, scraper_data_dir):
+    archive_path = tmp_path / "run.zip"
+    monkeypatch.setattr(scraper_io, "_payload", None)
+    monkeypatch.setattr(page_archive, "_archive", None)
+    monkeypatch.setattr(page_archive, "_resolved", False)
+    monkeypatch.setattr("sys.stdin", io.StringIO(f'{{"archive": {{"mode": "record", "path": "{archive_path}"}}}}'))
+
+    scraper_io.read_payload()
+    archive = page_archive.current_archive()
+    try:
+        assert archive is not None and archive.path == archive_path.resolve()
+        assert data_dir() != scraper_data_dir.resolve()
+        breaker = CircuitBreaker()
+        breaker.record("gjd", "blocked", "wall")
+        breaker.close()
+        assert not (scraper_data_dir / "circuit-breakers.db").exists()
+        assert (data_dir() / "circuit-breakers.db").exists()
+    finally:
+        archive.close()
+
+
+def test_payloads_without_an_archive_keep_the_data_dir(monkeypatch, scraper_data_dir):
+    monkeypatch.setattr(scraper_io, "_payload", None)
+    monkeypatch.setattr(page_archive, "_resolved", False)
+    monkeypatch.setattr("sys.stdin", io.StringIO('{"limit": 5}'))
+    scraper_io.read_payload()
+    assert os.environ["BAO_SCRAPER_DATA_DIR"] == str(scraper_data_dir)
+    assert not page_archive._resolved
@@ -0,0 +1,124 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import page_classifier
+from page_classifier import InterstitialDetected, classify_page, host_interstitial, raise_if_interstitial
+
+# Just enough DOM for CLASSIFY_JS: elements match the selectors they list, fields are found by tag
+DOM_STUB = """
+var page = %s;
+function element(spec) {
+    return {
+        tagName: spec.tag || 'DIV',
+        getAttribute: function(name) { return name === 'type' ? (spec.type || null) : null; },
+        getBoundingClientRect: function() { return {width: 100, height: 20}; },
+    };
+}
+var elements = page.elements.map(function(spec) { return {spec: spec, el: element(spec)}; });
+var document = {
+    title: page.title,
+    body: {innerText: page.text},
+    querySelector: function(selector) {
+        var found = elements.filter(function(e) { return (e.spec.matches || []).indexOf(selector) !== -1; })[0];
+        return found ? found.el : null;
+    },
+    querySelectorAll: function() {
+        return elements.filter(function(e) { return ['INPUT', 'TEXTAREA', 'SELECT'].indexOf(e.spec.tag) !== -1; })
+            .map(function(e) { return e.el; });
+    },
+};
+var location = {href: page.url};
+function getComputedStyle() { return {visibility: 'visible', opacity: '1'}; }
+console.log((function() { %s })());
+"""
+
+PASSWORD = {"tag": "INPUT", "type": "password", "matches": ["input[type='password']"]}
+EMAIL = {"tag": "INPUT", "type": "email"}
+
+
+class NodeBrowser:
+    """Runs the classification script against a stub page the way a browser's ``dom`` call would."""
+
+    def __init__(self, url="https://jobs.example.com/apply/1", title="", text="", elements=()):
+        self.page = {"url": url, "title": title, "text": text, "elements": list(elements)}
+
+    def dom(self, script):
+        source = DOM_STUB % (json.dumps(self.page), script)
+        return subprocess.run(["node", "-e", source], capture_output=True, text=True, check=True).stdout.strip()
+
+
+class ScriptedBrowser:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def dom(self, script):
+        self.calls += 1
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+
+needs_node = pytest.mark.skipif(shutil.which("node") is None, reason="node runs the classification script")
+
+
+@pytest.fixture(autouse=True)
+def fresh_hosts(monkeypatch):
+    monkeypatch.setattr(page_classifier, "_walled_hosts", {})
+    monkeypatch.setattr(page_classifier, "POLL_SECONDS", 0)
+
+
+@needs_node
+def test_a_bare_password_form_is_a_login_wall():
+    found = classify_page(NodeBrowser(title="Welcome", elements=[EMAIL, PASSWORD]), "https://jobs.example.com/apply/1")
+    assert found is not None and found.kind == "login"
+    assert found.marker == "selector:input[type='password']"
+
+
+@needs_node
+def test_an_application_form_with_a_password_field_is_not_a_login_wall():
+    fields = [EMAIL, PASSWORD, {"tag": "INPUT", "type": "text"}, {"tag": "INPUT", "type": "tel"}, {"tag": "INPUT"}]
+    assert classify_page(NodeBrowser(title="Sign in or apply", elements=fields)) is None
+    upload = [EMAIL, PASSWORD, {"tag": "INPUT", "type": "file"}]
+    assert classify_page(NodeBrowser(title="Log in", elements=upload)) is None
+    letter = [PASSWORD, {"tag": "TEXTAREA"}]
+    assert classify_page(NodeBrowser(text="please sign in", elements=letter)) is None
+
+
+@needs_node
+def test_generic_titles_are_not_challenges():
+    assert classify_page(NodeBrowser(title="Please wait while we load the role")) is None
+    assert classify_page(NodeBrowser(title="Access Denied Engineer - Careers")) is None
+    denied = NodeBrowser(title="Access Denied", text="You don't have permission to access this server.")
+    assert classify_page(denied).kind == "challenge"
+
+
+@needs_node
+def test_content_selector_wins_over_markers():
+    listing = {"matches": [".job-list"]}
+    assert classify_page(NodeBrowser(title="Just a moment...", elements=[listing]), "", ".job-list") is None
+
+
+def test_self_solving_challenges_are_rechecked():
+    challenge = json.dumps({"kind": "challenge", "marker": "title:just a moment"})
+    browser = ScriptedBrowser(challenge, challenge, "")
+    assert classify_page(browser, "https://jobs.example.com/", settle_seconds=5) is None
+    assert browser.calls == 3
+
+
+def test_walled_hosts_are_remembered():
+    browser = ScriptedBrowser(json.dumps({"kind": "captcha", "marker": "selector:#captcha"}))
+    with pytest.raises(InterstitialDetected) as raised:
+        raise_if_interstitial(browser, "https://jobs.example.com/list")
+    assert raised.value.interstitial.url == "https://jobs.example.com/list"
+    assert host_interstitial("https://JOBS.example.com/other").kind == "captcha"
+    assert host_interstitial("https://elsewhere.example.com/") is None
+
+
+def test_script_failures_do_not_block():
+    class Broken:
+        def dom(self, script):
+            raise RuntimeError("tab crashed")
+
+    assert classify_page(Broken(), "https://jobs.example.com/") is None
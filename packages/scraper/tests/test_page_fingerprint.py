@@ -0,0 +1,75 @@
+import page_fingerprint
+from http_client import HttpResponse
+from page_fingerprint import ChangeTracker, FingerprintStore, fingerprint_items
+from result_cache import cache_key
+
+LISTING = "https://jobs.example.com/"
+IF_CHANGED = {"ifChanged": True}
+
+
+class FakeScheduler:
+    def __init__(self, status: int = 200, headers: dict[str, str] | None = None) -> None:
+        self.status = status
+        self.headers = headers or {}
+        self.requests: list[dict] = []
+
+    def fetch(self, url, headers=None, **kwargs):
+        self.requests.append(dict(headers or {}))
+        return HttpResponse(url=url, status=self.status, final_url=url, headers=self.headers)
+
+
+def tracker(tmp_path, monkeypatch, scheduler, payload=IF_CHANGED, state=None):
+    monkeypatch.setattr(page_fingerprint, "get_scheduler", lambda: scheduler)
+    store = FingerprintStore(str(tmp_path / "fingerprints.db"))
+    if state is not None:
+        store.put(cache_key("board", LISTING, {}), LISTING, state)
+    return ChangeTracker("board", LISTING, payload, store)
+
+
+def test_no_request_without_stored_validators(tmp_path, monkeypatch):
+    scheduler = FakeScheduler(headers={"etag": '"v1"'})
+    assert not tracker(tmp_path, monkeypatch, scheduler).not_modified()
+    assert not tracker(tmp_path, monkeypatch, scheduler, state={"fingerprint": "3:120:abc"}).not_modified()
+    assert scheduler.requests == []
+
+
+def test_stored_validators_make_a_conditional_request(tmp_path, monkeypatch):
+    scheduler = FakeScheduler(status=304)
+    state = {"etag": '"v1"', "lastModified": "Sun, 01 Mar 2026 09:30:00 GMT"}
+    assert tracker(tmp_path, monkeypatch, scheduler, state=state).not_modified()
+    assert scheduler.requests == [{"If-None-Match": '"v1"', "If-Modified-Since": "Sun, 01 Mar 2026 09:30:00 GMT"}]
+
+
+def test_changed_listings_record_fresh_validators(tmp_path, monkeypatch):
+    scheduler = FakeScheduler(headers={"etag": '"v2"'})
+    run = tracker(tmp_path, monkeypatch, scheduler, state={"etag": '"v1"'})
+    assert not run.not_modified()
+    run.commit()
+    assert run.store.get(run.key)["etag"] == '"v2"'
+
+
+def test_validators_are_learned_from_listing_responses(tmp_path, monkeypatch):
+    run = tracker(tmp_path, monkeypatch, FakeScheduler())
+    response = HttpResponse(url=LISTING, status=200, headers={"last-modified": "Mon, 02 Mar 2026 10:00:00 GMT"})
+    run.record_response(LISTING + "?page=2", response)
+    assert not run.observed.get("lastModified")
+    run.record_response(LISTING, response)
+    assert run.observed["lastModified"] == "Mon, 02 Mar 2026 10:00:00 GMT"
+
+
+def test_region_fingerprint_decides_without_validators(tmp_path, monkeypatch):
+    items = [{"title": "Gameplay Programmer", "url": LISTING + "job/1"}]
+    first = tracker(tmp_path, monkeypatch, FakeScheduler())
+    assert not first.region_unchanged(fingerprint_items(items))
+    first.commit()
+    second = tracker(tmp_path, monkeypatch, FakeScheduler())
+    assert second.region_unchanged(fingerprint_items(items))
+    assert not second.region_unchanged(fingerprint_items(items + items))
+
+
+def test_paged_and_sharded_runs_are_not_tracked(tmp_path, monkeypatch):
+    scheduler = FakeScheduler(status=304)
+    for payload in ({"ifChanged": True, "cursor": "abc"}, {"ifChanged": True, "shards": [{"region": "usa"}]}):
+        run = tracker(tmp_path, monkeypatch, scheduler, payload, state={"etag": '"v1"', "fingerprint": "f"})
+        assert not run.not_modified() and not run.region_unchanged("f")
+    assert scheduler.requests == []
@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+
+from posted_dates import (
+    find_labelled_date, find_posted_date, is_older, listing_is_older, listing_posted_date, normalize_posted_date, parse_iso,
+)
+
+NOW = datetime(2026, 3, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def test_relative_and_keyword_dates():
+    assert find_posted_date("Posted 3 days ago", NOW) == "2026-03-12T12:00:00Z"
+    assert find_posted_date("2h ago", NOW) == "2026-03-15T10:00:00Z"
+    assert find_posted_date("Posted yesterday", NOW) == "2026-03-14T00:00:00Z"
+
+
+def test_calendar_dates_roll_back_a_year_when_in_the_future():
+    assert find_posted_date("Posted: 12 Oct", NOW) == "2025-10-12T00:00:00Z"
+    assert find_posted_date("Mar 2, 2026", NOW) == "2026-03-02T00:00:00Z"
+
+
+def test_first_date_in_text_wins():
+    assert find_posted_date("Closes 30 Apr, posted 2 days ago", NOW) == "2025-04-30T00:00:00Z"
+    assert find_posted_date("Senior Artist - Remote", NOW) == ""
+
+
+def test_normalize_machine_readable_dates():
+    assert normalize_posted_date("2026-03-01T09:30:00+02:00") == "2026-03-01T07:30:00Z"
+    assert normalize_posted_date("2026-03-01") == "2026-03-01T00:00:00Z"
+    assert normalize_posted_date("Sun, 01 Mar 2026 09:30:00 GMT") == "2026-03-01T09:30:00Z"
+    assert normalize_posted_date("4 days ago", NOW) == "2026-03-11T12:00:00Z"
+    assert normalize_posted_date("soon") == ""
+
+
+def test_since_watermark():
+    since = parse_iso("2026-03-10T00:00:00Z")
+    assert is_older("2026-03-01T00:00:00Z", since)
+    assert not is_older("2026-03-12T00:00:00Z", since)
+    assert not is_older("", since)
+
+
+def test_free_text_dates_need_a_label():
+    assert find_labelled_date("Studio X - London. Posted 3 days ago", NOW) == "2026-03-12T12:00:00Z"
+    assert find_labelled_date("Listed on: 12 Oct", NOW) == "2025-10-12T00:00:00Z"
+    assert find_labelled_date("You may 1 day lead a team of 12 in March 2026", NOW) == ""
+    assert find_labelled_date("Posted in Art, Mar 2", NOW) == ""
+
+
+def test_text_dates_never_drop_or_stop_a_listing():
+    since = parse_iso("2026-03-10T00:00:00Z")
+    from_text = {"postedText": "", "postedContext": "Acme - Remote. Posted: 1 Mar"}
+    assert listing_posted_date(from_text, now=NOW) == "2026-03-01T00:00:00Z"
+    assert not listing_is_older(from_text, since)
+    assert listing_is_older({"postedText": "2026-03-01"}, since)
+    assert listing_posted_date({"locationText": "Austin, may 4 roles"}, "locationText", NOW) == ""
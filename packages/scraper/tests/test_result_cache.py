@@ -0,0 +1,80 @@
+import board_engine
+from board_engine import run_board
+from board_health import STATUS_OK, STATUS_TIMEOUT
+from job_record import JobRecord
+from result_cache import ResultCache, cache_key, cache_options
+from scraper_io import using_payload
+
+LISTING = "https://jobs.example.com/games"
+
+
+def test_keys_ignore_url_spelling_and_unkeyed_options():
+    key = cache_key("grackle", "https://Jobs.Example.com/games/?b=2&a=1", {"limit": 10})
+    assert key == cache_key("grackle", "https://jobs.example.com/games?a=1&b=2", {"limit": 10, "cache": {"ttl": 5}})
+    assert key == cache_key("grackle", "https://jobs.example.com/games?a=1&b=2", {"limit": 10, "browser": {}})
+    assert key != cache_key("grackle", "https://jobs.example.com/games?a=1&b=2", {"limit": 20})
+    assert key != cache_key("pocketgamer", "https://jobs.example.com/games?a=1&b=2", {"limit": 10})
+
+
+def test_cache_options():
+    assert cache_options({}) == {"ttl": 600, "maxStale": 3600, "refresh": False}
+    assert cache_options({"cache": {"ttl": 0, "maxStale": -1, "refresh": True}}) == {"ttl": 0, "maxStale": 3600, "refresh": True}
+    assert cache_options({"cache": False}) is None
+    assert cache_options({"archive": {"mode": "replay"}}) is None
+
+
+class Board:
+    def __init__(self, status: str = STATUS_OK) -> None:
+        self.status = status
+        self.runs = 0
+
+    def scrape(self, url):
+        self.runs += 1
+        return [JobRecord("Gameplay Programmer", "Acme", url=LISTING + "/1")], self.status, None
+
+
+def run(board: Board, cache: ResultCache, payload: dict | None = None) -> dict:
+    with using_payload(payload or {}):
+        return run_board("grackle", LISTING, board.scrape, cache=cache, script="job_scraper_grackle.py")
+
+
+def age_entry(cache: ResultCache, seconds: float) -> None:
+    with cache.conn:
+        cache.conn.execute("UPDATE result_cache SET stored_at = stored_at - ?", (seconds,))
+
+
+def test_miss_then_hit_within_ttl(tmp_path):
+    cache, board = ResultCache(str(tmp_path / "cache.db")), Board()
+    assert run(board, cache)["cache"] == {"status": "miss", "ageSeconds": 0, "refreshing": False}
+    hit = run(board, cache)
+    assert hit["cache"]["status"] == "hit" and hit["jobs"][0]["title"] == "Gameplay Programmer"
+    assert hit["delta"] is None
+    assert board.runs == 1
+
+
+def test_stale_entries_refresh_once_in_the_background(tmp_path, monkeypatch):
+    spawned: list[str] = []
+    monkeypatch.setattr(board_engine, "spawn_refresh", lambda payload, script: spawned.append(script) or True)
+    path = str(tmp_path / "cache.db")
+    board = Board()
+    run(board, ResultCache(path))
+    age_entry(ResultCache(path), 700)
+    first, second = run(board, ResultCache(path)), run(board, ResultCache(path))
+    assert first["cache"]["status"] == second["cache"]["status"] == "stale"
+    assert (first["cache"]["refreshing"], second["cache"]["refreshing"]) == (True, False)
+    assert spawned == ["job_scraper_grackle.py"]
+    assert board.runs == 1
+
+
+def test_expired_and_unhealthy_runs(tmp_path):
+    cache, board = ResultCache(str(tmp_path / "cache.db")), Board()
+    run(board, cache)
+    age_entry(cache, 600 + 3600 + 1)
+    assert run(board, cache)["cache"]["status"] == "miss" and board.runs == 2
+    assert run(board, cache, {"cache": {"refresh": True}})["cache"]["status"] == "refresh"
+    failing = Board(STATUS_TIMEOUT)
+    cold = ResultCache(str(tmp_path / "cold.db"))
+    run(failing, cold)
+    run(failing, cold)
+    assert failing.runs == 2
+    assert run(failing, cold, {"cache": False})["cache"]["status"] == "disabled"
@@ -0,0 +1,71 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRAPER_DIR = Path(__file__).resolve().parent.parent
+SLOW_SCRIPT = """
+import sys, time
+print('{"board": "first", "jobs": []}', flush=True)
+sys.stdout.write("partial")
+sys.stdout.flush()
+time.sleep(30)
+"""
+
+
+def supervisor_command(tmp_path, script: str) -> list[str]:
+    """Run ``script`` under run_watchdog.main as if it lived next to the scrapers."""
+    (tmp_path / "slow.py").write_text(script, encoding="utf-8")
+    launcher = (
+        "import sys, run_watchdog; from pathlib import Path; "
+        f"run_watchdog.SCRIPT_DIR = Path({str(tmp_path)!r}); sys.exit(run_watchdog.main())"
+    )
+    return [sys.executable, "-c", launcher, "slow.py"]
+
+
+def run_supervised(tmp_path, script: str, payload: dict) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        supervisor_command(tmp_path, script), cwd=SCRAPER_DIR, input=json.dumps(payload).encode(),
+        capture_output=True, timeout=30,
+    )
+
+
+def test_timeout_result_follows_the_streamed_output(tmp_path):
+    result = run_supervised(tmp_path, SLOW_SCRIPT, {"watchdog": {"totalSeconds": 0.5}})
+    lines = result.stdout.decode().splitlines()
+    assert result.returncode == 1
+    assert lines[:2] == ['{"board": "first", "jobs": []}', "partial"]
+    timeout = json.loads(lines[2])
+    assert timeout["status"] == "timeout"
+    assert timeout["watchdog"]["deadline"] == "total"
+
+
+def test_completed_runs_pass_stdout_through(tmp_path):
+    result = run_supervised(tmp_path, "print('[1, 2]')\n", {})
+    assert result.returncode == 0
+    assert result.stdout.decode() == "[1, 2]\n"
+
+
+def test_output_is_forwarded_before_the_script_exits(tmp_path):
+    proc = subprocess.Popen(
+        supervisor_command(tmp_path, SLOW_SCRIPT), cwd=SCRAPER_DIR,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    proc.stdin.write(b'{"watchdog": {"totalSeconds": 2}}')
+    proc.stdin.close()
+    try:
+        assert proc.stdout.readline() == b'{"board": "first", "jobs": []}\n'
+        assert proc.poll() is None
+    finally:
+        proc.wait(timeout=30)
+        proc.stdout.close()
+
+
+def test_every_reported_phase_has_a_deadline():
+    from browser_driver import CALL_PHASES
+    from run_watchdog import watchdog_options
+
+    total, deadlines = watchdog_options({"watchdog": {"phases": {"scrape": 120}}})
+    assert total == 600
+    assert deadlines["scrape"] == 120
+    assert {"init", "close", "script", *CALL_PHASES.values()} <= set(deadlines)
@@ -74,6 +74,7 @@ const TABLE_DEFINITIONS = [
       tags TEXT,
       company_logo TEXT,
       application_url TEXT,
+      closed_at TEXT,
       created_at TEXT NOT NULL DEFAULT (CURRENT_TIMESTAMP),
       updated_at TEXT NOT NULL DEFAULT (CURRENT_TIMESTAMP)
     )`,
@@ -226,6 +227,9 @@ const TABLE_DEFINITIONS = [
     )`,
 ] as const;
 
+/** Columns added after their table shipped; `CREATE TABLE IF NOT EXISTS` leaves older databases without them. */
+const COLUMN_ADDITIONS = [{ table: "jobs", column: "closed_at", definition: "TEXT" }] as const;
+
 const INDEXES = [
   "CREATE INDEX IF NOT EXISTS jobs_source_idx ON jobs(source)",
   "CREATE INDEX IF NOT EXISTS jobs_posted_date_idx ON jobs(posted_date)",
@@ -246,6 +250,13 @@ export function initializeDatabase(sqlite: Database): void {
     sqlite.exec(ddl);
   }
 
+  for (const { table, column, definition } of COLUMN_ADDITIONS) {
+    const columns = sqlite.query<{ name: string }, []>(`PRAGMA table_info(${table})`).all();
+    if (!columns.some((existing) => existing.name === column)) {
+      sqlite.exec(`ALTER TABLE ${table} ADD COLUMN ${column} ${definition}`);
+    }
+  }
+
   for (const indexSql of INDEXES) {
     sqlite.exec(indexSql);
   }
@@ -26,6 +26,7 @@ export const jobs = sqliteTable(
     tags: text("tags", { mode: "json" }).$type<string[]>(),
     companyLogo: text("company_logo"),
     applicationUrl: text("application_url"),
+    closedAt: text("closed_at"),
     createdAt: text("created_at").notNull().default(sql`(CURRENT_TIMESTAMP)`),
     updatedAt: text("updated_at").notNull().default(sql`(CURRENT_TIMESTAMP)`),
   },
@@ -3,6 +3,7 @@ import { join } from "node:path";
 import type { AutomationSettings } from "@bao/shared";
 import { safeParseJson } from "@bao/shared";
 import { SCRAPER_DIR } from "../../config/paths";
+import { SCRIPT_KILL_GRACE_SECONDS, scriptTotalSeconds } from "../script-watchdog";
 
 const PYTHON = process.platform === "win32" ? "python" : "python3";
 
@@ -47,18 +48,28 @@ export async function runRpaScript(
   automationSettings?: AutomationSettings | null,
   onProgress?: RpaProgressCallback,
 ): Promise<RpaRunResult> {
-  const scriptPath = join(SCRAPER_DIR, scriptName);
+  const supervisorPath = join(SCRAPER_DIR, "run_watchdog.py");
   const payload = JSON.stringify({
     ...inputJson,
     settings: automationSettings || {},
   });
 
-  const proc = Bun.spawn([PYTHON, scriptPath], {
+  // run_watchdog.py enforces phase deadlines and cleans up the browser's process group
+  const proc = Bun.spawn([PYTHON, supervisorPath, scriptName], {
     cwd: SCRAPER_DIR,
     stdin: "pipe",
     stdout: "pipe",
     stderr: "pipe",
   });
+  const totalSeconds = scriptTotalSeconds(inputJson.watchdog);
+  let timedOut = false;
+  const timer = setTimeout(
+    () => {
+      timedOut = true;
+      proc.kill();
+    },
+    (totalSeconds + SCRIPT_KILL_GRACE_SECONDS) * 1000,
+  );
 
   const encoder = new TextEncoder();
   await proc.stdin.write(encoder.encode(payload));
@@ -101,6 +112,10 @@ export async function runRpaScript(
   const stderr = stderrLines.join("\n");
 
   const exitCode = await proc.exited;
+  clearTimeout(timer);
+  if (timedOut) {
+    throw new Error(`RPA script ${scriptName} timed out after ${totalSeconds + SCRIPT_KILL_GRACE_SECONDS}s`);
+  }
   if (exitCode !== 0) {
     throw new Error(`RPA script failed (${exitCode}): ${stderr || stdout}`);
   }
@@ -21,7 +21,7 @@ import {
   JOB_SUPPORTED_PLATFORMS,
   JOB_TYPES,
 } from "@bao/shared";
-import { and, desc, eq, gte, inArray, like, sql } from "drizzle-orm";
+import { and, desc, eq, gte, inArray, isNull, like, sql } from "drizzle-orm";
 import { db } from "../../db/client";
 import { applications, jobs, savedJobs } from "../../db/schema/jobs";
 import { deduplicateJobs, generateContentHash } from "./deduplication";
@@ -48,6 +48,9 @@ const isOneOf = <T extends string>(values: readonly T[], value: unknown): value
   return values.some((entry) => entry === value);
 };
 
+const isStringArray = (value: unknown): value is string[] =>
+  Array.isArray(value) && value.every((entry) => typeof entry === "string");
+
 export class JobAggregator {
   private providers: JobProvider[];
   private cacheExpiry: number; // milliseconds
@@ -131,6 +134,7 @@ export class JobAggregator {
               .update(jobs)
               .set({
                 ...job,
+                closedAt: null,
                 updatedAt: new Date().toISOString(),
               })
               .where(eq(jobs.id, existing[0].id));
@@ -179,8 +183,8 @@ export class JobAggregator {
       page = 1,
     } = filters;
 
-    // Build query conditions
-    const conditions = [];
+    // Build query conditions; jobs a complete board run no longer lists are closed
+    const conditions = [isNull(jobs.closedAt)];
 
     // Text search across title, company, description
     if (query) {
@@ -235,13 +239,10 @@ export class JobAggregator {
     }
 
     // Build the query
-    const query_builder =
-      conditions.length > 0
-        ? db
-            .select()
-            .from(jobs)
-            .where(and(...conditions))
-        : db.select().from(jobs);
+    const query_builder = db
+      .select()
+      .from(jobs)
+      .where(and(...conditions));
 
     // Apply ordering and pagination
     const offset = (page - 1) * limit;
@@ -483,7 +484,7 @@ export class JobAggregator {
     remoteCount: number;
     lastUpdated: string | null;
   }> {
-    const allJobs = await db.select().from(jobs);
+    const allJobs = await db.select().from(jobs).where(isNull(jobs.closedAt));
 
     const bySource: Record<string, number> = {};
     const byExperienceLevel: Record<string, number> = {};
@@ -534,11 +535,13 @@ export class JobAggregator {
       title: raw.title,
       company: raw.company,
       location: raw.location,
-      remote: this.detectRemote(raw.location),
-      hybrid: this.detectHybrid(raw.location),
+      remote: typeof raw.remote === "boolean" ? raw.remote : this.detectRemote(raw.location),
+      hybrid: typeof raw.hybrid === "boolean" ? raw.hybrid : this.detectHybrid(raw.location),
       description: raw.description || "",
       requirements: this.extractRequirements(raw.description),
-      technologies: this.extractTechnologies(raw.description),
+      technologies: isStringArray(raw.technologies)
+        ? raw.technologies
+        : this.extractTechnologies(raw.description),
       experienceLevel: this.detectExperienceLevel(raw.title),
       type: this.detectJobType(raw.title),
       postedDate: raw.postedDate || new Date().toISOString(),
@@ -0,0 +1,48 @@
+import { describe, expect, test } from "bun:test";
+import type { ScrapeBoardResult, ScrapePageOptions, ScrapedJob } from "../../scraper-service";
+import { collectPortalJobs } from "./gaming-providers";
+
+const job = (title: string): ScrapedJob => ({ title, company: "Studio", location: "Remote" });
+
+const boardResult = (jobs: ScrapedJob[], nextCursor: string | null): ScrapeBoardResult => ({
+  board: "grackle",
+  status: "ok",
+  jobs,
+  error: null,
+  skipped: false,
+  nextCursor,
+  delta: null,
+  cache: null,
+  interstitial: null,
+});
+
+describe("collectPortalJobs", () => {
+  test("follows nextCursor until the limit is reached", async () => {
+    const requests: ScrapePageOptions[] = [];
+    const pages = [boardResult([job("A"), job("B")], "c1"), boardResult([job("C"), job("D")], "c2")];
+    const jobs = await collectPortalJobs(
+      "grackle",
+      async (page) => {
+        requests.push(page);
+        return pages[requests.length - 1];
+      },
+      3,
+    );
+    expect(jobs.map((entry) => entry.title)).toEqual(["A", "B", "C"]);
+    expect(requests).toEqual([{ limit: 3 }, { limit: 1, cursor: "c1" }]);
+  });
+
+  test("stops when the board has no further page", async () => {
+    let runs = 0;
+    const jobs = await collectPortalJobs(
+      "grackle",
+      async () => {
+        runs++;
+        return boardResult([job("A")], null);
+      },
+      10,
+    );
+    expect(jobs).toHaveLength(1);
+    expect(runs).toBe(1);
+  });
+});
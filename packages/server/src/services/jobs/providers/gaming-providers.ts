@@ -1,6 +1,17 @@
 import { generateId } from "@bao/shared";
 import type { GamingPortalConfig, GamingPortalId } from "@bao/shared";
-import { type ScrapedJob, scraperService } from "../../scraper-service";
+import { and, inArray, isNull } from "drizzle-orm";
+import { db } from "../../../db/client";
+import { jobs } from "../../../db/schema/jobs";
+import { createServerLogger } from "../../../utils/logger";
+import {
+  HEALTHY_SCRAPE_STATUSES,
+  type ScrapeBoardResult,
+  type ScrapeDelta,
+  type ScrapePageOptions,
+  type ScrapedJob,
+  scraperService,
+} from "../../scraper-service";
 import type { JobFilters, JobProvider, RawJob } from "./provider-interface";
 import { loadJobProviderSettings } from "./provider-settings";
 
@@ -17,15 +28,87 @@ interface HitmarkerJob extends Record<string, unknown> {
 
 type HitmarkerResponse = HitmarkerJob[] | { jobs?: HitmarkerJob[]; data?: HitmarkerJob[] };
 
-type PortalScrapeMethod = (sourceUrl?: string) => Promise<ScrapedJob[]>;
+type PortalScrapeMethod = (page: ScrapePageOptions) => Promise<ScrapeBoardResult>;
 
 const PORTAL_SCRAPE_METHOD_BY_ID: Record<GamingPortalId, PortalScrapeMethod> = {
-  "gamedev-net": () => scraperService.scrapeGameDevNetJobsRaw(),
-  grackle: () => scraperService.scrapeGrackleJobsRaw(),
-  workwithindies: () => scraperService.scrapeWorkWithIndiesJobsRaw(),
-  remotegamejobs: () => scraperService.scrapeRemoteGameJobsRaw(),
-  gamesjobsdirect: () => scraperService.scrapeGamesJobsDirectRaw(),
-  pocketgamer: () => scraperService.scrapePocketGamerJobsRaw(),
+  "gamedev-net": (page) => scraperService.scrapeGameDevNetJobsRaw(undefined, page),
+  grackle: (page) => scraperService.scrapeGrackleJobsRaw(undefined, page),
+  workwithindies: (page) => scraperService.scrapeWorkWithIndiesJobsRaw(undefined, page),
+  remotegamejobs: (page) => scraperService.scrapeRemoteGameJobsRaw(undefined, page),
+  gamesjobsdirect: (page) => scraperService.scrapeGamesJobsDirectRaw(undefined, page),
+  pocketgamer: (page) => scraperService.scrapePocketGamerJobsRaw(undefined, page),
+};
+
+/** Scraper runs per refresh; a board only returns a `nextCursor` when the limit left jobs behind. */
+const MAX_PORTAL_PAGES = 3;
+
+const logger = createServerLogger("gaming-portal-provider");
+
+/** Logs what a board run reported beyond its jobs: failures, walls, cache use and listing changes. */
+const reportPortalResult = (portalId: GamingPortalId, result: ScrapeBoardResult): void => {
+  if (!HEALTHY_SCRAPE_STATUSES.has(result.status)) {
+    const wall = result.interstitial ? ` (${result.interstitial.kind} wall at ${result.interstitial.url})` : "";
+    logger.warn(
+      `${portalId}: ${result.status}${result.skipped ? " (skipped)" : ""}${wall}${
+        result.error ? ` - ${result.error}` : ""
+      }`,
+    );
+  }
+  if (result.cache && result.cache.status !== "miss" && result.cache.status !== "disabled") {
+    logger.debug(
+      `${portalId}: result cache ${result.cache.status}, ${result.cache.ageSeconds ?? 0}s old${
+        result.cache.refreshing ? ", refreshing" : ""
+      }`,
+    );
+  }
+  if (result.delta) {
+    logger.debug(
+      `${portalId}: ${result.delta.added.length} added, ${result.delta.still_present.length} still listed, ${
+        result.delta.removed.length
+      } removed${result.delta.complete ? "" : " (partial run)"}`,
+    );
+  }
+};
+
+/**
+ * Marks stored jobs closed when a complete board run reports them `removed`.
+ * Matched by URL: the aggregator stores its own content hash, not the scraper's.
+ * A closed job is reopened when a later refresh upserts it again.
+ */
+const closeRemovedJobs = async (portalId: GamingPortalId, delta: ScrapeDelta | null): Promise<void> => {
+  const urls = delta?.complete ? delta.removed.flatMap((entry) => (entry.url ? [entry.url] : [])) : [];
+  if (urls.length === 0) {
+    return;
+  }
+  await db
+    .update(jobs)
+    .set({ closedAt: new Date().toISOString() })
+    .where(and(inArray(jobs.url, urls), isNull(jobs.closedAt)))
+    .then(
+      () => logger.debug(`${portalId}: marked jobs for ${urls.length} removed listings closed`),
+      (error: unknown) => logger.warn(`${portalId}: failed to close removed jobs`, error),
+    );
+};
+
+/** Pages through a board with its `nextCursor` until `limit` jobs are collected. */
+export const collectPortalJobs = async (
+  portalId: GamingPortalId,
+  scrape: PortalScrapeMethod,
+  limit: number,
+): Promise<ScrapedJob[]> => {
+  const collected: ScrapedJob[] = [];
+  let cursor: string | undefined;
+  for (let run = 0; run < MAX_PORTAL_PAGES && collected.length < limit; run++) {
+    const result = await scrape({ limit: limit - collected.length, ...(cursor ? { cursor } : {}) });
+    reportPortalResult(portalId, result);
+    await closeRemovedJobs(portalId, result.delta);
+    collected.push(...result.jobs);
+    if (!result.nextCursor) {
+      break;
+    }
+    cursor = result.nextCursor;
+  }
+  return collected.slice(0, limit);
 };
 
 const resolveHitmarkerJobs = (payload: HitmarkerResponse): HitmarkerJob[] =>
@@ -133,20 +216,25 @@ export class GamingPortalProvider implements JobProvider {
 
         this.name = portalConfig.name;
 
-        const scrapeMethod = PORTAL_SCRAPE_METHOD_BY_ID[this.portalId];
-        const scraped = await scrapeMethod(portalConfig.fallbackUrl);
+        const scraped = await collectPortalJobs(
+          this.portalId,
+          PORTAL_SCRAPE_METHOD_BY_ID[this.portalId],
+          providerSettings.gamingBoardResultLimit,
+        );
 
-        return scraped.slice(0, providerSettings.gamingBoardResultLimit).map((job) => ({
+        return scraped.map((job) => ({
           id: generateId(),
           title: job.title,
           company: job.company,
           location: job.location,
           remote: !!job.remote,
+          hybrid: !!job.hybrid,
           description: job.description || "",
           url: job.url || portalConfig.fallbackUrl,
           source: job.source || portalConfig.source,
           postedDate: job.postedDate || new Date().toISOString(),
           contentHash: job.contentHash,
+          technologies: job.technologies,
         }));
       })
       .catch(() => []);
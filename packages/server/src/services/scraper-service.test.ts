@@ -0,0 +1,52 @@
+import { describe, expect, test } from "bun:test";
+import { parseScrapeBoardOutput } from "./scraper-service";
+
+describe("parseScrapeBoardOutput", () => {
+  test("reads the board envelope with paging, delta, cache and interstitial", () => {
+    const result = parseScrapeBoardOutput(
+      "job_scraper_grackle.py",
+      JSON.stringify({
+        board: "grackle",
+        status: "ok",
+        jobs: [{ title: "Gameplay Programmer", company: "Studio", location: "Remote" }, { nope: true }],
+        error: null,
+        nextCursor: "abc",
+        delta: { added: ["h1"], still_present: [], removed: [{ contentHash: "h2", url: null }], complete: true },
+        cache: { status: "stale", ageSeconds: 700, refreshing: true },
+        interstitial: { kind: "captcha", marker: "g-recaptcha", url: "https://gracklehq.com/jobs" },
+      }),
+    );
+    expect(result.board).toBe("grackle");
+    expect(result.jobs).toHaveLength(1);
+    expect(result.nextCursor).toBe("abc");
+    expect(result.delta?.removed).toEqual([{ contentHash: "h2", url: null }]);
+    expect(result.cache).toEqual({ status: "stale", ageSeconds: 700, refreshing: true });
+    expect(result.interstitial?.kind).toBe("captcha");
+  });
+
+  test("maps unknown statuses to error and drops malformed fields", () => {
+    const result = parseScrapeBoardOutput(
+      "job_scraper_grackle.py",
+      JSON.stringify({ status: "weird", cache: { status: "bogus" }, interstitial: { kind: "other" } }),
+    );
+    expect(result.status).toBe("error");
+    expect(result.board).toBe("job_scraper_grackle.py");
+    expect(result.cache).toBeNull();
+    expect(result.interstitial).toBeNull();
+    expect(result.nextCursor).toBeNull();
+  });
+
+  test("accepts the legacy bare job array", () => {
+    const result = parseScrapeBoardOutput("job_scraper_gamedev.py", JSON.stringify([]));
+    expect(result.status).toBe("empty");
+    expect(result.jobs).toEqual([]);
+  });
+
+  test("reads the watchdog's timeout envelope after partial output", () => {
+    const timeout = JSON.stringify({ board: "grackle", status: "timeout", jobs: [], error: "navigate phase exceeded 90s" });
+    const result = parseScrapeBoardOutput("job_scraper_grackle.py", `partial output\n${timeout}\n`);
+    expect(result.status).toBe("timeout");
+    expect(result.error).toBe("navigate phase exceeded 90s");
+    expect(() => parseScrapeBoardOutput("job_scraper_grackle.py", "not json")).toThrow();
+  });
+});
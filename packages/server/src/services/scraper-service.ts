@@ -5,9 +5,35 @@ import { SCRAPER_DIR } from "../config/paths";
 import { db } from "../db/client";
 import { jobs } from "../db/schema/jobs";
 import { studios } from "../db/schema/studios";
+import {
+  SCRIPT_KILL_GRACE_SECONDS,
+  type ScriptWatchdogOptions,
+  parseScriptOutput,
+  scriptTotalSeconds,
+} from "./script-watchdog";
 
-type ScriptInputPayload = {
+/**
+ * Paging options understood by the board scrapers.
+ * `limit: 0` returns everything; `cursor` is a previous result's `nextCursor`.
+ */
+export interface ScrapePageOptions {
+  limit?: number;
+  maxPages?: number;
+  cursor?: string;
+}
+
+/** Result cache options; `false` bypasses the scraper's result cache entirely. */
+export type ScrapeCacheOptions = false | { ttl?: number; maxStale?: number; refresh?: boolean };
+
+type ScriptInputPayload = ScrapePageOptions & {
   sourceUrl?: string;
+  cache?: ScrapeCacheOptions;
+  /** Report `unchanged` (with no jobs) when the listing matches the last healthy run. */
+  ifChanged?: boolean;
+  /** Feed URL to read instead of discovering one; `false` goes straight to the HTML listing. */
+  feed?: string | false;
+  /** Run and per-phase deadlines enforced by `run_watchdog.py`. */
+  watchdog?: ScriptWatchdogOptions;
 };
 
 const toErrorMessage = (error: unknown): string =>
@@ -25,24 +51,45 @@ const runWithErrorCollection = async (
   );
 };
 
+/**
+ * Runs a scraper script under `run_watchdog.py`, which enforces the run's phase and
+ * total deadlines and kills the script's browser processes. The server keeps its own
+ * deadline in case the supervisor itself hangs.
+ */
 async function runPythonScript(scriptName: string, payload?: ScriptInputPayload): Promise<string> {
-  const scriptPath = join(SCRAPER_DIR, scriptName);
+  const supervisorPath = join(SCRAPER_DIR, "run_watchdog.py");
   const python = process.platform === "win32" ? "python" : "python3";
-  const proc = Bun.spawn([python, scriptPath], {
+  const proc = Bun.spawn([python, supervisorPath, scriptName], {
     cwd: SCRAPER_DIR,
     stdin: "pipe",
     stdout: "pipe",
     stderr: "pipe",
   });
 
+  const totalSeconds = scriptTotalSeconds(payload?.watchdog);
+  let timedOut = false;
+  const timer = setTimeout(
+    () => {
+      timedOut = true;
+      proc.kill();
+    },
+    (totalSeconds + SCRIPT_KILL_GRACE_SECONDS) * 1000,
+  );
+
   if (proc.stdin) {
     proc.stdin.write(JSON.stringify(payload ?? {}));
     proc.stdin.end();
   }
 
-  const stdout = await new Response(proc.stdout).text();
-  const stderr = await new Response(proc.stderr).text();
+  const [stdout, stderr] = await Promise.all([
+    new Response(proc.stdout).text(),
+    new Response(proc.stderr).text(),
+  ]);
   const exitCode = await proc.exited;
+  clearTimeout(timer);
+  if (timedOut) {
+    throw new Error(`Script ${scriptName} timed out after ${totalSeconds + SCRIPT_KILL_GRACE_SECONDS}s`);
+  }
   if (exitCode !== 0) {
     throw new Error(`Script exited ${exitCode}: ${stderr || stdout}`);
   }
@@ -68,26 +115,190 @@ export interface ScrapedJob {
   company: string;
   location: string;
   remote?: boolean;
+  hybrid?: boolean;
+  city?: string;
+  region?: string;
+  country?: string;
   description?: string;
   url?: string;
   source?: string;
   postedDate?: string;
   contentHash?: string;
+  technologies?: string[];
+}
+
+/**
+ * Board run status reported by the scraper scripts.
+ * `ok`/`empty`/`unchanged` are healthy; anything else means the board is broken or unreachable.
+ */
+export type ScrapeStatus =
+  | "ok"
+  | "empty"
+  | "unchanged"
+  | "blocked"
+  | "markup_changed"
+  | "timeout"
+  | "error";
+
+const SCRAPE_STATUSES: readonly ScrapeStatus[] = [
+  "ok",
+  "empty",
+  "unchanged",
+  "blocked",
+  "markup_changed",
+  "timeout",
+  "error",
+];
+
+const toScrapeStatus = (value: unknown): ScrapeStatus =>
+  SCRAPE_STATUSES.find((status) => status === value) ?? "error";
+
+/**
+ * Listing lifecycle change reported by the scraper's local job store.
+ * `removed` is only populated when the run covered the whole board (`complete`).
+ */
+export interface ScrapeDelta {
+  added: string[];
+  still_present: string[];
+  removed: { contentHash: string; url: string | null }[];
+  complete: boolean;
+}
+
+const toStringList = (value: unknown): string[] =>
+  Array.isArray(value) ? value.filter((v): v is string => typeof v === "string") : [];
+
+const isRecord = (value: unknown): value is Record<string, unknown> =>
+  typeof value === "object" && value !== null && !Array.isArray(value);
+
+const toScrapeDelta = (value: unknown): ScrapeDelta | null => {
+  if (!isRecord(value)) return null;
+  const removed: unknown[] = Array.isArray(value.removed) ? value.removed : [];
+  return {
+    added: toStringList(value.added),
+    still_present: toStringList(value.still_present),
+    removed: removed.flatMap((entry) =>
+      isRecord(entry) && typeof entry.contentHash === "string"
+        ? [{ contentHash: entry.contentHash, url: typeof entry.url === "string" ? entry.url : null }]
+        : [],
+    ),
+    complete: value.complete === true,
+  };
+};
+
+/** How a board result was served by the scraper's result cache. */
+export interface ScrapeCacheMeta {
+  status: "hit" | "stale" | "miss" | "refresh" | "disabled";
+  ageSeconds: number | null;
+  refreshing: boolean;
+}
+
+const SCRAPE_CACHE_STATUSES: readonly ScrapeCacheMeta["status"][] = [
+  "hit",
+  "stale",
+  "miss",
+  "refresh",
+  "disabled",
+];
+
+const toScrapeCacheMeta = (value: unknown): ScrapeCacheMeta | null => {
+  if (!isRecord(value)) return null;
+  const status = SCRAPE_CACHE_STATUSES.find((candidate) => candidate === value.status);
+  if (!status) return null;
+  return {
+    status,
+    ageSeconds: typeof value.ageSeconds === "number" ? value.ageSeconds : null,
+    refreshing: value.refreshing === true,
+  };
+};
+
+/** Challenge, captcha, login or consent wall that ended a `blocked` run (page_classifier.py). */
+export interface ScrapeInterstitial {
+  kind: "challenge" | "captcha" | "login" | "consent";
+  marker: string;
+  url: string;
+}
+
+const INTERSTITIAL_KINDS: readonly ScrapeInterstitial["kind"][] = [
+  "challenge",
+  "captcha",
+  "login",
+  "consent",
+];
+
+const toScrapeInterstitial = (value: unknown): ScrapeInterstitial | null => {
+  if (!isRecord(value)) return null;
+  const kind = INTERSTITIAL_KINDS.find((candidate) => candidate === value.kind);
+  if (!kind) return null;
+  return {
+    kind,
+    marker: typeof value.marker === "string" ? value.marker : "",
+    url: typeof value.url === "string" ? value.url : "",
+  };
+};
+
+export interface ScrapeBoardResult {
+  board: string;
+  status: ScrapeStatus;
+  jobs: ScrapedJob[];
+  error: string | null;
+  skipped: boolean;
+  nextCursor: string | null;
+  delta: ScrapeDelta | null;
+  cache: ScrapeCacheMeta | null;
+  interstitial: ScrapeInterstitial | null;
 }
 
+export const HEALTHY_SCRAPE_STATUSES: ReadonlySet<string> = new Set(["ok", "empty", "unchanged"]);
+
+const isScrapedJob = (x: unknown): x is ScrapedJob =>
+  !!x && typeof x === "object" && typeof (x as ScrapedJob).title === "string";
+
+/**
+ * Parses a board scraper's stdout: the JSON envelope printed by board_engine.py, or the
+ * bare job array printed by older scripts. When the watchdog timed the script out after it
+ * had printed something, its timeout envelope is the last line.
+ */
+export const parseScrapeBoardOutput = (scriptName: string, output: string): ScrapeBoardResult => {
+  const raw = parseScriptOutput(output);
+  if (raw === null) {
+    throw new Error(`Script ${scriptName} did not return JSON output`);
+  }
+  if (Array.isArray(raw)) {
+    const jobList = raw.filter(isScrapedJob);
+    return {
+      board: scriptName,
+      status: jobList.length > 0 ? "ok" : "empty",
+      jobs: jobList,
+      error: null,
+      skipped: false,
+      nextCursor: null,
+      delta: null,
+      cache: null,
+      interstitial: null,
+    };
+  }
+  const envelope: Record<string, unknown> = isRecord(raw) ? raw : {};
+  return {
+    board: typeof envelope.board === "string" ? envelope.board : scriptName,
+    status: toScrapeStatus(envelope.status),
+    jobs: Array.isArray(envelope.jobs) ? envelope.jobs.filter(isScrapedJob) : [],
+    error: typeof envelope.error === "string" ? envelope.error : null,
+    skipped: envelope.skipped === true,
+    nextCursor: typeof envelope.nextCursor === "string" ? envelope.nextCursor : null,
+    delta: toScrapeDelta(envelope.delta),
+    cache: toScrapeCacheMeta(envelope.cache),
+    interstitial: toScrapeInterstitial(envelope.interstitial),
+  };
+};
+
 export class ScraperService {
-  private async scrapeJobBoard(scriptName: string, sourceUrl?: string): Promise<ScrapedJob[]> {
-    const output = await runPythonScript(scriptName, sourceUrl ? { sourceUrl } : undefined);
-    const raw = JSON.parse(output);
-    const items = Array.isArray(raw)
-      ? raw
-      : raw && typeof raw === "object" && "error" in raw
-        ? []
-        : [raw];
-    return items.filter(
-      (x): x is ScrapedJob =>
-        x && typeof x === "object" && typeof (x as ScrapedJob).title === "string",
-    );
+  private async scrapeJobBoardResult(
+    scriptName: string,
+    sourceUrl?: string,
+    page?: ScrapePageOptions,
+  ): Promise<ScrapeBoardResult> {
+    const output = await runPythonScript(scriptName, { ...page, ...(sourceUrl ? { sourceUrl } : {}) });
+    return parseScrapeBoardOutput(scriptName, output);
   }
 
   async scrapeStudios(): Promise<{ scraped: number; upserted: number; errors: string[] }> {
@@ -149,28 +360,46 @@ export class ScraperService {
     return { scraped, upserted, errors };
   }
 
-  async scrapeGameDevNetJobsRaw(sourceUrl?: string): Promise<ScrapedJob[]> {
-    return this.scrapeJobBoard("job_scraper_gamedev.py", sourceUrl);
+  async scrapeGameDevNetJobsRaw(
+    sourceUrl?: string,
+    page?: ScrapePageOptions,
+  ): Promise<ScrapeBoardResult> {
+    return this.scrapeJobBoardResult("job_scraper_gamedev.py", sourceUrl, page);
   }
 
-  async scrapeGrackleJobsRaw(sourceUrl?: string): Promise<ScrapedJob[]> {
-    return this.scrapeJobBoard("job_scraper_grackle.py", sourceUrl);
+  async scrapeGrackleJobsRaw(
+    sourceUrl?: string,
+    page?: ScrapePageOptions,
+  ): Promise<ScrapeBoardResult> {
+    return this.scrapeJobBoardResult("job_scraper_grackle.py", sourceUrl, page);
   }
 
-  async scrapeWorkWithIndiesJobsRaw(sourceUrl?: string): Promise<ScrapedJob[]> {
-    return this.scrapeJobBoard("job_scraper_workwithindies.py", sourceUrl);
+  async scrapeWorkWithIndiesJobsRaw(
+    sourceUrl?: string,
+    page?: ScrapePageOptions,
+  ): Promise<ScrapeBoardResult> {
+    return this.scrapeJobBoardResult("job_scraper_workwithindies.py", sourceUrl, page);
   }
 
-  async scrapeRemoteGameJobsRaw(sourceUrl?: string): Promise<ScrapedJob[]> {
-    return this.scrapeJobBoard("job_scraper_remotegamejobs.py", sourceUrl);
+  async scrapeRemoteGameJobsRaw(
+    sourceUrl?: string,
+    page?: ScrapePageOptions,
+  ): Promise<ScrapeBoardResult> {
+    return this.scrapeJobBoardResult("job_scraper_remotegamejobs.py", sourceUrl, page);
   }
 
-  async scrapeGamesJobsDirectRaw(sourceUrl?: string): Promise<ScrapedJob[]> {
-    return this.scrapeJobBoard("job_scraper_gamesjobsdirect.py", sourceUrl);
+  async scrapeGamesJobsDirectRaw(
+    sourceUrl?: string,
+    page?: ScrapePageOptions,
+  ): Promise<ScrapeBoardResult> {
+    return this.scrapeJobBoardResult("job_scraper_gamesjobsdirect.py", sourceUrl, page);
   }
 
-  async scrapePocketGamerJobsRaw(sourceUrl?: string): Promise<ScrapedJob[]> {
-    return this.scrapeJobBoard("job_scraper_pocketgamer.py", sourceUrl);
+  async scrapePocketGamerJobsRaw(
+    sourceUrl?: string,
+    page?: ScrapePageOptions,
+  ): Promise<ScrapeBoardResult> {
+    return this.scrapeJobBoardResult("job_scraper_pocketgamer.py", sourceUrl, page);
   }
 
   async scrapeGameDevNetJobs(): Promise<{ scraped: number; upserted: number; errors: string[] }> {
@@ -179,7 +408,15 @@ export class ScraperService {
     let upserted = 0;
     await Promise.resolve()
       .then(async () => {
-        const list = await this.scrapeGameDevNetJobsRaw();
+        const result = await this.scrapeJobBoardResult("job_scraper_gamedev.py");
+        if (!HEALTHY_SCRAPE_STATUSES.has(result.status)) {
+          errors.push(
+            `${result.board}: ${result.status}${result.skipped ? " (skipped)" : ""}${
+              result.error ? ` - ${result.error}` : ""
+            }`,
+          );
+        }
+        const list = result.jobs;
         scraped = list.length;
         const now = new Date().toISOString();
         for (const j of list) {
@@ -194,7 +431,7 @@ export class ScraperService {
               company: String(j.company || "Unknown").slice(0, 200),
               location: String(j.location || "Unknown").slice(0, 200),
               remote: !!j.remote,
-              hybrid: false,
+              hybrid: !!j.hybrid,
               description: j.description ? String(j.description).slice(0, 5000) : null,
               url: j.url ? String(j.url).slice(0, 500) : null,
               source: j.source || "gamedev-net",
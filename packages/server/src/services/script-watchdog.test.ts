@@ -0,0 +1,28 @@
+import { describe, expect, test } from "bun:test";
+import { DEFAULT_SCRIPT_TIMEOUT_SECONDS, parseScriptOutput, scriptTotalSeconds } from "./script-watchdog";
+
+describe("scriptTotalSeconds", () => {
+  test("uses positive numeric deadlines", () => {
+    expect(scriptTotalSeconds({ totalSeconds: 120 })).toBe(120);
+  });
+
+  test("falls back to the supervisor default for missing or invalid deadlines", () => {
+    const stringDeadline: Record<string, unknown> = { totalSeconds: "90" };
+    expect(scriptTotalSeconds(undefined)).toBe(DEFAULT_SCRIPT_TIMEOUT_SECONDS);
+    expect(scriptTotalSeconds({ totalSeconds: 0 })).toBe(DEFAULT_SCRIPT_TIMEOUT_SECONDS);
+    expect(scriptTotalSeconds({ totalSeconds: -5 })).toBe(DEFAULT_SCRIPT_TIMEOUT_SECONDS);
+    expect(scriptTotalSeconds(stringDeadline)).toBe(DEFAULT_SCRIPT_TIMEOUT_SECONDS);
+    expect(scriptTotalSeconds("600")).toBe(DEFAULT_SCRIPT_TIMEOUT_SECONDS);
+  });
+});
+
+describe("parseScriptOutput", () => {
+  test("parses the whole output first", () => {
+    expect(parseScriptOutput('{\n  "success": true\n}\n')).toEqual({ success: true });
+  });
+
+  test("falls back to the last JSON line after partial output", () => {
+    expect(parseScriptOutput('partial\n{"status":"timeout"}\n')).toEqual({ status: "timeout" });
+    expect(parseScriptOutput("not json")).toBeNull();
+  });
+});
@@ -0,0 +1,39 @@
+import { safeParseJson } from "@bao/shared";
+
+/** Deadlines in seconds; phases are `init`, `navigate`, `dom`, `interact`, `close`, `scrape` and `script`. */
+export interface ScriptWatchdogOptions {
+  totalSeconds?: number;
+  phases?: Record<string, number>;
+}
+
+/** Mirrors `DEFAULT_TOTAL_SECONDS` in run_watchdog.py. */
+export const DEFAULT_SCRIPT_TIMEOUT_SECONDS = 600;
+/** Time the supervisor gets to kill the script's process group and report before it is killed itself. */
+export const SCRIPT_KILL_GRACE_SECONDS = 30;
+
+/**
+ * The run's total deadline as run_watchdog.py reads it: missing, non-numeric or
+ * non-positive values fall back to the default.
+ */
+export const scriptTotalSeconds = (watchdog?: unknown): number => {
+  const totalSeconds =
+    typeof watchdog === "object" && watchdog !== null && "totalSeconds" in watchdog
+      ? watchdog.totalSeconds
+      : undefined;
+  return typeof totalSeconds === "number" && totalSeconds > 0 ? totalSeconds : DEFAULT_SCRIPT_TIMEOUT_SECONDS;
+};
+
+/**
+ * Parses a supervised script's stdout: the whole output, else its last `{...}` line
+ * (where run_watchdog.py prints its timeout result after any partial output).
+ * Returns null when neither is JSON.
+ */
+export const parseScriptOutput = (output: string): unknown => {
+  const trimmed = output.trim();
+  const whole = safeParseJson(trimmed);
+  if (whole !== null) {
+    return whole;
+  }
+  const lastLine = trimmed.split("\n").pop()?.trim() ?? "";
+  return lastLine.startsWith("{") && lastLine.endsWith("}") ? safeParseJson(lastLine) : null;
+};